@@ -12,7 +12,7 @@ with open("requirements.txt", "r") as freq:
         else:
             required.append(line)
 
-packages = setuptools.find_packages("src")
+packages = setuptools.find_packages("src", exclude=["benchmarks", "benchmarks.*"])
 
 setuptools.setup(
     name="scientio",
@@ -0,0 +1,41 @@
+"""
+Run the scientio benchmark suite and print the results as JSON.
+Usage (from the `src` directory): python -m benchmarks [--quick] [--output results.json] [names...]
+"""
+import argparse
+
+from benchmarks import bench_node, bench_ontology, bench_query_builder, bench_session
+from benchmarks.harness import BenchmarkSuite
+
+BENCHMARKS = {
+    "ontology": bench_ontology.run,
+    "node": bench_node.run,
+    "query_builder": bench_query_builder.run,
+    "session": bench_session.run,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scientio benchmark suite.")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run, out of {', '.join(sorted(BENCHMARKS))} "
+                                                 f"(default: all).")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the calls.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    suite = BenchmarkSuite(scale=0.1 if args.quick else 1.0)
+    for name in args.names or sorted(BENCHMARKS):
+        BENCHMARKS[name](suite)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(suite.to_json())
+    else:
+        print(suite.to_json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from benchmarks.bench_ontology import EXAMPLE_ONTOLOGY
+from benchmarks.harness import BenchmarkSuite
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+
+
+def run(suite: BenchmarkSuite):
+    ontology = Ontology(path_to_yaml=EXAMPLE_ONTOLOGY)
+    roboy_type = ontology.get_type("Roboy")
+
+    template = Node(metatype=roboy_type)
+    template.set_id(1)
+    template.set_properties({"name": "Roboy", "sex": "male", "telegram_id": 42})
+    template.add_relationships({"FRIEND_OF": set(range(100)), "LIVE_IN": {1000}})
+
+    suite.measure("node.create_with_metatype", lambda: Node(metatype=roboy_type), 20000)
+    suite.measure("node.set_node", lambda: Node(node=template), 20000)
+    suite.measure("node.set_properties", lambda: template.set_properties({"name": "Roboy", "sex": "male"}), 50000)
+    suite.measure("node.get_properties", lambda: template.get_properties("name"), 50000)
+    suite.measure("node.add_relationships", lambda: template.add_relationships({"KNOW": {1, 2, 3}}), 50000)
+    suite.measure("node.get_relationships", lambda: template.get_relationships("FRIEND_OF"), 50000)
+    suite.measure("node.equality", lambda: template == template, 20000)
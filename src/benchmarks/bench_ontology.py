@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+from benchmarks.harness import BenchmarkSuite
+from scientio.ontology.ontology import Ontology
+
+EXAMPLE_ONTOLOGY = os.path.join(os.path.dirname(__file__), "..", "scientio", "examples", "example_ontology.yaml")
+
+
+def synthetic_ontology(path: str, num_types: int, num_properties: int = 10, num_relationships: int = 10):
+    """
+    Write an ontology of `num_types` types, where every tenth type is a meta type of the following ones.
+    """
+    with open(path, "w") as f:
+        for index in range(num_types):
+            f.write("---\n!OType\n")
+            f.write(f"entity: Type{index}\n")
+            f.write(f"properties: [{', '.join(f'property{x}' for x in range(num_properties))}]\n")
+            f.write(f"relationships: [{', '.join(f'REL_{(index + x) % 50}' for x in range(num_relationships))}]\n")
+            if index % 10 != 0:
+                f.write(f"meta: [Type{index - index % 10}]\n")
+
+
+def run(suite: BenchmarkSuite):
+    suite.measure("ontology.load.example", lambda: Ontology(path_to_yaml=EXAMPLE_ONTOLOGY), 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_types in (100, 1000):
+            path = os.path.join(directory, f"synthetic_{num_types}.yaml")
+            synthetic_ontology(path, num_types)
+            suite.measure(f"ontology.load.synthetic_{num_types}", lambda: Ontology(path_to_yaml=path),
+                          max(2, 5000 // num_types), types=num_types)
+            cache_dir = os.path.join(directory, "cache")
+            Ontology(path_to_yaml=path, cache_dir=cache_dir)
+            suite.measure(f"ontology.load.synthetic_{num_types}.cached",
+                          lambda: Ontology(path_to_yaml=path, cache_dir=cache_dir),
+                          max(2, 5000 // num_types), types=num_types)
+
+    ontology = Ontology(path_to_yaml=EXAMPLE_ONTOLOGY)
+    entities = sorted(ontology.entities)
+    suite.measure("ontology.get_type", lambda: [ontology.get_type(x) for x in entities], 2000, types=len(entities))
+    suite.measure("ontology.resolve_type", lambda: ontology.resolve_type(["Company", "Organisation"]), 20000)
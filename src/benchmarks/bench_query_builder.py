@@ -0,0 +1,23 @@
+from benchmarks.harness import BenchmarkSuite
+from scientio.util.query_builder import QueryBuilder
+
+PROPERTIES = {"name": "Roboy", "sex": "male", "full_name": "Roboy Junior", "telegram_id": 42}
+
+
+def match_statement():
+    builder = QueryBuilder()
+    builder.add("MATCH (n:Person").add_meta(["Agent"]).add_parameters(PROPERTIES).add(")")
+    builder.add(f"MATCH (n)-[r0:FRIEND_OF]-(m0) WHERE ID(m0) IN {builder.param([1, 2, 3])}")
+    builder.add("WITH DISTINCT n RETURN n")
+    return builder.get(), builder.get_parameters()
+
+
+def update_statement():
+    builder = QueryBuilder()
+    builder.match_by_id(42, "n").set_values(PROPERTIES, "n").add("RETURN n")
+    return builder.get(), builder.get_parameters()
+
+
+def run(suite: BenchmarkSuite):
+    suite.measure("query_builder.match", match_statement, 50000)
+    suite.measure("query_builder.update", update_statement, 50000)
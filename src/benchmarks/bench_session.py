@@ -0,0 +1,49 @@
+from benchmarks.bench_ontology import EXAMPLE_ONTOLOGY
+from benchmarks.harness import BenchmarkSuite
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+
+
+def run(suite: BenchmarkSuite, driver_name: str = Session.InMemoryDriver, **driver_kwargs):
+    """
+    Measure end-to-end CRUD operations through a Session.
+    By default, the in-process driver is used, so that the overhead of scientio itself is measured.
+    """
+    ontology = Ontology(path_to_yaml=EXAMPLE_ONTOLOGY)
+    session = Session(driver_name=driver_name, ontology=ontology, **driver_kwargs)
+    person_type = ontology.get_type("Person")
+    city_type = ontology.get_type("City")
+    count = max(10, int(2000 * suite.scale))
+
+    def person(index: int) -> Node:
+        node = Node(metatype=person_type)
+        node.set_properties({"name": f"Person {index}", "sex": "female" if index % 2 else "male"})
+        return node
+
+    city = Node(metatype=city_type)
+    city.set_name("Munich")
+    city = session.create(city)
+
+    people = [person(index) for index in range(count)]
+    suite.measure_each("session.create", session.create, people, driver=driver_name)
+    suite.measure_each("session.retrieve.by_id", lambda node: session.retrieve(node_id=node.get_id()), people,
+                       driver=driver_name)
+
+    def update(node: Node):
+        node.add_relationships({"LIVE_IN": {city.get_id()}})
+        session.update(node)
+    suite.measure_each("session.update", update, people, driver=driver_name)
+
+    by_name = [person(index) for index in range(0, count, max(1, count // 200))]
+    suite.measure_each("session.retrieve.by_property", session.retrieve, by_name, driver=driver_name)
+
+    lives_in = Node(metatype=person_type)
+    lives_in.set_relationships({"LIVE_IN": {city.get_id()}})
+    suite.measure("session.retrieve.by_relationship", lambda: session.retrieve(lives_in), 20,
+                  driver=driver_name, matches=count)
+
+    suite.measure_each("session.delete", session.delete, people, driver=driver_name)
+
+    batch = [person(index) for index in range(count)]
+    suite.measure("session.create_many", lambda: session.create_many(batch), 1, driver=driver_name, nodes=count)
@@ -0,0 +1,98 @@
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Any
+
+
+class BenchmarkSuite(object):
+    """
+    Collects the results of several benchmarks and renders them as JSON,
+     so that runs may be stored and compared with each other.
+    Every benchmark result holds the number of calls, their throughput
+     and latency percentiles in microseconds.
+    """
+
+    results: List[Dict[str, Any]]
+
+    def __init__(self, scale: float = 1.0):
+        """
+        :param scale: Factor for the number of calls of every benchmark.
+         Use values below 1 for quick runs.
+        """
+        self.scale = scale
+        self.results = []
+
+    def measure(self, name: str, func: Callable[[], Any], calls: int, setup: Callable[[], None] = None,
+                **metadata) -> Dict[str, Any]:
+        """
+        Time a function call by call.
+        :param name: Unique name of the benchmark, e.g. "node.set_properties".
+        :param func: The function to time. It is called without arguments.
+        :param calls: Number of timed calls, before scaling.
+        :param setup: Optional function which is called once before the timed calls.
+        :param metadata: Additional entries for the result, e.g. the size of the input.
+        :return: The result of the benchmark.
+        """
+        calls = max(1, int(calls * self.scale))
+        if setup is not None:
+            setup()
+        latencies: List[float] = []
+        clock = time.perf_counter
+        for _ in range(calls):
+            start = clock()
+            func()
+            latencies.append(clock() - start)
+        return self._record(name, latencies, metadata)
+
+    def measure_each(self, name: str, func: Callable[[Any], Any], inputs: List[Any], **metadata) -> Dict[str, Any]:
+        """
+        Time a function call for every given input, e.g. for operations which may
+         not be repeated on the same input.
+        :param name: Unique name of the benchmark.
+        :param func: The function to time. It is called with each of the inputs.
+        :param inputs: The inputs, which are not scaled.
+        :param metadata: Additional entries for the result.
+        :return: The result of the benchmark.
+        """
+        latencies: List[float] = []
+        clock = time.perf_counter
+        for item in inputs:
+            start = clock()
+            func(item)
+            latencies.append(clock() - start)
+        return self._record(name, latencies, metadata)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "timestamp": time.time(),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": self.scale,
+            "results": self.results
+        }, indent=2)
+
+    def _record(self, name: str, latencies: List[float], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        total = sum(latencies)
+        latencies = sorted(latencies)
+        result = {
+            "name": name,
+            "calls": len(latencies),
+            "total_s": total,
+            "ops_per_s": len(latencies) / total if total > 0 else None,
+            "mean_us": total / len(latencies) * 1e6,
+            "p50_us": self._percentile(latencies, 50) * 1e6,
+            "p90_us": self._percentile(latencies, 90) * 1e6,
+            "p99_us": self._percentile(latencies, 99) * 1e6,
+            "max_us": latencies[-1] * 1e6
+        }
+        result.update(metadata)
+        self.results.append(result)
+        print(f"{name:<48} {result['calls']:>8} calls {result['mean_us']:>12.2f} us/call", file=sys.stderr)
+        return result
+
+    @staticmethod
+    def _percentile(ordered: List[float], percent: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
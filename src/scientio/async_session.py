@@ -0,0 +1,92 @@
+from typing import Type, List, Optional
+
+from scientio.drivers import async_drivers
+from scientio.interfaces.async_operations import AsyncOperations
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+
+
+class AsyncSession(AsyncOperations):
+    """
+    Lightweight wrapper around a scientio ontology session for asyncio applications,
+     powered by a certain named async operations driver. All operations are awaitable,
+     so that many of them may be in flight concurrently from one event loop.
+    """
+
+    """
+    Use AsyncNeo4jDriver as a possible value for `driver_name` in the AsyncSession constructor.
+    Note: This driver requires the asyncio API of the neo4j client (version 5 or newer).
+    """
+    Neo4jDriver = "neo4j"
+
+    """
+    Use AsyncInMemoryDriver as a possible value for `driver_name` in the AsyncSession constructor,
+     to keep the graph in-process instead of a database.
+    """
+    InMemoryDriver = "memory"
+
+    """
+    The async operations driver which is used by this session.
+    """
+    _driver: AsyncOperations
+
+    def __init__(self, *, driver_name: str=Neo4jDriver, ontology: Ontology, **kwargs):
+        """
+        Instantiate a session with a certain ontology, a certain driver, and certain additional
+         key-word arguments which may be necessary to instantiate the driver.
+        :param driver_name: Name of the driver. Either `AsyncSession.Neo4jDriver`, `AsyncSession.InMemoryDriver`,
+         or the name of a driver which is registered in `scientio.drivers.async_drivers`.
+        :param ontology: The Scientio Ontology by which Nodes in this Session are allowed to be created,
+         retrieved and updated.
+        :param kwargs: Driver-specific key-word arguments, as for `Session`.
+        """
+        self._driver = AsyncSession._driver_for_name(driver_name)(ontology=ontology, **kwargs)
+
+    async def __aenter__(self) -> 'AsyncSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def create(self, request: Node) -> Optional[Node]:
+        """
+        Create a new Node by a certain Node specification, as for `Session.create()`.
+        :param request: The node to persist.
+        :return: The created Node if successful, None otherwise.
+        """
+        return await self._driver.create(request)
+
+    async def retrieve(self, request: Node = None, node_id: int = None) -> Optional[List[Node]]:
+        """
+        Retrieve a node, by match or by id, as for `Session.retrieve()`.
+        :param request: Set to a certain Node specification for retrieval-by-match.
+        :param node_id: A node id for retrieval-by-id.
+        :return: A list of nodes which match the criteria, None if no such Node exists.
+        """
+        return await self._driver.retrieve(request, node_id)
+
+    async def update(self, request: Node) -> Optional[Node]:
+        """
+        Persist changes to a Node, as for `Session.update()`.
+        :param request: The node whose changed properties/type/relationships should be persisted.
+        :return: The persisted node, or None if the Operation failed.
+        """
+        return await self._driver.update(request)
+
+    async def delete(self, request: Node) -> bool:
+        """
+        Delete a node, as for `Session.delete()`.
+        :param request: The node to delete.
+        :return: True if the node was deleted successfully, False otherwise.
+        """
+        return await self._driver.delete(request)
+
+    async def close(self) -> None:
+        """
+        Close the driver of this session.
+        """
+        await self._driver.close()
+
+    @staticmethod
+    def _driver_for_name(driver_name: str) -> Type:
+        return async_drivers.get(driver_name)
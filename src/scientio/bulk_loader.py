@@ -0,0 +1,321 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Optional, Dict, List, Tuple, Any, Iterable, Iterator, Set, Hashable
+
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+
+"""
+Maximum number of failure messages which are kept per worker.
+"""
+MAX_FAILURES = 100
+
+
+class WorkerReport(object):
+    """
+    Throughput and errors of one worker process of a bulk load.
+    """
+
+    worker: int  # Process ID of the worker
+    records: int  # Input records processed
+    nodes: int  # Nodes created
+    edges: int  # Edges created
+    errors: int  # Records or edges which failed validation or could not be written
+    failures: List[str]  # Messages of the first errors
+    seconds: float  # Time spent processing
+
+    def __init__(self, worker: int):
+        self.worker = worker
+        self.records = 0
+        self.nodes = 0
+        self.edges = 0
+        self.errors = 0
+        self.failures = []
+        self.seconds = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Nodes and edges created per second.
+        """
+        return (self.nodes + self.edges) / self.seconds if self.seconds > 0 else 0.0
+
+    def fail(self, message: str, count: int = 1) -> None:
+        self.errors += count
+        if len(self.failures) < MAX_FAILURES:
+            self.failures.append(message)
+
+    def merge(self, other: 'WorkerReport') -> None:
+        self.records += other.records
+        self.nodes += other.nodes
+        self.edges += other.edges
+        self.errors += other.errors
+        self.failures.extend(other.failures[:MAX_FAILURES - len(self.failures)])
+        self.seconds += other.seconds
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(" \
+               f"worker={self.worker}, " \
+               f"records={self.records}, " \
+               f"nodes={self.nodes}, " \
+               f"edges={self.edges}, " \
+               f"errors={self.errors}, " \
+               f"throughput={self.throughput:.1f}/s)"
+
+
+class BulkLoadReport(object):
+    """
+    Result of a bulk load, per worker and in total.
+    """
+
+    workers: Dict[int, WorkerReport]
+    unresolved: int  # Relationships to keys which no created node has
+    duplicates: int  # Created nodes whose key was taken by another node already
+    duplicate_keys: List[Hashable]  # The first of these keys
+    seconds: float  # Wall-clock time of the whole load
+
+    def __init__(self):
+        self.workers = dict()
+        self.unresolved = 0
+        self.duplicates = 0
+        self.duplicate_keys = []
+        self.seconds = 0.0
+
+    @property
+    def nodes(self) -> int:
+        return sum(x.nodes for x in self.workers.values())
+
+    @property
+    def edges(self) -> int:
+        return sum(x.edges for x in self.workers.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(x.errors for x in self.workers.values()) + self.unresolved + self.duplicates
+
+    def duplicate(self, key: Hashable) -> None:
+        self.duplicates += 1
+        if len(self.duplicate_keys) < MAX_FAILURES:
+            self.duplicate_keys.append(key)
+
+    def add(self, report: WorkerReport) -> None:
+        if report.worker in self.workers:
+            self.workers[report.worker].merge(report)
+        else:
+            self.workers[report.worker] = report
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(" \
+               f"nodes={self.nodes}, " \
+               f"edges={self.edges}, " \
+               f"errors={self.errors}, " \
+               f"unresolved={self.unresolved}, " \
+               f"duplicates={self.duplicates}, " \
+               f"workers={list(self.workers.values())})"
+
+
+def bulk_load(records: Iterable[Dict[str, Any]], *, path_to_yaml: str, workers: int = None,
+              chunk_size: int = 10000, batch_size: int = 1000, session: Session = None,
+              **session_kwargs) -> BulkLoadReport:
+    """
+    Create nodes and their relationships from a stream of records, split across a pool of processes.
+    Every record describes one node, which is referred to by a key of the input rather than by an ID:
+     {"key": "user:42", "entity": "TelegramPerson", "properties": {"name": "Roboy", "telegram_id": 42},
+      "relationships": {"FRIEND_OF": ["user:7"]}}
+    In a first phase, each worker validates chunks of records against the ontology and creates their
+     nodes in batches. In a second phase, the keys of all relationships are resolved to the IDs of the
+     created nodes, and the resulting edges are created in batches by the workers.
+    Every worker opens a Session of it's own, which is configured by `session_kwargs`. Since an
+     in-process graph memory is not shared between processes, pass `session` with `workers=1` to
+     load into an in-memory Session instead.
+    :param records: The input records. Relationships may refer to keys of other chunks. Keys must be
+     unique: The node of a record whose key was taken already is created nevertheless, but it is
+     reported in `duplicates`, and relationships to the key refer to the node which took it first.
+    :param path_to_yaml: The ontology, which each worker loads.
+    :param workers: Number of worker processes, defaults to the number of CPUs. The load is executed
+     in the calling process if this is at most 1.
+    :param chunk_size: Number of records or edges passed to a worker at once.
+    :param batch_size: Maximum number of nodes or edges written per statement.
+    :param session: A Session to load into from the calling process, which requires `workers=1`.
+    :param session_kwargs: Key-word arguments of the workers' Sessions, e.g. `driver_name` and `neo4j_address`.
+    :return: Throughput and error counts per worker, and the duplicate keys.
+    """
+    start = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if session is not None and workers > 1:
+        raise ValueError("A Session cannot be shared with worker processes, use workers=1 with it")
+
+    report = BulkLoadReport()
+    ids: Dict[Hashable, int] = dict()
+    relationships: List[Tuple[int, str, Hashable]] = []
+
+    def collect(result: Tuple[WorkerReport, List[Tuple[Hashable, int]], List[Tuple[int, str, Hashable]]]):
+        worker_report, created, pending = result
+        report.add(worker_report)
+        for key, node_id in created:
+            if key in ids:
+                report.duplicate(key)
+            else:
+                ids[key] = node_id
+        relationships.extend(pending)
+
+    if workers <= 1:
+        ontology = Ontology(path_to_yaml=path_to_yaml)
+        worker = _Worker(ontology, session or Session(ontology=ontology, **session_kwargs), batch_size)
+        for chunk in _chunks(records, chunk_size):
+            collect(worker.load_nodes(chunk))
+        edges = _resolve(relationships, ids, report)
+        for chunk in _chunks(edges, chunk_size):
+            report.add(worker.load_edges(chunk))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(path_to_yaml, batch_size, session_kwargs)) as executor:
+            _run(executor, _load_nodes, _chunks(records, chunk_size), workers, collect)
+            edges = _resolve(relationships, ids, report)
+            _run(executor, _load_edges, _chunks(edges, chunk_size), workers, report.add)
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+class _Worker(object):
+    """
+    Validation and writing of chunks, within a worker process or the calling process.
+    """
+
+    def __init__(self, ontology: Ontology, session: Session, batch_size: int):
+        self._ontology = ontology
+        self._session = session
+        self._batch_size = batch_size
+
+    def load_nodes(self, records: List[Dict[str, Any]]) \
+            -> Tuple[WorkerReport, List[Tuple[Hashable, int]], List[Tuple[int, str, Hashable]]]:
+        """
+        Validate and create the nodes of a chunk of records.
+        :return: The report, the created IDs per key, and the relationships which remain to be created,
+         from the ID of a created node to the key of another.
+        """
+        start = time.perf_counter()
+        report = WorkerReport(os.getpid())
+        report.records = len(records)
+        valid: List[Dict[str, Any]] = []
+        nodes: List[Node] = []
+        for record in records:
+            error = self._validate(record)
+            if error is not None:
+                report.fail(error)
+                continue
+            node = Node(metatype=self._ontology.get_type(record['entity']))
+            node.set_properties(record.get('properties') or dict())
+            valid.append(record)
+            nodes.append(node)
+
+        created: List[Tuple[Hashable, int]] = []
+        relationships: List[Tuple[int, str, Hashable]] = []
+        for index in range(0, len(nodes), self._batch_size):
+            batch = nodes[index:index + self._batch_size]
+            for record, node in zip(valid[index:index + self._batch_size],
+                                    self._session.create_many(batch, self._batch_size)):
+                if node is None:
+                    report.fail(f"Node {record['key']!r} could not be created")
+                    continue
+                created.append((record['key'], node.get_id()))
+                for key, others in (record.get('relationships') or dict()).items():
+                    relationships.extend((node.get_id(), key, other) for other in others)
+        report.nodes = len(created)
+        report.seconds = time.perf_counter() - start
+        return report, created, relationships
+
+    def load_edges(self, edges: List[Tuple[int, str, int]]) -> WorkerReport:
+        """
+        Create a chunk of edges between resolved node IDs.
+        """
+        start = time.perf_counter()
+        report = WorkerReport(os.getpid())
+        result = self._session.create_edges(edges, self._batch_size)
+        report.edges = sum(1 for x in result if x)
+        if report.edges < len(edges):
+            report.fail(f"{len(edges) - report.edges} edges could not be created", len(edges) - report.edges)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _validate(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Check a record against the ontology.
+        :return: The reason why the record is invalid, or None if it is valid.
+        """
+        if record.get('key') is None:
+            return f"Record without key: {record!r}"
+        otype = self._ontology.get_type(record.get('entity'))
+        if otype is None:
+            return f"Record {record['key']!r}: No such type in ontology: {record.get('entity')}"
+        unknown: Set[str] = set(record.get('properties') or ()) - otype.properties
+        unknown |= set(record.get('relationships') or ()) - otype.relationships
+        if len(unknown) > 0:
+            return f"Record {record['key']!r}: Not allowed for {otype.entity}: {sorted(unknown)}"
+        for key, others in (record.get('relationships') or dict()).items():
+            if not isinstance(others, (list, set)):
+                return f"Record {record['key']!r}: Relationship {key} is not a list of keys: {others!r}"
+        return None
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(path_to_yaml: str, batch_size: int, session_kwargs: Dict[str, Any]):
+    global _worker
+    ontology = Ontology(path_to_yaml=path_to_yaml)
+    _worker = _Worker(ontology, Session(ontology=ontology, **session_kwargs), batch_size)
+
+
+def _load_nodes(records: List[Dict[str, Any]]):
+    return _worker.load_nodes(records)
+
+
+def _load_edges(edges: List[Tuple[int, str, int]]):
+    return _worker.load_edges(edges)
+
+
+def _run(executor: ProcessPoolExecutor, function, chunks: Iterator[List[Any]], workers: int, collect):
+    """
+    Submit chunks to the pool, with at most two chunks in flight per worker, so that the
+     input is not read ahead of the workers.
+    """
+    pending: Set[Future] = set()
+    for chunk in chunks:
+        if len(pending) >= 2 * workers:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future.result())
+        pending.add(executor.submit(function, chunk))
+    for future in wait(pending).done:
+        collect(future.result())
+
+
+def _resolve(relationships: List[Tuple[int, str, Hashable]], ids: Dict[Hashable, int],
+             report: BulkLoadReport) -> List[Tuple[int, str, int]]:
+    """
+    Resolve the target keys of relationships to node IDs. Relationships are undirected, so a
+     relationship which is listed by both of it's nodes yields one edge only.
+    """
+    edges: Set[Tuple[int, str, int]] = set()
+    for source, key, target in relationships:
+        if target not in ids:
+            report.unresolved += 1
+            continue
+        source, target = sorted((source, ids[target]))
+        edges.add((source, key, target))
+    return sorted(edges)
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
@@ -0,0 +1,108 @@
+import importlib
+import threading
+from typing import Dict, Type, Union
+
+
+class DriverRegistry(object):
+    """
+    Registry of operations drivers by name. Drivers are registered by the
+     "module:Class" path of their implementation, and their module is only
+     imported when the driver is first selected, so that database clients
+     are not loaded by applications which never use them.
+    Third-party drivers register themselves through an entry point in the
+     registry's `group`, e.g. in setup.py:
+
+        entry_points={"scientio.drivers": ["mydb = mypackage.mydb_driver:MyDbDriver"]}
+    """
+
+    def __init__(self, group: str, drivers: Dict[str, str] = None):
+        """
+        Create a registry.
+        :param group: Name of the entry point group from which third-party drivers are loaded.
+        :param drivers: Built-in drivers, as a mapping from driver name to "module:Class" path.
+        """
+        self.group = group
+        self._targets: Dict[str, Union[str, Type]] = dict(drivers or dict())
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        self._load_entry_points()
+        return name in self._targets
+
+    def register(self, name: str, driver: Union[str, Type]) -> None:
+        """
+        Register a driver, replacing any driver with the same name.
+        :param name: Name by which the driver is selected, e.g. `driver_name` of a Session.
+        :param driver: The driver class, or its "module:Class" path to import it on demand.
+        """
+        with self._lock:
+            self._targets[name] = driver
+
+    def get(self, name: str) -> Type:
+        """
+        Get a driver class by name, importing its module if necessary.
+        :param name: Name of the driver.
+        :return: The driver class.
+        """
+        self._load_entry_points()
+        try:
+            target = self._targets[name]
+        except KeyError:
+            raise KeyError(f"No such driver: {name}")
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(":")
+            target = getattr(importlib.import_module(module_name), class_name)
+            with self._lock:
+                self._targets[name] = target
+        return target
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            for entry_point in _entry_points(self.group):
+                # Drivers which are registered explicitly take precedence
+                self._targets.setdefault(entry_point.name, entry_point.value)
+            self._entry_points_loaded = True
+
+
+def _entry_points(group: str) -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return [_EntryPoint(x.name, f"{x.module_name}:{'.'.join(x.attrs)}")
+                for x in pkg_resources.iter_entry_points(group)]
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return list(found.select(group=group))
+    return list(found.get(group, []))
+
+
+class _EntryPoint(object):
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value
+
+
+"""
+Drivers for `Session`, by name.
+"""
+drivers = DriverRegistry("scientio.drivers", {
+    "neo4j": "scientio.drivers.neo4j_driver:Neo4jDriver",
+    "memory": "scientio.drivers.in_memory_driver:InMemoryDriver"
+})
+
+"""
+Drivers for `AsyncSession`, by name.
+"""
+async_drivers = DriverRegistry("scientio.async_drivers", {
+    "neo4j": "scientio.drivers.async_neo4j_driver:AsyncNeo4jDriver",
+    "memory": "scientio.drivers.async_in_memory_driver:AsyncInMemoryDriver"
+})
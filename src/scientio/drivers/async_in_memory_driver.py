@@ -0,0 +1,29 @@
+from typing import Optional, List
+
+from scientio.drivers.in_memory_driver import InMemoryDriver
+from scientio.interfaces.async_operations import AsyncOperations
+from scientio.ontology.node import Node
+
+
+class AsyncInMemoryDriver(AsyncOperations):
+    """
+    Implementation of the async operations interface for an in-process graph memory.
+    All operations complete without suspending, since the graph is held by an InMemoryDriver.
+    """
+
+    _driver: InMemoryDriver
+
+    def __init__(self, ontology, **kwargs):
+        self._driver = InMemoryDriver(ontology, **kwargs)
+
+    async def create(self, request: Node) -> Optional[Node]:
+        return self._driver.create(request)
+
+    async def retrieve(self, request: Node = None, node_id: int = None) -> Optional[List[Node]]:
+        return self._driver.retrieve(request, node_id)
+
+    async def update(self, request: Node) -> Optional[Node]:
+        return self._driver.update(request)
+
+    async def delete(self, request: Node) -> bool:
+        return self._driver.delete(request)
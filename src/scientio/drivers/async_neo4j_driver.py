@@ -0,0 +1,115 @@
+import time
+from typing import Optional, Dict, List, Any, Tuple
+
+from neo4j import __version__ as neo4j_version
+
+if int(neo4j_version.split(".")[0]) < 5:
+    raise ImportError(f"The AsyncNeo4jDriver requires the asyncio API of the neo4j client 5 or newer, "
+                      f"but version {neo4j_version} is installed")
+
+from neo4j import AsyncGraphDatabase
+
+from scientio.drivers.cypher_driver import CypherDriver
+from scientio.interfaces.async_operations import AsyncOperations
+from scientio.ontology.node import Node
+
+
+class AsyncNeo4jDriver(CypherDriver, AsyncOperations):
+    """
+    Implementation of the async operations interface for a Neo4j-based graph memory.
+    Statements are the same as those of the Neo4jDriver, but they are executed through
+     the asyncio API of the neo4j client (version 5 or newer), so that many operations
+     can be in flight from one event loop. All statements of one operation run in one transaction.
+    Indexes and constraints are not synchronised by this driver.
+    """
+
+    def __init__(self, ontology, **kwargs):
+        try:
+            uri = kwargs['neo4j_address']
+            user = kwargs['neo4j_username']
+            password = kwargs['neo4j_password']
+        except KeyError as e:
+            raise e
+        super().__init__(ontology, **kwargs)
+        self._driver = AsyncGraphDatabase.driver(uri, auth=(user, password), **self._pool_config)
+
+    async def close(self) -> None:
+        await self._driver.close()
+
+    async def create(self, request: Node) -> Optional[Node]:
+        if self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
+            builder = self._create_statement(request)
+            record = await self._exec_query(builder.get(), builder.get_parameters())
+            request.set_id(int(record[0].id))
+            request.mark_clean(relationships=False)  # Relationships are not created along with the node
+            return request
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    async def retrieve(self, request: Node = None, node_id: int = None) -> Optional[List[Node]]:
+        if node_id is not None and node_id >= 0:
+            return await self.get_node_by_id(node_id)
+        else:
+            if request is not None and self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
+                builder = self._retrieve_statement(request)
+                records = await self._exec_query(builder.get(), builder.get_parameters(), single=False, read=True)
+                return self.compose_nodes(records)
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    async def update(self, request: Node) -> Optional[Node]:
+        if self._ontology.__contains__(request.get_type()) and request.get_id() >= 0:  # The class of Node is in ontology
+            builder = self._update_statement(request)
+            if builder is not None:
+                if await self._exec_query(builder.get(), builder.get_parameters()) is None:
+                    return None
+                request.mark_clean()
+            return request
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    async def delete(self, request: Node) -> bool:
+        response = False
+        if request.get_id() >= 0:
+            statements = [(builder.get(), builder.get_parameters()) for builder in self._delete_statements(request)]
+            for records in await self._exec_statements(statements):
+                if len(records) > 0:
+                    response = True
+        return response
+
+    async def get_node_by_id(self, node_id: int) -> Optional[List[Node]]:
+        builder = self._retrieve_by_id_statement(node_id)
+        records = await self._exec_query(builder.get(), builder.get_parameters(), single=False, read=True)
+        result_nodes = self.compose_nodes(records)
+
+        if len(result_nodes) <= 0:
+            return None
+        return result_nodes
+
+    async def _exec_transaction(self, tx, statements: List[Tuple[str, Dict[str, Any]]]):
+        results = []
+        for query, parameters in statements:
+            start = time.perf_counter()
+            result = await tx.run(query, parameters)
+            records = [record async for record in result]
+            self._observe(query, parameters, start, len(records))
+            results.append(records)
+        return results
+
+    async def _exec_statements(self, statements: List[Tuple[str, Dict[str, Any]]], read=False) -> List[list]:
+        """
+        Execute several statements in one transaction, which is routed to a follower for reads.
+        :param statements: Pairs of Cypher statement and parameters.
+        :return: The records of every statement.
+        """
+        if len(statements) == 0:
+            return []
+        async with self._driver.session(**self._session_config) as session:
+            run = session.execute_read if read else session.execute_write
+            return await run(self._exec_transaction, statements)
+
+    async def _exec_query(self, query: str, parameters: Dict[str, Any] = None, single=True, read=False):
+        records = (await self._exec_statements([(query, parameters)], read))[0]
+        if single:
+            return records[0] if len(records) > 0 else None
+        return records
@@ -0,0 +1,324 @@
+import time
+from typing import Optional, Dict, List, Set, Any, Iterable, Iterator, Tuple
+
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.ontology.otype import OType
+from scientio.ontology.schema import IndexSpec
+from scientio.util.query_builder import QueryBuilder
+
+
+class CypherDriver(object):
+    """
+    Cypher statement generation and result composition, which is shared
+     by the Neo4j-based drivers. Subclasses execute the statements,
+     either blocking or asynchronously.
+    """
+
+    _ontology: Ontology
+
+    """
+    Return clause which yields a node `n` together with all of its edges,
+     so that a Node can be composed from a single record.
+    """
+    HYDRATE_RETURN = "RETURN n, [(n)-[r]-(m) | [TYPE(r), ID(m)]] AS edges"
+
+    """
+    Number of nodes which are written by a single UNWIND statement, unless
+     specified otherwise through the `batch_size` key-word argument.
+    """
+    DEFAULT_BATCH_SIZE = 1000
+
+    """
+    Optional key-word arguments which are passed on to the neo4j client driver
+     to tune it's connection pool.
+    """
+    POOL_CONFIG_KEYS = ('max_connection_pool_size', 'connection_acquisition_timeout', 'max_connection_lifetime')
+
+    def __init__(self, ontology, **kwargs):
+        self._ontology = ontology
+        self._batch_size = int(kwargs.get('batch_size', self.DEFAULT_BATCH_SIZE))
+        self._pool_config: Dict[str, Any] = {key: kwargs[key] for key in self.POOL_CONFIG_KEYS if key in kwargs}
+        self._session_config: Dict[str, Any] = dict()
+        if kwargs.get('fetch_size') is not None:
+            self._session_config['fetch_size'] = int(kwargs['fetch_size'])
+        self._metrics = kwargs.get('metrics')
+        self._profiler = kwargs.get('profiler')
+
+    def _create_statement(self, req: Node) -> QueryBuilder:
+        builder = QueryBuilder()
+        builder.add("CREATE (a:" + req.get_entity())
+        if req.get_meta() is not None and len(req.get_meta()) > 0:
+            builder.add_meta(req.get_meta())
+        # Unset properties are not stored, as by `create_many()`
+        builder.add_parameters(dict((x, y) for x, y in req.get_properties().items() if y != "")).add(") RETURN a")
+        return builder
+
+    def _match_node(self, req: Node) -> QueryBuilder:
+        """
+        Compile a retrieve-by-example request into a MATCH clause for `n`, which is
+         anchored on it's most selective predicate, in this order of preference:
+         A property which is unique for the entity, the smallest set of known
+         neighbour IDs, a property which is indexed for the entity, or else the label.
+        All other predicates are filtered on `n`, with relationships as existence
+         checks, so that they do not multiply the matched rows. A node which is
+         related to several anchoring neighbours is only kept for the one with
+         the lowest ID, so that every node is matched once without a DISTINCT.
+        """
+        properties: Dict[str, Any] = dict()
+        if req.get_properties() is not None:
+            properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
+        relationships = sorted(((key, value) for key, value in req.iter_relationships() if len(value) > 0),
+                               key=lambda x: (len(x[1]), x[0]))
+        otype = self._ontology.get_type(req.get_entity()) if req.get_entity() is not None else None
+        unique = sorted(otype.unique.intersection(properties)) if otype is not None else []
+        indexed = sorted(otype.indexes.intersection(properties)) if otype is not None else []
+
+        anchor_properties: Dict[str, Any] = dict()
+        anchor_relationship: Optional[Tuple[str, Set[int]]] = None
+        if len(unique) > 0:
+            anchor_properties[unique[0]] = properties.pop(unique[0])
+        elif len(relationships) > 0:
+            anchor_relationship = relationships.pop(0)
+        elif len(indexed) > 0:
+            anchor_properties[indexed[0]] = properties.pop(indexed[0])
+
+        builder = QueryBuilder()
+        label = f":{req.get_entity()}" if req.get_entity() is not None else ""
+        if anchor_relationship is not None:
+            builder.add(f"MATCH (a)-[:{anchor_relationship[0]}]-(n{label}")
+        else:
+            builder.add(f"MATCH (n{label}")
+        if req.get_entity() is not None and req.get_meta() is not None and len(req.get_meta()) > 0:
+            builder.add_meta(req.get_meta())
+        if len(anchor_properties) > 0:
+            builder.add_parameters(anchor_properties)
+        builder.append([")"])
+
+        conditions: List[str] = []
+        if anchor_relationship is not None:
+            anchors = builder.param(sorted(anchor_relationship[1]))
+            conditions.append(f"ID(a) IN {anchors}")
+        for key, value in properties.items():
+            conditions.append(f"n.{key} = {builder.param(value)}")
+        for key, value in relationships:
+            conditions.append(f"size([(n)-[:{key}]-(x) WHERE ID(x) IN {builder.param(list(value))} | 1]) > 0")
+        if anchor_relationship is not None:
+            conditions.append(f"NONE(b IN [(n)-[:{anchor_relationship[0]}]-(x) WHERE ID(x) IN {anchors} | ID(x)] "
+                              f"WHERE b < ID(a))")
+        if len(conditions) > 0:
+            builder.add("WHERE " + " AND ".join(conditions))
+        return builder
+
+    def _retrieve_statement(self, req: Node) -> QueryBuilder:
+        return self._match_node(req).add(self.HYDRATE_RETURN)
+
+    def _retrieve_by_id_statement(self, node_id: int) -> QueryBuilder:
+        return QueryBuilder().match_by_id(node_id, "n").add(self.HYDRATE_RETURN)
+
+    def _expand_statement(self, node_id: int, depth: int, relationships: List[str] = None,
+                          limit: int = None) -> QueryBuilder:
+        """
+        Match all nodes within `depth` hops of a node breadth-first, one hop at a time:
+         Every hop expands the nodes which were reached by the previous one only, so that
+         each node is expanded once rather than once per path to it. The nodes are returned
+         nearest first, and hydrated like `_retrieve_statement()`.
+        """
+        rel_types = ":" + "|".join(relationships) if relationships else ""
+        builder = QueryBuilder().match_by_id(node_id, "s")
+        builder.add("WITH [s] AS reached, [[s]] AS levels, [s] AS level")
+        stop = "size(level) = 0"
+        if limit is not None:
+            stop += f" OR size(reached) >= {builder.param(int(limit), 'limit')}"
+        for _ in range(int(depth) if relationships is None or len(relationships) > 0 else 0):
+            # Expanding [null] keeps the row once there is nothing left to expand
+            builder.add(f"UNWIND CASE WHEN {stop} THEN [null] ELSE level END AS l")
+            builder.add(f"OPTIONAL MATCH (l)-[{rel_types}]-(m) WHERE NOT m IN reached")
+            builder.add("WITH reached, levels, COLLECT(DISTINCT m) AS level")
+            builder.add("WITH reached + level AS reached, levels + [level] AS levels, level")
+        builder.add("UNWIND range(0, size(levels) - 1) AS distance UNWIND levels[distance] AS n")
+        builder.add("WITH n, distance ORDER BY distance, ID(n)")
+        if limit is not None:
+            builder.add(f"LIMIT {builder.param(int(limit), 'limit')}")
+        return builder.add(self.HYDRATE_RETURN)
+
+    def _update_statement(self, req: Node) -> Optional[QueryBuilder]:
+        """
+        Persist the changes of a node (see `Node.get_dirty_properties()` and
+         `Node.get_dirty_relationships()`) in one statement, which returns the
+         node's ID if it exists.
+        :return: The statement, or None if the node has no changes.
+        """
+        properties = req.get_dirty_properties()
+        relationships = req.get_dirty_relationships()
+        if len(properties) == 0 and len(relationships) == 0:
+            return None
+        builder = QueryBuilder()
+        builder.match_by_id(req.get_id(), "n")
+        if len(properties) > 0:
+            builder.set_values(properties, "n")
+        for counter, (key, value) in enumerate(relationships.items()):
+            # Collecting the neighbours keeps one row for `n`, even if none of them exists
+            builder.add(f"WITH n OPTIONAL MATCH (m{counter}) WHERE ID(m{counter}) IN {builder.param(list(value))}")
+            builder.add(f"WITH n, COLLECT(m{counter}) AS ms{counter}")
+            builder.add(f"FOREACH (m IN ms{counter} | MERGE (n)-[:{key}]-(m))")
+        builder.add("RETURN ID(n)")
+        return builder
+
+    def _delete_statements(self, req: Node) -> List[QueryBuilder]:
+        statements: List[QueryBuilder] = []
+        if req.get_properties() is not None:
+            properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
+            if len(properties) > 0:
+                builder = QueryBuilder()
+                builder.match_by_id(req.get_id(), "n")
+
+                for key, _ in properties.items():
+                    if key != "name":
+                        builder.add(f"REMOVE n.{key}")
+                builder.add("RETURN n")
+                statements.append(builder)
+
+        relationships = dict(req.iter_relationships())
+        if len(relationships) > 0:
+            # One expansion from `n` over all requested types, rather than one MATCH per type,
+            #  which would be joined into a cartesian product
+            edges = [[key, other] for key, value in relationships.items() for other in value]
+            builder = QueryBuilder()
+            builder.add(f"MATCH (n)-[r:{'|'.join(relationships)}]-(m) WHERE ID(n)={builder.param(req.get_id(), 'n_id')}")
+            builder.add(f"AND [TYPE(r), ID(m)] IN {builder.param(edges, 'edges')}")
+            builder.add("DELETE r RETURN DISTINCT ID(n)")
+            statements.append(builder)
+        return statements
+
+    def _delete_nodes_statement(self, node_ids: List[int]) -> QueryBuilder:
+        builder = QueryBuilder()
+        builder.add(f"UNWIND {builder.param(node_ids, 'ids')} AS id")
+        builder.add("MATCH (n) WHERE ID(n)=id DETACH DELETE n RETURN id")
+        return builder
+
+    def _edges_by_type(self, edges: List[Tuple[int, str, int]]) -> Dict[str, List[List[int]]]:
+        """
+        Group edges into [source ID, target ID, index] rows per relationship type,
+         where `index` is the position of the edge in `edges`. Unknown types are reported and left out.
+        """
+        edges_by_type: Dict[str, List[List[int]]] = dict()
+        for index, (source, key, target) in enumerate(edges):
+            if key not in self._ontology.relationships:
+                print(f"No such relationship in ontology: the {key} is missing")  # Error
+                continue
+            edges_by_type.setdefault(key, []).append([source, target, index])
+        return edges_by_type
+
+    def _create_edges_statement(self, key: str, edges: List[List[int]]) -> QueryBuilder:
+        """
+        Create edges of one relationship type, given as [source ID, target ID, index] rows,
+         unless they exist already. The statement returns the index of every row whose nodes exist.
+        """
+        builder = QueryBuilder()
+        builder.add(f"UNWIND {builder.param(edges, 'edges')} AS edge")
+        builder.add("MATCH (n) WHERE ID(n)=edge[0] MATCH (m) WHERE ID(m)=edge[1]")
+        builder.add(f"MERGE (n)-[:{key}]-(m) RETURN edge[2] AS index")
+        return builder
+
+    def _delete_edges_statement(self, key: str, edges: List[List[int]]) -> QueryBuilder:
+        """
+        Delete edges of one relationship type, given as [source ID, target ID, index] rows.
+        The statement returns the index of every row for which an edge was deleted.
+        """
+        builder = QueryBuilder()
+        builder.add(f"UNWIND {builder.param(edges, 'edges')} AS edge")
+        builder.add(f"MATCH (n)-[r:{key}]-(m) WHERE ID(n)=edge[0] AND ID(m)=edge[1]")
+        builder.add("DELETE r RETURN DISTINCT edge[2] AS index")
+        return builder
+
+    @staticmethod
+    def _index_statement(index: IndexSpec, drop: bool = False) -> str:
+        """
+        Create or drop an index, or the uniqueness constraint which backs a unique index.
+        """
+        action = "DROP" if drop else "CREATE"
+        if index.unique:
+            return f"{action} CONSTRAINT ON (n:{index.label}) ASSERT n.{index.property} IS UNIQUE"
+        return f"{action} INDEX ON :{index.label}({index.property})"
+
+    @staticmethod
+    def _index_specs(records) -> List[IndexSpec]:
+        """
+        Read single-property node indexes from the records of `CALL db.indexes()`,
+         whose columns differ between Neo4j versions. Composite indexes are skipped.
+        """
+        result: List[IndexSpec] = []
+        for record in records:
+            labels = record.get('tokenNames') or record.get('labelsOrTypes') or []
+            properties = record.get('properties') or []
+            if len(labels) != 1 or len(properties) != 1:
+                continue
+            unique = 'unique' in str(record.get('type') or '').lower() or record.get('uniqueness') == 'UNIQUE'
+            result.append(IndexSpec(labels[0], properties[0], unique))
+        return result
+
+    def _observe(self, query: str, parameters: Optional[Dict[str, Any]], start: float, rows: int,
+                 round_trips: int = 1) -> None:
+        """
+        Report an executed statement to the metrics of this driver, if any.
+        :param start: Value of `time.perf_counter()` before the statement was sent.
+        """
+        if self._metrics is not None:
+            self._metrics.statement(query, parameters, time.perf_counter() - start, rows, round_trips)
+
+    def _batches(self, rows: List[Any], batch_size: int = None):
+        batch_size = batch_size or self._batch_size
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    @staticmethod
+    def _labels(req: Node) -> str:
+        labels = f":{req.get_entity()}"
+        if req.get_meta() is not None and len(req.get_meta()) > 0:
+            labels += ":" + ":".join(sorted(req.get_meta()))
+        return labels
+
+    def extract_node_type(self, labels: List[str]) -> Optional[OType]:
+        return self._ontology.resolve_type(labels)
+
+    def compose_node(self, otype: OType, node_id: int, properties: Dict[str, Any], relationships: Dict[str, Set[int]]):
+        new_node: Node = Node(metatype=otype)
+        new_node.set_id(node_id)
+        new_node.set_properties(properties)
+        new_node.set_relationships(relationships)
+        new_node.mark_clean()
+        return new_node
+
+    def iter_nodes(self, records: Iterable, page_size: int) -> Iterator[Node]:
+        """
+        Compose Nodes from a stream of records as for `compose_nodes()`,
+         holding no more than `page_size` records at a time.
+        """
+        page = []
+        for record in records:
+            page.append(record)
+            if len(page) >= page_size:
+                yield from self.compose_nodes(page)
+                page = []
+        yield from self.compose_nodes(page)
+
+    def compose_nodes(self, records) -> List[Node]:
+        """
+        Compose Nodes from records which hold a node `n` and the list of
+         its `edges` as [relationship type, neighbour ID] pairs, as returned by `HYDRATE_RETURN`.
+        Records whose labels do not resolve to an ontology type are skipped.
+        """
+        result_nodes: List[Node] = []
+        for record in records:
+            graph_node = record['n']
+            node_type: OType = self.extract_node_type(graph_node.labels)
+            if node_type is None:
+                continue
+
+            relationships: Dict[str, Set[int]] = dict()
+            for rel_type, other_id in record['edges']:
+                relationships.setdefault(rel_type, set()).add(other_id)
+
+            result_nodes.append(self.compose_node(node_type, int(graph_node.id), graph_node, relationships))
+        return result_nodes
@@ -0,0 +1,325 @@
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Set, Any, Tuple, Callable, Iterator
+
+from scientio.interfaces.operations import Operations
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.ontology.otype import OType
+from scientio.ontology.schema import SchemaReport
+
+
+class InMemoryDriver(Operations):
+    """
+    Implementation of the operations interface for an in-process graph memory.
+    Nodes are kept in hash indexes by ID, label and property value, and edges
+     in one undirected adjacency map per relationship type. The semantics of
+     all operations follow the Neo4jDriver, so this driver may be used as an
+     embedded memory or as a stand-in for Neo4j in tests.
+    """
+
+    _ontology: Ontology
+    _next_id: int
+    _types: Dict[int, OType]
+    _properties: Dict[int, Dict[str, Any]]
+    _by_label: Dict[str, Set[int]]
+    _by_property: Dict[Tuple[str, Any], Set[int]]
+    _adjacency: Dict[str, Dict[int, Set[int]]]
+
+    def __init__(self, ontology, **kwargs):
+        self._ontology = ontology
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._types = dict()
+        self._properties = dict()
+        self._by_label = dict()
+        self._by_property = dict()
+        self._adjacency = dict()
+        self._journal: Optional[List[Callable[[], None]]] = None
+
+    def create(self, request: Node) -> Optional[Node]:
+        if self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
+            return self.create_node(request)
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    def retrieve(self, request: Node = None, node_id: int = None) -> Optional[List[Node]]:
+        if node_id is not None and node_id >= 0:
+            return self.get_node_by_id(node_id)
+        else:
+            if request is not None and self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
+                return self.get_node(request)
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    def expand(self, node_id: int, depth: int = 1, relationships: List[str] = None,
+               limit: int = None) -> Optional[List[Node]]:
+        if relationships is not None and not self._ontology.relationships.issuperset(relationships):
+            print(f"No such relationships in ontology: {set(relationships) - self._ontology.relationships}")  # Error
+            return None
+        with self._lock:
+            if node_id not in self._types:
+                return []
+            adjacencies = [adjacency for key, adjacency in self._adjacency.items()
+                           if relationships is None or key in relationships]
+            # Breadth-first, visiting the nodes of each level in order of their IDs
+            reached: List[int] = [node_id]
+            visited: Set[int] = {node_id}
+            level: List[int] = [node_id]
+            for _ in range(depth):
+                if limit is not None and len(reached) >= limit:
+                    break
+                neighbours: Set[int] = set()
+                for other in level:
+                    for adjacency in adjacencies:
+                        neighbours.update(adjacency.get(other, ()))
+                level = sorted(neighbours - visited)
+                visited.update(level)
+                reached.extend(level)
+            if limit is not None:
+                reached = reached[:limit]
+            return [self.compose_node(other) for other in reached]
+
+    def iter_retrieve(self, request: Node, page_size: int = None) -> Iterator[Node]:
+        if request is None or not self._ontology.__contains__(request.get_type()):
+            print(f"No such type in ontology: the {request.get_type() if request else None} is missing")  # Error
+            return
+        yield from self.iter_node(request)
+
+    def update(self, request: Node) -> Optional[Node]:
+        if self._ontology.__contains__(request.get_type()) and request.get_id() >= 0:  # The class of Node is in ontology
+            return self.update_node(request)
+        print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+        return None
+
+    def delete(self, request: Node) -> bool:
+        if request.get_id() >= 0:
+            return self.delete_properties_relationships(request)
+        return False
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if self._journal is not None:  # Nested: join the enclosing transaction
+                yield
+                return
+            self._journal = []
+            try:
+                yield
+            except BaseException:
+                journal, self._journal = self._journal, None
+                for undo in reversed(journal):
+                    undo()
+                raise
+            finally:
+                self._journal = None
+
+    def create_node(self, req: Node) -> Optional[Node]:
+        with self._lock:
+            node_id = self._next_id
+            self._next_id += 1
+            otype = req.get_type()
+            self._types[node_id] = otype
+            self._properties[node_id] = dict()
+            for label in self._labels(otype):
+                self._by_label.setdefault(label, set()).add(node_id)
+            self._log(lambda: self._drop_node(node_id))
+            self._set_properties(node_id, dict((x, y) for x, y in req.get_properties().items() if y != ""))
+        req.set_id(node_id)
+        req.mark_clean(relationships=False)  # Relationships are not created along with the node
+        return req
+
+    def get_node(self, req: Node) -> Optional[List[Node]]:
+        with self._lock:
+            return [self.compose_node(node_id) for node_id in self._match_ids(req)]
+
+    def iter_node(self, req: Node) -> Iterator[Node]:
+        """
+        Compose the nodes matching the request one at a time, as they are consumed.
+        Only the matching IDs are determined upfront. Nodes which are deleted
+         before they are reached are skipped.
+        """
+        with self._lock:
+            node_ids = self._match_ids(req)
+        for node_id in node_ids:
+            with self._lock:
+                if node_id not in self._types:
+                    continue
+                node = self.compose_node(node_id)
+            yield node
+
+    def _match_ids(self, req: Node) -> List[int]:
+        with self._lock:
+            candidates: List[Set[int]] = []
+            if req.get_entity() is not None:
+                candidates.append(self._by_label.get(req.get_entity(), set()))
+                if req.get_meta() is not None:
+                    candidates.extend(self._by_label.get(label, set()) for label in req.get_meta())
+            else:
+                candidates.append(set(self._types))
+
+            if req.get_properties() is not None:
+                for key, value in req.get_properties().items():
+                    if value != "":
+                        candidates.append(self._by_property.get(self._index_key(key, value), set()))
+
+            if req.get_relationships() is not None:
+                for key, value in req.iter_relationships():
+                    if len(value) > 0:
+                        adjacency = self._adjacency.get(key, dict())
+                        candidates.append(set().union(*[adjacency.get(other, set()) for other in value]))
+
+            candidates.sort(key=len)
+            node_ids = set(candidates[0]).intersection(*candidates[1:])
+            return sorted(node_ids)
+
+    def get_node_by_id(self, node_id: int) -> Optional[List[Node]]:
+        with self._lock:
+            if node_id not in self._types:
+                return None
+            return [self.compose_node(node_id)]
+
+    def update_node(self, req: Node) -> Optional[Node]:
+        node_id = req.get_id()
+        with self._lock:
+            if node_id not in self._types:
+                return None
+
+            self._set_properties(node_id, req.get_dirty_properties())
+            for key, value in req.get_dirty_relationships().items():
+                for other in value:
+                    if other in self._types:
+                        self._add_edge(key, node_id, other)
+
+        req.mark_clean()
+        return req
+
+    def delete_properties_relationships(self, req: Node) -> bool:
+        node_id = req.get_id()
+        response = False
+        with self._lock:
+            if node_id not in self._types:
+                return response
+
+            if req.get_properties() is not None:
+                properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
+                if len(properties) > 0:
+                    self._set_properties(node_id, {key: "" for key in properties if key != Node.NAME_STR})
+                    response = True
+
+            if req.get_relationships() is not None:
+                for key, value in req.iter_relationships():
+                    for other in value:
+                        if self._remove_edge(key, node_id, other):
+                            response = True
+
+        return response
+
+    def sync_schema(self, apply: bool = True, drop_unused: bool = False) -> SchemaReport:
+        # Every property value is indexed already, and uniqueness is not enforced
+        return SchemaReport()
+
+    def delete_nodes(self, node_ids: List[int], batch_size: int = None) -> List[bool]:
+        result: List[bool] = []
+        with self._lock:
+            for node_id in node_ids:
+                if node_id not in self._types:
+                    result.append(False)
+                    continue
+                for key, adjacency in list(self._adjacency.items()):
+                    for other in list(adjacency.get(node_id, ())):
+                        self._remove_edge(key, node_id, other)
+                otype = self._types[node_id]
+                self._drop_node(node_id)
+                self._log(lambda node_id=node_id, otype=otype: self._restore_node(node_id, otype))
+                result.append(True)
+        return result
+
+    def create_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        result: List[bool] = []
+        with self._lock:
+            for source, key, target in edges:
+                if source not in self._types or target not in self._types or key not in self._ontology.relationships:
+                    result.append(False)
+                    continue
+                self._add_edge(key, source, target)
+                result.append(True)
+        return result
+
+    def delete_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        with self._lock:
+            return [self._remove_edge(key, source, target) for source, key, target in edges]
+
+    def compose_node(self, node_id: int) -> Node:
+        otype = self._types[node_id]
+        new_node: Node = Node(metatype=otype)
+        new_node.set_id(node_id)
+        new_node.set_properties(self._properties[node_id])
+        new_node.set_relationships({
+            key: set(adjacency[node_id]) for key, adjacency in self._adjacency.items() if node_id in adjacency})
+        new_node.mark_clean()
+        return new_node
+
+    def _log(self, undo: Callable[[], None]):
+        """
+        Record how to revert a change, if a transaction is active.
+        """
+        if self._journal is not None:
+            self._journal.append(undo)
+
+    def _drop_node(self, node_id: int):
+        self._set_properties(node_id, {key: "" for key in self._properties[node_id]})
+        for label in self._labels(self._types[node_id]):
+            self._by_label[label].discard(node_id)
+        del self._properties[node_id]
+        del self._types[node_id]
+
+    def _restore_node(self, node_id: int, otype: OType):
+        """
+        Recreate a dropped node without properties, to undo `_drop_node()`.
+        """
+        self._types[node_id] = otype
+        self._properties[node_id] = dict()
+        for label in self._labels(otype):
+            self._by_label.setdefault(label, set()).add(node_id)
+
+    def _set_properties(self, node_id: int, properties: Dict[str, Any]):
+        stored = self._properties[node_id]
+        previous = {key: stored.get(key, "") for key in properties}
+        self._log(lambda: self._set_properties(node_id, previous))
+        for key, value in properties.items():
+            if key in stored:
+                self._by_property[self._index_key(key, stored[key])].discard(node_id)
+                del stored[key]
+            if value != "":
+                stored[key] = value
+                self._by_property.setdefault(self._index_key(key, value), set()).add(node_id)
+
+    def _add_edge(self, key: str, node_id: int, other: int):
+        adjacency = self._adjacency.setdefault(key, dict())
+        if other in adjacency.get(node_id, set()):
+            return
+        adjacency.setdefault(node_id, set()).add(other)
+        adjacency.setdefault(other, set()).add(node_id)
+        self._log(lambda: self._remove_edge(key, node_id, other))
+
+    def _remove_edge(self, key: str, node_id: int, other: int) -> bool:
+        adjacency = self._adjacency.get(key, dict())
+        if other not in adjacency.get(node_id, set()):
+            return False
+        for source, target in ((node_id, other), (other, node_id)):
+            adjacency[source].discard(target)
+            if len(adjacency[source]) == 0:
+                del adjacency[source]
+        self._log(lambda: self._add_edge(key, node_id, other))
+        return True
+
+    @staticmethod
+    def _labels(otype: OType) -> Set[str]:
+        return {otype.entity} | otype.meta
+
+    @staticmethod
+    def _index_key(key: str, value: Any) -> Tuple[str, Any]:
+        if isinstance(value, list):
+            value = tuple(value)
+        return key, value
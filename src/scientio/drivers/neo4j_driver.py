@@ -1,23 +1,33 @@
-from typing import Optional, Dict, List, Set
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any, Iterator, Tuple
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, READ_ACCESS
 from neo4j import Node as Neo4jNode
+from neo4j import __version__ as neo4j_version
 
+from scientio.drivers.cypher_driver import CypherDriver
 from scientio.interfaces.operations import Operations
 from scientio.ontology.node import Node
-from scientio.ontology.ontology import Ontology
-from scientio.ontology.otype import OType
+from scientio.ontology.schema import SchemaReport, compare_indexes
+from scientio.util.profiling import Profiler
 from scientio.util.query_builder import QueryBuilder
 
+"""
+Whether the neo4j client fetches records in batches of a `fetch_size` per session.
+ Clients before version 4 receive all records of a statement at once.
+"""
+FETCH_SIZE_SUPPORTED = int(neo4j_version.split(".")[0]) >= 4
 
-class Neo4jDriver(Operations):
+
+class Neo4jDriver(CypherDriver, Operations):
     """
     Implementation of the operations interface for a Neo4j-based graph memory
     TODO: Refactor the naked Cypher expressions to QueryBuilder
     """
 
     _driver: GraphDatabase.driver
-    _ontology: Ontology
 
     def __init__(self, ontology, **kwargs):
         try:
@@ -26,15 +36,19 @@ class Neo4jDriver(Operations):
             password = kwargs['neo4j_password']
         except KeyError as e:
             raise e
-        self._driver = GraphDatabase.driver(uri, auth=(user, password))
-        self._ontology = ontology
+        super().__init__(ontology, **kwargs)
+        if not FETCH_SIZE_SUPPORTED and self._session_config.pop('fetch_size', None) is not None:
+            print(f"Warning: fetch_size is ignored by the neo4j client {neo4j_version}, version 4 or newer is required")
+        self._driver = GraphDatabase.driver(uri, auth=(user, password), **self._pool_config)
+        self._local = threading.local()
 
     def __del__(self):
         self._driver.close()
 
     def create(self, request: Node) -> Optional[Node]:
         if self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
-            return self.create_node(request)
+            with self._session():
+                return self.create_node(request)
         print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
         return None
 
@@ -43,200 +57,390 @@ class Neo4jDriver(Operations):
             return self.get_node_by_id(node_id)
         else:
             if request is not None and self._ontology.__contains__(request.get_type()):  # The class of Node is in ontology
-                return self.get_node(request)
+                with self._session():
+                    return self.get_node(request)
         print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
         return None
 
+    def expand(self, node_id: int, depth: int = 1, relationships: List[str] = None,
+               limit: int = None) -> Optional[List[Node]]:
+        if relationships is not None and not self._ontology.relationships.issuperset(relationships):
+            print(f"No such relationships in ontology: {set(relationships) - self._ontology.relationships}")  # Error
+            return None
+        builder = self._expand_statement(node_id, depth, relationships, limit)
+        with self._session():
+            records = self._exec_query(builder.get(), builder.get_parameters(), single=False, read=True)
+        return self.compose_nodes(records)
+
+    def iter_retrieve(self, request: Node, page_size: int = None) -> Iterator[Node]:
+        if request is None or not self._ontology.__contains__(request.get_type()):
+            print(f"No such type in ontology: the {request.get_type() if request else None} is missing")  # Error
+            return
+        yield from self.iter_node(request, page_size or self._batch_size)
+
     def update(self, request: Node) -> Optional[Node]:
         if self._ontology.__contains__(request.get_type()) and request.get_id() >= 0:  # The class of Node is in ontology
-            return self.update_node(request)
+            with self._session():
+                return self.update_node(request)
         print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
         return None
 
     def delete(self, request: Node) -> bool:
         if request.get_id() >= 0:
-            return self.delete_properties_relationships(request)
+            with self._session():
+                return self.delete_properties_relationships(request)
         return False
 
-    def _exec_transaction(self, tx, query: str):
-        result = tx.run(query)
+    def create_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        with self._session():
+            return self._create_many(requests, batch_size)
+
+    def _create_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        result: List[Optional[Node]] = [None] * len(requests)
+        rows_by_labels: Dict[str, List[Dict[str, Any]]] = dict()
+        for index, request in enumerate(requests):
+            if not self._ontology.__contains__(request.get_type()):
+                print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+                continue
+            properties = dict((x, y) for x, y in request.get_properties().items() if y != "")
+            rows_by_labels.setdefault(self._labels(request), []).append({"index": index, "properties": properties})
+
+        for labels, rows in rows_by_labels.items():
+            for batch in self._batches(rows, batch_size):
+                builder = QueryBuilder()
+                builder.add(f"UNWIND {builder.param(batch, 'rows')} AS row")
+                builder.add(f"CREATE (n{labels}) SET n = row.properties")
+                builder.add("RETURN row.index AS index, ID(n) AS id")
+                for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                    request = requests[record['index']]
+                    request.set_id(int(record['id']))
+                    request.mark_clean(relationships=False)  # Relationships are not created along with the node
+                    result[record['index']] = request
+        return result
+
+    def update_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        with self._session():
+            return self._update_many(requests, batch_size)
+
+    def _update_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        result: List[Optional[Node]] = [None] * len(requests)
+        rows: List[Dict[str, Any]] = []
+        edges_by_type: Dict[str, List[List[int]]] = dict()
+        for index, request in enumerate(requests):
+            if not self._ontology.__contains__(request.get_type()) or request.get_id() < 0:
+                print(f"No such type in ontology: the {request.get_type()} is missing")  # Error
+                continue
+            properties = request.get_dirty_properties()
+            relationships = request.get_dirty_relationships()
+            if len(properties) == 0 and len(relationships) == 0:
+                result[index] = request  # Nothing to persist
+                continue
+            # Every changed node gets a row, so that the statement reports which nodes exist
+            rows.append({"index": index, "id": request.get_id(), "properties": properties})
+            for key, value in relationships.items():
+                edges_by_type.setdefault(key, []).extend([request.get_id(), other] for other in value)
+
+        for batch in self._batches(rows, batch_size):
+            builder = QueryBuilder()
+            builder.add(f"UNWIND {builder.param(batch, 'rows')} AS row")
+            builder.add("MATCH (n) WHERE ID(n)=row.id SET n += row.properties")
+            builder.add("RETURN row.index AS index")
+            for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                result[record['index']] = requests[record['index']]
+
+        for key, edges in edges_by_type.items():
+            for batch in self._batches(edges, batch_size):
+                builder = QueryBuilder()
+                builder.add(f"UNWIND {builder.param(batch, 'edges')} AS edge")
+                builder.add("MATCH (n), (m) WHERE ID(n)=edge[0] AND ID(m)=edge[1]")
+                builder.add(f"MERGE (n)-[:{key}]-(m)")
+                self._exec_query(builder.get(), builder.get_parameters(), single=False)
+
+        for request in result:
+            if request is not None:
+                request.mark_clean()
+        return result
+
+    def delete_many(self, requests: List[Node], batch_size: int = None) -> List[bool]:
+        with self._session():
+            return self._delete_many(requests, batch_size)
+
+    def _delete_many(self, requests: List[Node], batch_size: int = None) -> List[bool]:
+        result: List[bool] = [False] * len(requests)
+        rows_by_keys: Dict[tuple, List[Dict[str, Any]]] = dict()
+        edges_by_type: Dict[str, List[List[int]]] = dict()
+        for index, request in enumerate(requests):
+            if request.get_id() < 0:
+                continue
+            keys = tuple(sorted(x for x, y in request.get_properties().items() if y != "" and x != Node.NAME_STR))
+            if len(keys) > 0:
+                rows_by_keys.setdefault(keys, []).append({"index": index, "id": request.get_id()})
+            for key, value in request.iter_relationships():
+                edges_by_type.setdefault(key, []).extend([request.get_id(), other, index] for other in value)
+
+        for keys, rows in rows_by_keys.items():
+            for batch in self._batches(rows, batch_size):
+                builder = QueryBuilder()
+                builder.add(f"UNWIND {builder.param(batch, 'rows')} AS row")
+                builder.add("MATCH (n) WHERE ID(n)=row.id")
+                builder.add(f"REMOVE {', '.join(f'n.{key}' for key in keys)}")
+                builder.add("RETURN row.index AS index")
+                for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                    result[record['index']] = True
+
+        for key, edges in edges_by_type.items():
+            for batch in self._batches(edges, batch_size):
+                builder = self._delete_edges_statement(key, batch)
+                for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                    result[record['index']] = True
+        return result
+
+    def sync_schema(self, apply: bool = True, drop_unused: bool = False) -> SchemaReport:
+        with self._session():
+            records = self._exec_query("CALL db.indexes()", single=False, read=True, profile=False)
+            existing = self._index_specs(records)
+            report = compare_indexes(self._ontology, existing)
+            if apply:
+                for index in report.missing:
+                    if index.unique and index._replace(unique=False) in existing:
+                        # A constraint cannot be created while a plain index covers the same property
+                        self._exec_query(self._index_statement(index._replace(unique=False), drop=True), profile=False)
+                        report.dropped.append(index._replace(unique=False))
+                    self._exec_query(self._index_statement(index), profile=False)
+                    report.created.append(index)
+            if drop_unused:
+                for index in report.unused:
+                    if index not in report.dropped:
+                        self._exec_query(self._index_statement(index, drop=True), profile=False)
+                        report.dropped.append(index)
+        return report
+
+    def delete_nodes(self, node_ids: List[int], batch_size: int = None) -> List[bool]:
+        result: Dict[int, bool] = dict()
+        with self._session():
+            for batch in self._batches(list(set(node_ids)), batch_size):
+                builder = self._delete_nodes_statement(batch)
+                for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                    result[int(record['id'])] = True
+        return [result.get(node_id, False) for node_id in node_ids]
+
+    def create_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        result: List[bool] = [False] * len(edges)
+        with self._session():
+            for key, rows in self._edges_by_type(edges).items():
+                for batch in self._batches(rows, batch_size):
+                    builder = self._create_edges_statement(key, batch)
+                    for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                        result[record['index']] = True
         return result
 
-    def _exec_query(self, query: str, single=True):
-        with self._driver.session() as session:
+    def delete_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        result: List[bool] = [False] * len(edges)
+        with self._session():
+            for key, rows in self._edges_by_type(edges).items():
+                for batch in self._batches(rows, batch_size):
+                    builder = self._delete_edges_statement(key, batch)
+                    for record in self._exec_query(builder.get(), builder.get_parameters(), single=False):
+                        result[record['index']] = True
+        return result
+
+    def _exec_transaction(self, tx, query: str, parameters: Dict[str, Any]):
+        result = tx.run(query, parameters)
+        return result
+
+    @contextmanager
+    def transaction(self):
+        if getattr(self._local, 'tx', None) is not None:  # Nested: join the enclosing transaction
+            yield
+            return
+        with self._session() as session:
+            tx = session.begin_transaction()
+            self._local.tx = tx
+            try:
+                yield
+                tx.commit()
+            except BaseException:
+                tx.rollback()
+                raise
+            finally:
+                self._local.tx = None
+
+    @contextmanager
+    def _session(self):
+        """
+        Provide the driver session of the current thread, so that all statements
+         of one operation share it. A session is opened if none is active.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            yield session
+            return
+        with self._driver.session(**self._session_config) as session:
+            self._local.session = session
+            try:
+                yield session
+            finally:
+                self._local.session = None
+
+    def _exec_query(self, query: str, parameters: Dict[str, Any] = None, single=True, read=False, profile=True):
+        """
+        Execute a statement within the active transaction, or otherwise in a
+         transaction of it's own, which is routed to a follower for reads.
+        :param query: The Cypher statement.
+        :param parameters: Values for the parameters referenced in `query`.
+        :param single: Return only the first record if True, all records otherwise.
+        :param read: Execute the statement in a read transaction, unless a transaction is active.
+        :param profile: Capture the plan of the statement, if the driver has a profiler which
+         selects the current operation. Disable for statements which cannot be planned, e.g. schema changes.
+        """
+        start = time.perf_counter()
+        if profile and self._profiler is not None and self._profiler.selected():
+            result = self._profile_query(query, parameters, single, read)
+        else:
+            result = self._run_query(query, parameters, single, read)
+        self._observe(query, parameters, start, (0 if result is None else 1) if single else len(result))
+        return result
+
+    def _run_query(self, query: str, parameters: Dict[str, Any], single: bool, read: bool):
+        tx = getattr(self._local, 'tx', None)
+        if tx is not None:
+            bolt_statement = self._exec_transaction(tx, query, parameters)
+            return bolt_statement.single() if single else list(bolt_statement)
+        with self._session() as session:
+            run = session.read_transaction if read else session.write_transaction
             if single:
-                result = session.write_transaction(self._exec_transaction, query=query).single()
+                result = run(self._exec_transaction, query=query, parameters=parameters).single()
             else:
-                bolt_statement = session.write_transaction(self._exec_transaction, query=query)
+                bolt_statement = run(self._exec_transaction, query=query, parameters=parameters)
                 result = []
                 for record in bolt_statement:
                     result.append(record)
         return result
 
-    def create_node(self, req: Node) -> Optional[Node]:
-        builder = QueryBuilder()
-        builder.add("CREATE (a:" + req.get_entity())
-        if req.get_meta() is not None and len(req.get_meta()) > 0:
-            builder.add_meta(req.get_meta())
-        builder.add_parameters(req.get_properties()).add(") RETURN a")
+    def _profile_query(self, query: str, parameters: Dict[str, Any], single: bool, read: bool):
+        """
+        Execute a statement and capture it's plan. In EXPLAIN mode, the statement is
+         planned in a separate round-trip before it is executed, since an explained
+         statement yields no records. In PROFILE mode, it runs profiled instead.
+        """
+        if self._profiler.mode == Profiler.EXPLAIN:
+            summary = self._run_work(self._summary_transaction, f"EXPLAIN {query}", parameters, read)
+            self._profiler.capture(query, summary)
+            return self._run_query(query, parameters, single, read)
+        records, summary = self._run_work(self._profile_transaction, f"PROFILE {query}", parameters, read)
+        self._profiler.capture(query, summary)
+        if single:
+            return records[0] if len(records) > 0 else None
+        return records
+
+    def _run_work(self, work, query: str, parameters: Dict[str, Any], read: bool):
+        tx = getattr(self._local, 'tx', None)
+        if tx is not None:
+            return work(tx, query, parameters)
+        with self._session() as session:
+            run = session.read_transaction if read else session.write_transaction
+            return run(work, query, parameters)
+
+    @staticmethod
+    def _summary_transaction(tx, query: str, parameters: Dict[str, Any]):
+        return tx.run(query, parameters).consume()
+
+    @staticmethod
+    def _profile_transaction(tx, query: str, parameters: Dict[str, Any]):
+        result = tx.run(query, parameters)
+        records = list(result)
+        return records, result.consume()
 
-        record: Neo4jNode = self._exec_query(builder.get())[0]
+    def create_node(self, req: Node) -> Optional[Node]:
+        builder = self._create_statement(req)
+        record: Neo4jNode = self._exec_query(builder.get(), builder.get_parameters())[0]
         req.set_id(int(record.id))
+        req.mark_clean(relationships=False)  # Relationships are not created along with the node
         return req
 
     def get_node(self, req: Node) -> Optional[List[Node]]:
-        builder = QueryBuilder()
-        if req.get_entity() is not None:
-            builder.add(f"MATCH (n:{req.get_entity()}")
-            if req.get_meta() is not None and len(req.get_meta()) > 0:
-                builder.add_meta(req.get_meta())
-        else:
-            builder.add(f"MATCH (n")
-
-        if req.get_properties() is not None:
-            properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
-            if len(properties) > 0:
-                builder.add_parameters(properties)
-
-        builder.add(")")
-
-        if req.get_relationships() is not None:
-            counter: int = 0
-            for key, value in req.get_relationships().items():
-                if len(value) > 0:
-                    builder.add(f"MATCH (n)-[r{counter}:{key}]-(m{counter}) WHERE ID(m{counter}) IN {str(value)}")
-                    counter += 1
-        builder.add("RETURN COLLECT(ID(n)) AS ids")
-
-        records = self._exec_query(builder.get())[0]
-        result_nodes: List[Node] = []  # nodes from result
-        if len(records) > 0:
-            for record in records:
-                result_node = self.get_node_by_id(int(record))
-                result_nodes.append(result_node[0])
-
-        return result_nodes
+        """
+        Retrieve all nodes matching the request in a single round-trip.
+        Labels, properties and relationship IDs of every match are returned
+         by one query, from which the resulting Nodes are composed.
+        """
+        builder = self._retrieve_statement(req)
+        records = self._exec_query(builder.get(), builder.get_parameters(), single=False, read=True)
+        return self.compose_nodes(records)
+
+    def iter_node(self, req: Node, page_size: int) -> Iterator[Node]:
+        """
+        Stream all nodes matching the request from a server-side cursor.
+        Records are pulled as the iterator is consumed, so that only one page
+         of them is held at a time. Outside of an active transaction, the statement
+         runs in a read transaction of a dedicated session, which stays open
+         until the iterator is exhausted or closed.
+        Clients before version 4 do not fetch in pages, so `page_size` only bounds
+         the number of records which are composed into Nodes at a time.
+        """
+        builder = self._retrieve_statement(req)
+        tx = getattr(self._local, 'tx', None)
+        if tx is not None:
+            yield from self._stream(tx, builder, page_size)
+            return
+        session_config = dict(self._session_config, fetch_size=page_size) if FETCH_SIZE_SUPPORTED \
+            else self._session_config
+        with self._driver.session(access_mode=READ_ACCESS, **session_config) as session:
+            with session.begin_transaction() as tx:
+                yield from self._stream(tx, builder, page_size)
+
+    def _stream(self, tx, builder: QueryBuilder, page_size: int) -> Iterator[Node]:
+        """
+        Stream the nodes of a retrieve statement. If it's plan is captured, it is explained
+         before the stream starts, or profiled once the stream is exhausted.
+        """
+        start = time.perf_counter()
+        rows = 0
+        query = builder.get()
+        profiler = self._profiler if self._profiler is not None and self._profiler.selected() else None
+        if profiler is not None and profiler.mode == Profiler.EXPLAIN:
+            profiler.capture(query, self._summary_transaction(tx, f"EXPLAIN {query}", builder.get_parameters()))
+            profiler = None
+        try:
+            result = self._exec_transaction(tx, query if profiler is None else f"PROFILE {query}",
+                                            builder.get_parameters())
+            for node in self.iter_nodes(result, page_size):
+                rows += 1
+                yield node
+            if profiler is not None:
+                profiler.capture(query, result.consume())
+        finally:
+            self._observe(builder.get(), builder.get_parameters(), start, rows, rows // page_size + 1)
 
     def get_node_by_id(self, node_id: int) -> Optional[List[Node]]:
-        builder = QueryBuilder()
-        builder.match_by_id(node_id, "n").add("RETURN n")
-        result = self._exec_query(builder.get())
-
-        if len(result) <= 0:
-            return None
-        record: Neo4jNode = result[0]
+        builder = self._retrieve_by_id_statement(node_id)
+        records = self._exec_query(builder.get(), builder.get_parameters(), single=False, read=True)
+        result_nodes = self.compose_nodes(records)
 
-        node_type: OType = self.extract_node_type(record.labels)
-        if node_type is None:
+        if len(result_nodes) <= 0:
             return None
-
-        properties: Dict[str, str] = dict().fromkeys(node_type.properties, "")
-        for key, value in record.items():
-            properties.update({key: value})
-
-        builder = QueryBuilder()
-        builder.add(f"MATCH (n)-[r]-(m) WHERE ID(n)={node_id} RETURN TYPE(r) as name, COLLECT(ID(m)) as ids")
-        records = self._exec_query(builder.get(), single=False)
-
-        relationships = {rel: set() for rel in node_type.relationships}
-        if records is not None and len(records) > 0:
-            for record in records:
-                relationships.update({record.get('name'): set(record.get('ids'))})
-
-        result_node = self.compose_node(node_type, node_id, properties, relationships)
-        return [result_node]
-
-    def extract_node_type(self, labels: List[str]) -> Optional[OType]:
-        otypes: List[OType] = [self._ontology.get_type(str(x)) for x in labels]
-        meta_union: Set[str] = set().union(*[x.meta for x in otypes])
-        node_type: OType = None
-        for otype in otypes:
-            if otype.entity not in meta_union:
-                node_type = otype
-                break
-        return node_type
+        return result_nodes
 
     def update_node(self, req: Node) -> Optional[Node]:
-        if req.get_properties() is not None:
-            properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
-            if len(properties) > 0:
-                builder = QueryBuilder()
-                builder.match_by_id(req.get_id(), "n").set_values(req.get_properties(), "n").add("RETURN n")
-                _ = self._exec_query(builder.get())
-
-        if req.get_relationships() is not None:
-            relationships = dict((x, y) for x, y in req.get_relationships().items() if len(y) > 0)
-            if len(relationships) > 0:
-                builder = QueryBuilder()
-                builder.match_by_id(req.get_id(), "n")
-
-                counter: int = 0
-                for _, value in relationships.items():
-                    builder.add(f"MATCH (m{counter}) WHERE ID(m{counter}) IN [{','.join((str(rel) for rel in value))}] ")
-                    counter += 1
-                counter = 0
-                for key, _ in relationships.items():
-                    builder.add(f"MERGE (n)-[r{counter}:{key}]-(m{counter})")
-                    counter += 1
-                builder.add("RETURN n")
-
-                _ = self._exec_query(builder.get())
-
-        result_node = self.get_node_by_id(req.get_id())[0]  # node from result
-        return result_node
+        """
+        Persist only the changes of the node, in a single statement.
+        :return: The node itself once it is in sync, or None if no node with it's ID exists.
+         A node without changes is returned right away.
+        """
+        builder = self._update_statement(req)
+        if builder is not None:
+            if self._exec_query(builder.get(), builder.get_parameters()) is None:
+                return None
+            req.mark_clean()
+        return req
 
     def delete_properties_relationships(self, req: Node) -> bool:
         response = False
-
-        if req.get_properties() is not None:
-            properties = dict((x, y) for x, y in req.get_properties().items() if y != "")
-            if len(properties) > 0:
-                builder = QueryBuilder()
-                builder.match_by_id(req.get_id(), "n")
-
-                for key, _ in properties.items():
-                    if key != "name":
-                        builder.add(f"REMOVE n.{key}")
-                builder.add("RETURN n")
-
-                result = self._exec_query(builder.get())
-                if result:
-                    response = True
-
-        if req.get_relationships() is not None:
-            relationships = dict((x, y) for x, y in req.get_relationships().items() if len(y) > 0)
-            if len(relationships) > 0:
-                builder = QueryBuilder()
-                builder.match_by_id(req.get_id(), "n")
-
-                counter: int = 0
-                for key, value in relationships.items():
-                    builder.add(f"MATCH (n)-[r{counter}:{key}]-(m{counter}) WHERE ID(m{counter}) IN {value}")
-                    counter += 1
-                counter -= 1
-                builder.add(f"DELETE r{counter}")
-                while counter > 0:
-                    counter -= 1
-                    builder.add(f",r{counter}")
-                builder.add("RETURN n")
-
-                result = self._exec_query(builder.get())
-                if result:
-                    response = True
-
+        for builder in self._delete_statements(req):
+            result = self._exec_query(builder.get(), builder.get_parameters())
+            if result:
+                response = True
         return response
 
     def delete_node(self, node_id: int) -> bool:
-        query = ""  # builder from MNM
-        self._exec_query(query)
-        if self.get_node_by_id(node_id) is None:
-            return True
-        else:
-            return False
-
-    def compose_node(self, otype: OType, node_id: int, properties: Dict[str, str], relationships: Dict[str, Set[int]]):
-        new_node: Node = Node(metatype=otype)
-        new_node.set_id(node_id)
-        new_node.set_properties(properties)
-        new_node.set_relationships(relationships)
-        return new_node
+        return self.delete_nodes([node_id])[0]
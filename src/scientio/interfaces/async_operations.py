@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from scientio.ontology.node import Node
+
+
+class AsyncOperations(ABC):
+    """
+    Interface for awaitable CRUD operations within a graph memory
+    """
+    @abstractmethod
+    async def create(self, request: Node) -> Node:
+        """
+        Create a node
+        :param request:
+        :return: NodeModel
+        """
+        return NotImplemented
+
+    @abstractmethod
+    async def retrieve(self, request: Node = None, node_id: int = None) -> List[Node]:
+        """
+        Get node by ID
+        :param node_id:
+        :param request:
+        :return: NodeModel
+        """
+        return NotImplemented
+
+    @abstractmethod
+    async def update(self, request: Node) -> Node:
+        """
+        Update Nodes
+        :param request:
+        :return: NodeModel
+        """
+        return NotImplemented
+
+    @abstractmethod
+    async def delete(self, request: Node) -> bool:
+        """
+        Delete a Node
+        :param request:
+        :return: bool
+        """
+        return NotImplemented
+
+    async def close(self) -> None:
+        """
+        Release all resources held by the driver
+        """
+        pass
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import List, Optional, Iterator, Tuple
 
 from scientio.ontology.node import Node
+from scientio.ontology.schema import SchemaReport
 
 
 class Operations(ABC):
@@ -44,3 +46,143 @@ class Operations(ABC):
         :return: bool
         """
         return NotImplemented
+
+    def iter_retrieve(self, request: Node, page_size: int = None) -> Iterator[Node]:
+        """
+        Iterate over the nodes matching a request
+        Drivers which are able to stream results should override this.
+        :param request:
+        :param page_size: number of nodes fetched per round-trip
+        :return: Iterator of NodeModel
+        """
+        yield from self.retrieve(request) or []
+
+    def expand(self, node_id: int, depth: int = 1, relationships: List[str] = None,
+               limit: int = None) -> Optional[List[Node]]:
+        """
+        Get the neighbourhood of a node
+        Drivers which are able to traverse the graph in one query should override this.
+        :param node_id:
+        :param depth: maximum number of hops from the node
+        :param relationships: relationship types to traverse, or None for all. None are traversed if empty.
+        :param limit: maximum number of nodes
+        :return: List of NodeModel, nearest first, starting with the node itself
+        """
+        result: List[Node] = []
+        visited = {node_id}
+        level = [node_id]
+        for _ in range(depth + 1):
+            neighbours = set()
+            for other in level:
+                found = self.retrieve(node_id=other)
+                if not found:
+                    continue
+                result.append(found[0])
+                if limit is not None and len(result) >= limit:
+                    return result
+                for key, value in found[0].iter_relationships():
+                    if relationships is None or key in relationships:
+                        neighbours.update(value)
+            level = sorted(neighbours - visited)
+            visited.update(level)
+        return result
+
+    def create_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        """
+        Create several nodes
+        Drivers which are able to batch writes should override this.
+        :param requests:
+        :param batch_size: maximum number of nodes written per statement
+        :return: List of NodeModel with ID assigned, in input order. None for nodes which were not created.
+        """
+        return [self.create(request) for request in requests]
+
+    def update_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        """
+        Update several nodes
+        Drivers which are able to batch writes should override this.
+        :param requests:
+        :param batch_size: maximum number of nodes written per statement
+        :return: List of NodeModel, in input order. None for nodes which were not updated.
+        """
+        return [self.update(request) for request in requests]
+
+    def delete_many(self, requests: List[Node], batch_size: int = None) -> List[bool]:
+        """
+        Delete several Nodes
+        Drivers which are able to batch writes should override this.
+        :param requests:
+        :param batch_size: maximum number of nodes written per statement
+        :return: List of bool, in input order
+        """
+        return [self.delete(request) for request in requests]
+
+    def sync_schema(self, apply: bool = True, drop_unused: bool = False) -> SchemaReport:
+        """
+        Compare the indexes and uniqueness constraints required by the ontology with existing ones
+        :param apply: create missing indexes
+        :param drop_unused: drop indexes on ontology labels which the ontology does not require
+        :return: SchemaReport
+        Drivers without a schema should keep this default, which reports nothing missing.
+        """
+        return SchemaReport()
+
+    def delete_nodes(self, node_ids: List[int], batch_size: int = None) -> List[bool]:
+        """
+        Delete whole Nodes along with all of their relationships
+        :param node_ids:
+        :param batch_size: maximum number of nodes deleted per statement
+        :return: List of bool, in input order. True for every node which existed and was removed.
+        Drivers which are able to remove nodes should override this. The default removes nothing,
+         since `delete()` only strips a node of its properties and relationships, and reports
+         False for every node.
+        """
+        print("Error: Driver is not able to delete nodes")  # Error
+        return [False] * len(node_ids)
+
+    def create_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        """
+        Create single relationships between existing Nodes
+        Drivers which are able to batch writes should override this.
+        :param edges: (source node ID, relationship, target node ID) triples
+        :param batch_size: maximum number of edges created per statement
+        :return: List of bool, in input order. True for every edge whose nodes exist.
+        """
+        result: List[bool] = []
+        for source, key, target in edges:
+            found = self.retrieve(node_id=source)
+            if not found or not self.retrieve(node_id=target) or key not in found[0].get_relationships():
+                result.append(False)
+                continue
+            found[0].add_relationships({key: {target}})
+            result.append(self.update(found[0]) is not None)
+        return result
+
+    def delete_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        """
+        Delete single relationships between Nodes
+        Drivers which are able to batch writes should override this.
+        :param edges: (source node ID, relationship, target node ID) triples
+        :param batch_size: maximum number of edges deleted per statement
+        :return: List of bool, in input order. True for every edge which existed.
+        """
+        result: List[bool] = []
+        for source, key, target in edges:
+            found = self.retrieve(node_id=source)
+            if not found or target not in dict(found[0].iter_relationships()).get(key, ()):
+                result.append(False)
+                continue
+            request = Node(metatype=found[0].get_type())
+            request.set_id(source)
+            request.add_relationships({key: {target}})
+            result.append(self.delete(request))
+        return result
+
+    @contextmanager
+    def transaction(self):
+        """
+        Execute all operations within the context as one transaction,
+         which is committed on exit, or rolled back if an exception is raised.
+        Drivers which support explicit transactions should override this.
+        """
+        yield
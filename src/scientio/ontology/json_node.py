@@ -1,14 +1,204 @@
-from typing import Optional
+import json
+from typing import Optional, Dict, List, Any, Tuple, Iterable, Iterator, TextIO, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from scientio.ontology.node import Node
+    from scientio.ontology.ontology import Ontology
+
+"""
+Separators for compact JSON without insignificant whitespace.
+"""
+COMPACT_SEPARATORS = (',', ':')
 
 
 class JsonNode(object):
+    """
+    JSON-ready representation of a Node. Property values are kept positionally,
+     in the order of the Node's OType layout, so that a stream of nodes
+     (see NodeEncoder) names every property once per type rather than per node.
+    """
+    __slots__ = ('id', 'entity', 'meta', 'properties', 'values', 'relationships')
+
+    def __init__(self, node_id: int = -1, entity: str = None, meta: Optional[List[str]] = None,
+                 properties: Tuple[str, ...] = (), values: List[Any] = None,
+                 relationships: Dict[str, List[int]] = None):
+        """
+        :param node_id: ID of the node.
+        :param entity: Entity of the node's OType.
+        :param meta: Meta labels of the node, or None if they are the meta of the OType.
+        :param properties: Property names, in the order of `values`.
+        :param values: Property values, where "" denotes an unset property.
+        :param relationships: Sorted node IDs per non-empty relationship.
+        """
+        self.id = node_id
+        self.entity = entity
+        self.meta = meta
+        self.properties = properties
+        self.values = values if values is not None else [""] * len(properties)
+        self.relationships = relationships or dict()
+
+    @staticmethod
+    def from_node(node: 'Node') -> 'JsonNode':
+        otype = node.get_type()
+        meta = None if otype is not None and node.get_meta() == otype.meta else sorted(node.get_meta())
+        return JsonNode(node.get_id(), node.get_entity(), meta, node._layout.properties, list(node._values),
+                        {key: sorted(value) for key, value in node.iter_relationships()})
+
+    def to_node(self, ontology: 'Ontology') -> Optional['Node']:
+        """
+        Create a Node, whose OType is resolved from the ontology by entity.
+        :param ontology: The ontology of the node.
+        :return: The node, or None if it's entity is not part of the ontology.
+        """
+        from scientio.ontology.node import Node  # Deferred, since node imports this module
+        otype = ontology.get_type(self.entity)
+        if otype is None:
+            print("Error: Unknown entity: ", self.entity)  # Error
+            return None
+        node = Node(metatype=otype)
+        node.set_id(self.id)
+        if self.meta is not None:
+            node.set_meta(frozenset(self.meta))
+        node.set_properties({key: value for key, value in zip(self.properties, self.values) if value != ""})
+        node.set_relationships({key: set(value) for key, value in self.relationships.items()})
+        node.mark_clean()
+        return node
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Self-describing form of a single node, with named properties.
+         Unset properties are omitted.
+        """
+        result = {
+            "id": self.id,
+            "entity": self.entity,
+            "properties": {key: value for key, value in zip(self.properties, self.values) if value != ""},
+            "relationships": self.relationships}
+        if self.meta is not None:
+            result["meta"] = self.meta
+        return result
+
+    @staticmethod
+    def from_dict(value: Dict[str, Any]) -> 'JsonNode':
+        properties: Dict[str, Any] = value.get("properties", dict())
+        return JsonNode(value.get("id", -1), value.get("entity"), value.get("meta"),
+                        tuple(properties.keys()), list(properties.values()), value.get("relationships"))
+
+    def dumps(self) -> str:
+        return json.dumps(self.to_dict(), separators=COMPACT_SEPARATORS)
+
+    @staticmethod
+    def loads(text: str) -> 'JsonNode':
+        return JsonNode.from_dict(json.loads(text))
+
+    def to_row(self) -> List[Any]:
+        """
+        Compact form of a node within a stream: [id, entity, values, relationships(, meta)].
+        """
+        row = [self.id, self.entity, self.values, self.relationships]
+        if self.meta is not None:
+            row.append(self.meta)
+        return row
+
+    @staticmethod
+    def from_row(row: List[Any], properties: Tuple[str, ...]) -> 'JsonNode':
+        return JsonNode(row[0], row[1], row[4] if len(row) > 4 else None, properties, row[2], row[3])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.dumps()})"
+
+
+class NodeEncoder(object):
+    """
+    Streaming encoder of nodes into JSON Lines. Before the first node of a type,
+     a declaration line lists the type's properties: {"entity": ..., "properties": [...]}.
+     Every node is then written as an array, see `JsonNode.to_row()`.
+    An encoder must be used for one stream only, since it remembers the declared types.
+    """
 
     def __init__(self):
-        pass
+        self._declared: Dict[str, Tuple[str, ...]] = dict()
+
+    def encode(self, node: 'Node') -> Iterator[str]:
+        """
+        Encode a node into one or two lines, without line breaks.
+        """
+        json_node = node.to_json()
+        if self._declared.get(json_node.entity) != json_node.properties:
+            self._declared[json_node.entity] = json_node.properties
+            yield json.dumps({"entity": json_node.entity, "properties": json_node.properties},
+                             separators=COMPACT_SEPARATORS)
+        yield json.dumps(json_node.to_row(), separators=COMPACT_SEPARATORS)
+
+    def dump(self, nodes: Iterable['Node'], fp: TextIO) -> int:
+        """
+        Write nodes to a text file.
+        :return: The number of nodes written.
+        """
+        count = 0
+        for node in nodes:
+            for line in self.encode(node):
+                fp.write(line)
+                fp.write("\n")
+            count += 1
+        return count
+
+
+class NodeDecoder(object):
+    """
+    Streaming decoder of nodes from the JSON Lines written by a NodeEncoder.
+    """
+
+    def __init__(self, ontology: 'Ontology'):
+        self._ontology = ontology
+        self._declared: Dict[str, Tuple[str, ...]] = dict()
 
-    def to_node(self):
+    def decode(self, line: str) -> Optional['Node']:
         """
-        TODO
+        Decode a single line.
+        :return: The node, or None if the line declares a type, is blank or cannot be decoded.
         """
-        return None
+        if not line.strip():
+            return None
+        try:
+            return self.decode_value(json.loads(line))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print("Error decoding node: ", e)  # Error
+            return None
+
+    def decode_value(self, value: Any) -> Optional['Node']:
+        """
+        Decode the parsed JSON value of a single line, see `decode()`.
+        """
+        if isinstance(value, dict):
+            self._declared[value["entity"]] = tuple(value["properties"])
+            return None
+        properties = self._declared.get(value[1])
+        if properties is None:
+            print("Error: Node of undeclared entity: ", value[1])  # Error
+            return None
+        return JsonNode.from_row(value, properties).to_node(self._ontology)
+
+    def load(self, fp: Iterable[str]) -> Iterator['Node']:
+        """
+        Read nodes from a text file, or any other iterable of lines, one at a time.
+        """
+        for line in fp:
+            node = self.decode(line)
+            if node is not None:
+                yield node
+
+
+def dumps_nodes(nodes: Iterable['Node']) -> str:
+    """
+    Encode nodes into JSON Lines, see NodeEncoder.
+    """
+    encoder = NodeEncoder()
+    return "".join(line + "\n" for node in nodes for line in encoder.encode(node))
+
+
+def loads_nodes(text: str, ontology: 'Ontology') -> List['Node']:
+    """
+    Decode all nodes from JSON Lines, see NodeDecoder.
+    """
+    return list(NodeDecoder(ontology).load(text.splitlines()))
@@ -1,10 +1,10 @@
 import copy
 from enum import Enum
-from collections import defaultdict
-from typing import Dict, List, FrozenSet, Optional, Union, Any, Set
+from collections.abc import MutableMapping
+from typing import Dict, List, FrozenSet, Optional, Union, Any, Set, Iterator, Tuple
 
 from scientio.ontology.json_node import JsonNode
-from scientio.ontology.otype import OType
+from scientio.ontology.otype import OType, OTypeLayout
 
 
 class RelationshipAvailability(Enum):
@@ -16,12 +16,120 @@ class RelationshipAvailability(Enum):
     NONE_AVAILABLE = 3
 
 
+EMPTY_LAYOUT = OTypeLayout()
+EMPTY_RELATIONSHIP: FrozenSet[int] = frozenset()
+
+"""
+Types of property values which may be modified in place, and are therefore never shared between copies.
+"""
+MUTABLE_VALUE_TYPES = (list, dict, set)
+
+
+class PropertyView(MutableMapping):
+    """
+    Dictionary-like view on the property values of a Node,
+     which are stored positionally according to the Node's OTypeLayout.
+    Only properties which are allowed by the layout may be set.
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, node: 'Node'):
+        self._node = node
+
+    def __getitem__(self, key: str) -> Any:
+        return self._node._values[self._node._layout.index[key]]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._node._layout.index:
+            raise KeyError(key)
+        self._node.set_properties({key: value})
+
+    def __delitem__(self, key: str) -> None:
+        self[key] = ""
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._node._layout.properties)
+
+    def __len__(self) -> int:
+        return len(self._node._layout.properties)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._node._layout.index
+
+    def items(self):
+        return list(zip(self._node._layout.properties, self._node._values))
+
+    def values(self):
+        return list(self._node._values)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class RelationshipView(MutableMapping):
+    """
+    Dictionary-like view on the relationships of a Node. The set of
+     node IDs for a relationship is only allocated when it is accessed,
+     either by it's name or through items or values. Every set which is
+     handed out may be modified, just like those of `get_relationships()`.
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, node: 'Node'):
+        self._node = node
+
+    def __getitem__(self, key: str) -> Set[int]:
+        if key not in self._node._layout.relationships:
+            raise KeyError(key)
+        return self._node.get_relationships(key)
+
+    def __setitem__(self, key: str, value: Set[int]) -> None:
+        if key not in self._node._layout.relationships:
+            raise KeyError(key)
+        self._node.set_relationships({key: value})
+
+    def __delitem__(self, key: str) -> None:
+        self[key] = set()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._node._layout.relationships)
+
+    def __len__(self) -> int:
+        return len(self._node._layout.relationships)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._node._layout.relationships
+
+    def items(self):
+        return [(key, self[key]) for key in self._node._layout.relationships]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __repr__(self) -> str:
+        allocated = self._node._relationships or dict()
+        return repr({key: set(allocated.get(key, EMPTY_RELATIONSHIP)) for key in self._node._layout.relationships})
+
+
+
 class Node(object):
     """
     Get access to all attributes of a Node in the neo4j memory using this class.
     Attributes of Node: ID, Type, Relationships, Properties
+    Property values are stored positionally according to the field layout of the
+     Node's OType, and relationship sets are only allocated once they are used.
+    Copies of a Node share their immutable property values with the original,
+     until either of them is modified (copy-on-write). Relationship sets and
+     mutable values are copied, since they may have been handed out for modification.
+    Changes since the node was loaded or created are tracked, so that
+     only they need to be persisted by an update.
     """
 
+    __slots__ = ('id', 'otype', 'entity', 'meta', '_layout', '_values', '_relationships', '_shared',
+                 '_dirty', '_changes')
+
+    _SHARED_VALUES = 1
+
     NAME_STR: str = "name"
     ID_STR: str = "id"
 
@@ -29,8 +137,12 @@ class Node(object):
     otype: OType
     entity: str
     meta: FrozenSet[str]
-    properties: Dict[str, str]
-    relationships: Dict[str, Set[int]]
+    _layout: OTypeLayout
+    _values: List[Any]
+    _relationships: Optional[Dict[str, Set[int]]]
+    _shared: int  # Bit flags which mark containers that are shared with copies of this node
+    _dirty: int  # Bit set of the positions of changed property values
+    _changes: Optional[Dict[str, Optional[Set[int]]]]  # Added node IDs per relationship, None if unknown
 
     def __init__(self, node: 'Node' = None, metatype: OType = None):
         """
@@ -39,11 +151,28 @@ class Node(object):
         :param metatype: give new node a meta like "person" or "robot"
         """
         self.id = -1
+        self.otype = None
+        self.entity = None
+        self.meta = frozenset()
+        self._layout = EMPTY_LAYOUT
+        self._values = []
+        self._relationships = None
+        self._shared = 0
+        self._dirty = 0
+        self._changes = None
         if node is not None:
             self.set_node(node)
         elif metatype is not None:
             self.set_type(metatype)
 
+    @property
+    def properties(self) -> PropertyView:
+        return PropertyView(self)
+
+    @property
+    def relationships(self) -> RelationshipView:
+        return RelationshipView(self)
+
     def wipe_id(self):
         """
         Reset the node ID.
@@ -72,13 +201,16 @@ class Node(object):
         """
         Reset all node properties.
         """
-        self.properties = dict()
+        self._values = [""] * len(self._layout.properties)
+        self._shared &= ~Node._SHARED_VALUES
+        self._dirty = (1 << len(self._values)) - 1
 
     def wipe_relationships(self):
         """
         Reset all node relationships
         """
-        self.relationships = defaultdict(list)
+        self._relationships = None
+        self._changes = None
 
     def wipe_node(self):
         """
@@ -116,8 +248,12 @@ class Node(object):
         self.otype = otype
         self.meta = otype.meta
         self.entity = otype.entity
-        self.properties = dict().fromkeys(otype.properties, "")
-        self.relationships = {rel: set() for rel in otype.relationships}
+        self._layout = otype.layout
+        self._values = [""] * len(otype.layout.properties)
+        self._relationships = None
+        self._shared = 0
+        self._dirty = 0
+        self._changes = None
 
     def set_entity(self, entity: str):
         self.entity = entity
@@ -137,35 +273,48 @@ class Node(object):
         """
         self.meta = meta
 
-    def get_properties(self, key: str=None) -> Union[Any, Dict[str, Any]]:
+    def get_properties(self, key: str=None) -> Union[Any, MutableMapping]:
         """
         Get access to the dictonary of node properties.
         :param key: Specific property name whose value should be returned.
         :return: If a key is given and it exists, the corresponding value is returned.
-         Otherwise the whole dictonary of properties is returned.
+         Otherwise a dictionary-like view of all properties is returned.
         """
-        if key and key in self.properties:
-            return self.properties[key]
-        return self.properties
+        if key:
+            index = self._layout.index.get(key)
+            if index is not None:
+                return self._values[index]
+        return PropertyView(self)
 
     def set_properties(self, values: Dict[str, Any]) -> None:
         """
         Add properties to the existing properties of a node.
         :param values: One or multiple dictonary entries to add.
         """
-        self.properties.update({key: value for key, value in values.items() if key in self.properties})
+        index = self._layout.index
+        for key, value in values.items():
+            position = index.get(key)
+            if position is not None:
+                if self._shared & Node._SHARED_VALUES:
+                    self._values = list(self._values)
+                    self._shared &= ~Node._SHARED_VALUES
+                self._values[position] = value
+                self._dirty |= 1 << position
 
-    def get_relationships(self, key: str=None) -> Union[Set[int], Dict[str, Set[int]]]:
+    def get_relationships(self, key: str=None) -> Union[Set[int], MutableMapping]:
         """
         Get access to the dictonary of node relationships.
         :param key: Specify the name of a relationship to retrieve
          the node ids for a particular relationship.
         :return: If a key is given then that specific entry is returned,
-         otherwise the whole dictionary of relationships is returned.
+         otherwise a dictionary-like view of all relationships is returned.
+         Note: A set which is returned for a key may be modified by the caller,
+         so the relationship is considered changed as a whole from then on.
         """
-        if key and key in self.relationships:
-            return self.relationships[key]
-        return self.relationships
+        if key and key in self._layout.relationships:
+            self._track_escaped(key)
+            return self._relationship(key)
+        return RelationshipView(self)
 
     def add_relationships(self, values: Dict[str, Set[int]]) -> None:
         """
@@ -175,8 +324,10 @@ class Node(object):
           for the respective relationship.
         """
         for key, val in values.items():
-            if key in self.relationships:
-                self.relationships[key] |= val if isinstance(val, set) else {val}
+            if key in self._layout.relationships:
+                ids = val if isinstance(val, (set, frozenset)) else {val}
+                self._relationship(key).update(ids)
+                self._track_added(key, ids)
 
     def set_relationships(self, values: Dict[str, Set[int]]):
         """
@@ -186,8 +337,11 @@ class Node(object):
           for the respective relationship.
         """
         for key, val in values.items():
-            if key in self.relationships:
-                self.relationships[key] = val if isinstance(val, set) else {val}
+            if key in self._layout.relationships:
+                if self._relationships is None:
+                    self._relationships = dict()
+                self._relationships[key] = val if isinstance(val, set) else {val}
+                self._track_escaped(key)
 
     def has_relationship(self, relationship: str) -> bool:
         """
@@ -195,22 +349,116 @@ class Node(object):
         :param relationship: The name of the relationship to be checked.
         :return: True if the relationship is allowed, false otherwise.
         """
-        return relationship in self.relationships and len(self.relationships[relationship]) > 0
+        return self._relationships is not None and len(self._relationships.get(relationship, ())) > 0
+
+    def _relationship(self, key: str) -> Set[int]:
+        """
+        Get the set of node IDs for an allowed relationship, allocating it if necessary.
+        """
+        if self._relationships is None:
+            self._relationships = dict()
+        relationship = self._relationships.get(key)
+        if relationship is None:
+            relationship = self._relationships[key] = set()
+        return relationship
+
+    def _track_added(self, key: str, ids: Set[int]) -> None:
+        if self._changes is None:
+            self._changes = dict()
+        if key not in self._changes:
+            self._changes[key] = set(ids)
+        elif self._changes[key] is not None:
+            self._changes[key].update(ids)
+
+    def _track_escaped(self, key: str) -> None:
+        if self._changes is None:
+            self._changes = dict()
+        self._changes[key] = None
+
+    def is_dirty(self) -> bool:
+        """
+        Check whether the node was changed since it was loaded, created or marked clean.
+        """
+        return self._dirty != 0 or len(self.get_dirty_relationships()) > 0
+
+    def get_dirty_properties(self) -> Dict[str, Any]:
+        """
+        Get all properties which were set since the node was loaded, created or marked clean.
+        :return: Dictionary from property names to their current values.
+        """
+        dirty = self._dirty
+        if dirty == 0:
+            return dict()
+        return {key: self._values[index] for index, key in enumerate(self._layout.properties) if dirty >> index & 1}
+
+    def get_dirty_relationships(self) -> Dict[str, Set[int]]:
+        """
+        Get all relationships which were added since the node was loaded, created or marked clean.
+        For relationships whose sets were handed out for modification, the whole set is returned.
+        :return: Dictionary from relationship names to the added node IDs, without empty entries.
+        """
+        if not self._changes:
+            return dict()
+        result: Dict[str, Set[int]] = dict()
+        allocated = self._relationships or dict()
+        for key, added in self._changes.items():
+            current = allocated.get(key, EMPTY_RELATIONSHIP)
+            ids = set(current) if added is None else added & current
+            if len(ids) > 0:
+                result[key] = ids
+        return result
+
+    def mark_clean(self, properties: bool = True, relationships: bool = True) -> None:
+        """
+        Forget about all changes, once the node is in sync with the graph memory.
+        :param properties: Forget about changed properties.
+        :param relationships: Forget about added relationships.
+        """
+        if properties:
+            self._dirty = 0
+        if relationships:
+            self._changes = None
+
+    def iter_relationships(self) -> Iterator[Tuple[str, Set[int]]]:
+        """
+        Iterate over all non-empty relationships of the node, without allocating
+         or copying any of them. The returned sets must not be modified.
+        """
+        if self._relationships:
+            for key, value in self._relationships.items():
+                if value:
+                    yield key, value
 
     def set_node(self, node: 'Node') -> None:
         """
         Copy all attributes of another node.
+        The property values of both nodes are shared until either node modifies them,
+         unless they are mutable. Relationships are copied.
         Hint: The other node's metatype will only be copied, if it
          is notnull. Otherwise, this node will keep it's metatype.
         :param node: The node object to copy.
         """
         self.id = node.get_id()
-        self.properties = copy.deepcopy(node.get_properties())
-        self.relationships = copy.deepcopy(node.get_relationships())
+        self._layout = node._layout
+        if any(isinstance(value, MUTABLE_VALUE_TYPES) for value in node._values):
+            # Mutable values may have been handed out for modification, so they are copied right away
+            self._values = [copy.copy(value) if isinstance(value, MUTABLE_VALUE_TYPES) else value
+                            for value in node._values]
+            self._shared = 0
+        else:
+            self._values = node._values
+            self._shared = Node._SHARED_VALUES
+            node._shared |= Node._SHARED_VALUES
+        # Relationship sets may have been handed out for modification as well, see `get_relationships()`
+        self._relationships = None if node._relationships is None else {
+            key: set(value) for key, value in node._relationships.items()}
+        self._dirty = node._dirty
+        self._changes = None if node._changes is None else {
+            key: None if added is None else set(added) for key, added in node._changes.items()}
         if node.get_type():
             self.otype = node.get_type()
-            self.meta = copy.deepcopy(node.get_meta())
-            self.entity = copy.deepcopy(node.get_entity())
+            self.meta = node.get_meta()
+            self.entity = node.get_entity()
 
     def get_name(self) -> str:
         """
@@ -270,20 +518,25 @@ class Node(object):
         """
         pass
 
-    def to_json(self) -> Optional[JsonNode]:
+    def to_json(self) -> JsonNode:
         """
-        TODO
+        Get the JSON-ready representation of the node. See `scientio.ontology.json_node`
+         for the encoding of single nodes and streams of nodes.
         """
-        return None
+        return JsonNode.from_node(self)
 
     def __eq__(self, other: 'Node'):
         """
         Check if two nodes are equal.
         """
+        if not isinstance(other, Node):
+            return NotImplemented
         equality = self.get_id() == other.get_id() \
             and self.get_meta() == other.get_meta() \
-            and self.get_properties() == other.get_properties() \
-            and self.get_relationships() == other.get_relationships()
+            and self._layout.properties == other._layout.properties \
+            and self._values == other._values \
+            and self._layout.relationships == other._layout.relationships \
+            and dict(self.iter_relationships()) == dict(other.iter_relationships())
         return equality
 
     def __hash__(self):
@@ -301,6 +554,6 @@ class Node(object):
                f'type = {self.otype}, ' \
                f'entity = {self.entity}, ' \
                f'meta = {self.meta}, ' \
-               f'properties = {self.properties}, ' \
-               f'relationships = {self.relationships})'
+               f'properties = {self.get_properties()!r}, ' \
+               f'relationships = {self.get_relationships()!r})'
 
@@ -1,10 +1,10 @@
-from typing import FrozenSet, Optional
+from typing import FrozenSet, Optional, Dict, Iterable
 
-import copy
+import os
 import yaml
-from yaml import FullLoader
 
-from scientio.ontology.otype import OType
+from scientio.ontology.ontology_cache import OntologyCache, CACHE_DIR_ENV
+from scientio.ontology.otype import OType, OntologyLoader
 
 
 class Ontology(object):
@@ -12,36 +12,93 @@ class Ontology(object):
     entities: FrozenSet[str]
     properties: FrozenSet[str]
     relationships: FrozenSet[str]
+    _types_by_entity: Dict[str, OType]
+    _types_by_labels: Dict[FrozenSet[str], Optional[OType]]
+
+    def __init__(self, *, types_set: FrozenSet[OType] = None, ontology: 'Ontology' = None, path_to_yaml: str = None,
+                 cache_dir: str = None):
+        """
+        Create an ontology from a set of types, from another ontology, or from a yaml file.
+        :param types_set: The types of the ontology.
+        :param ontology: Another ontology, whose types are shared with this one.
+        :param path_to_yaml: Path to a yaml file with one `!OType` document per type.
+        :param cache_dir: Directory for compiled ontologies, so that an unchanged yaml file
+         is not parsed again. Defaults to the `SCIENTIO_ONTOLOGY_CACHE` environment variable.
+         Files are parsed on every load if neither is set.
+        """
+        if types_set is None and ontology is not None:
+            # Types are not modified after loading, so they and the indexes
+            #  over them are shared with the other ontology instead of copied.
+            self.types = ontology.types
+            self.entities = ontology.entities
+            self.properties = ontology.properties
+            self.relationships = ontology.relationships
+            self._types_by_entity = ontology._types_by_entity
+            self._types_by_labels = ontology._types_by_labels
+            return
 
-    def __init__(self, *, types_set: FrozenSet[OType] = None, ontology: 'Ontology' = None, path_to_yaml: str = None):
         if types_set is not None:
-            self.types = frozenset(*types_set)
-        elif ontology is not None:
-            self.types = copy.deepcopy(ontology.types)
+            self.types = frozenset(types_set)
         elif path_to_yaml is not None:
-            self.types = self.from_yaml_file(path_to_yaml)
+            self.types = self.from_yaml_file(path_to_yaml, cache_dir or os.environ.get(CACHE_DIR_ENV))
+        else:
+            self.types = None
 
         if self.types is not None:
             self.entities = frozenset([x.entity for x in self.types])
             self.properties = frozenset().union(*[x.properties for x in self.types])
             self.relationships = frozenset().union(*[x.relationships for x in self.types])
+            self._types_by_entity = {x.entity: x for x in self.types}
+            self._types_by_labels = dict()
         else:
             raise Exception("Empty Ontology is invalid!")
 
-    def from_yaml_file(self, path: str) -> Optional[FrozenSet[OType]]:
+    def from_yaml_file(self, path: str, cache_dir: str = None) -> Optional[FrozenSet[OType]]:
         try:
-            with open(path, 'r') as f:
-                ontology_data = list(yaml.load_all(f, Loader=FullLoader))
-                return frozenset(ontology_data)
+            with open(path, 'rb') as f:
+                content = f.read()
+            if cache_dir:
+                cache = OntologyCache(cache_dir)
+                digest = cache.digest(content)
+                types = cache.load(digest)
+                if types is None:
+                    types = frozenset(yaml.load_all(content, Loader=OntologyLoader))
+                    cache.store(digest, types)
+                return types
+            return frozenset(yaml.load_all(content, Loader=OntologyLoader))
         except yaml.YAMLError as e:
             print("Error in ontology file: ", e)
         return None
 
     def get_type(self, entity: str) -> Optional[OType]:
-        for element in self.types:
-            if element.entity == entity:
-                return element
-        return None
+        return self._types_by_entity.get(entity)
+
+    def resolve_type(self, labels: Iterable[str]) -> Optional[OType]:
+        """
+        Determine the most specific type for a set of labels, i.e. the type among the labels
+         which is not a meta type of any other labelled type. Labels which are unknown to
+         this ontology are ignored. Results are memoized per set of labels.
+        :param labels: Labels of a node, e.g. {"Company", "Organisation"}.
+        :return: The resolved type (e.g. Company), or None if no label is a type of this ontology.
+        """
+        labels = frozenset(labels)
+        try:
+            return self._types_by_labels[labels]
+        except KeyError:
+            pass
+        otypes = sorted((self._types_by_entity[x] for x in labels if x in self._types_by_entity),
+                        key=lambda x: x.entity)
+        meta_union: FrozenSet[str] = frozenset().union(*[x.meta for x in otypes])
+        node_type: Optional[OType] = None
+        for otype in otypes:
+            if otype.entity not in meta_union:
+                node_type = otype
+                break
+        self._types_by_labels[labels] = node_type
+        return node_type
 
     def __contains__(self, item: OType):
-        return item in self.types
+        if not isinstance(item, OType):
+            return False
+        known = self._types_by_entity.get(item.entity)
+        return known is item or known == item
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pickle
+import stat as stat_module
+import tempfile
+from typing import FrozenSet, Optional
+
+from scientio.ontology.otype import OType
+
+"""
+Environment variable which names a directory for compiled ontologies, if no
+ `cache_dir` is passed to the Ontology explicitly.
+"""
+CACHE_DIR_ENV = "SCIENTIO_ONTOLOGY_CACHE"
+
+"""
+Version of the compiled file format. Bump it whenever the stored fields change,
+ so that stale files are ignored rather than misread.
+"""
+CACHE_FORMAT_VERSION = 2
+
+
+class OntologyCache(object):
+    """
+    Directory of compiled ontologies, which allows to skip YAML parsing
+     when an ontology file is loaded again. Entries are keyed by a hash of
+     the file content, so that a changed file never yields stale types.
+    Types are stored as plain field tuples rather than OType objects, so
+     that entries do not depend on the pickled layout of OType.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"ontology-{digest}.pickle")
+
+    def load(self, digest: str) -> Optional[FrozenSet[OType]]:
+        """
+        Load the types which were compiled from a file with a certain content hash.
+        Since unpickling may execute code, an entry is only read if it is owned by the
+         current user and not writable by others, as entries written by `store()` are.
+        :param digest: Content hash of the ontology file, as returned by `digest()`.
+        :return: The types, or None if there is no valid entry for the hash.
+        """
+        try:
+            with open(self.path(digest), 'rb') as f:
+                if not self._trusted(os.fstat(f.fileno())):
+                    print("Ignoring ontology cache entry which may have been written by another user: ",
+                          self.path(digest))  # Error
+                    return None
+                version, fields = pickle.load(f)
+            if version != CACHE_FORMAT_VERSION:
+                return None
+            return frozenset(
+                OType(entity=entity, properties=properties, relationships=relationships, meta=meta,
+                      indexes=indexes, unique=unique)
+                for entity, properties, relationships, meta, indexes, unique in fields)
+        except Exception:  # Any malformed entry is recompiled from the YAML file
+            return None
+
+    @staticmethod
+    def _trusted(stat: os.stat_result) -> bool:
+        if stat.st_mode & (stat_module.S_IWGRP | stat_module.S_IWOTH):
+            return False
+        return not hasattr(os, 'getuid') or stat.st_uid == os.getuid()
+
+    def store(self, digest: str, types: FrozenSet[OType]) -> None:
+        """
+        Store compiled types for a file with a certain content hash. The entry
+         is written to a temporary file first and then renamed, so that
+         concurrent readers never observe a partially written entry.
+        The directory is created for the current user only, and entries are
+         readable and writable by the current user only.
+        Failures are reported, but do not interrupt loading the ontology.
+        :param digest: Content hash of the ontology file, as returned by `digest()`.
+        :param types: The types which were parsed from the file.
+        """
+        fields = [(x.entity, tuple(sorted(x.properties)), tuple(sorted(x.relationships)), tuple(sorted(x.meta)),
+                   tuple(sorted(x.indexes)), tuple(sorted(x.unique)))
+                  for x in types]
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, 'wb') as f:
+                    pickle.dump((CACHE_FORMAT_VERSION, fields), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, self.path(digest))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print("Error writing ontology cache: ", e)  # Error
@@ -1,32 +1,53 @@
-from typing import FrozenSet, Set, List, Union
+from typing import FrozenSet, Set, List, Union, Tuple, Dict
 
 import yaml
 from yaml import FullLoader
 
 
+class OTypeLayout(object):
+    """
+    Field layout which is shared by all Nodes of an OType: Property values
+     are stored positionally in the order of `properties`.
+    """
+    __slots__ = ('properties', 'index', 'relationships')
+
+    def __init__(self, properties: FrozenSet[str] = frozenset(), relationships: FrozenSet[str] = frozenset()):
+        self.properties: Tuple[str, ...] = tuple(sorted(properties))
+        self.index: Dict[str, int] = {key: index for index, key in enumerate(self.properties)}
+        self.relationships: FrozenSet[str] = frozenset(relationships)
+
+
 class OType:
     yaml_tag = u'!OType'
 
-    def __init__(self, *, entity, properties=(), relationships=(), meta=()):
+    def __init__(self, *, entity, properties=(), relationships=(), meta=(), indexes=(), unique=()):
         self.entity: str = entity
         self.properties: FrozenSet[str] = frozenset(properties)
         self.relationships: FrozenSet[str] = frozenset(relationships)
         self.meta: FrozenSet[str] = frozenset(meta)
+        self.indexes: FrozenSet[str] = frozenset(indexes)  # Properties by which nodes are looked up
+        self.unique: FrozenSet[str] = frozenset(unique)  # Properties whose values are unique per entity
+        self.layout: OTypeLayout = OTypeLayout(self.properties, self.relationships)
         assert(self.entity not in self.meta)
+        assert(self.indexes.issubset(self.properties) and self.unique.issubset(self.properties))
 
     def __repr__(self):
         return f"{self.__class__.__name__}(" \
                f"entity={self.entity}, " \
                f"properties={list(self.properties)}, " \
                f"relationships={list(self.relationships)}, " \
-               f"meta={list(self.meta)})"
+               f"meta={list(self.meta)}, " \
+               f"indexes={list(self.indexes)}, " \
+               f"unique={list(self.unique)})"
 
     def __eq__(self, other: object):
         return isinstance(other, OType) and \
                self.entity == other.entity and \
                self.properties == other.properties and \
                self.relationships == other.relationships and \
-               self.metatypes == other.metatypes
+               self.meta == other.meta and \
+               self.indexes == other.indexes and \
+               self.unique == other.unique
 
     def __hash__(self):
         return self.entity.__hash__()
@@ -37,4 +58,12 @@ class OType:
         return OType(**fields)
 
 
+"""
+YAML loader for ontology files: The libyaml-based loader if pyyaml was built
+ with it, the pure-Python loader otherwise.
+"""
+OntologyLoader = getattr(yaml, 'CFullLoader', FullLoader)
+
 yaml.add_constructor(OType.yaml_tag, OType._yaml_ctor, Loader=FullLoader)
+if OntologyLoader is not FullLoader:
+    yaml.add_constructor(OType.yaml_tag, OType._yaml_ctor, Loader=OntologyLoader)
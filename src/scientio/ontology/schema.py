@@ -0,0 +1,68 @@
+from typing import NamedTuple, List, Set, Iterable
+
+from scientio.ontology.ontology import Ontology
+
+
+class IndexSpec(NamedTuple):
+    """
+    A single-property index on a label. Unique indexes are backed by a uniqueness constraint.
+    """
+    label: str
+    property: str
+    unique: bool = False
+
+
+class SchemaReport(object):
+    """
+    Result of comparing the indexes which are required by an ontology
+     with the indexes which exist in a graph memory.
+    """
+
+    missing: List[IndexSpec]  # Required, but not present
+    unused: List[IndexSpec]  # Present on a label of the ontology, but not required
+    created: List[IndexSpec]  # Created while synchronising
+    dropped: List[IndexSpec]  # Dropped while synchronising
+
+    def __init__(self, missing: List[IndexSpec] = None, unused: List[IndexSpec] = None):
+        self.missing = missing or []
+        self.unused = unused or []
+        self.created = []
+        self.dropped = []
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(" \
+               f"missing={self.missing}, " \
+               f"unused={self.unused}, " \
+               f"created={self.created}, " \
+               f"dropped={self.dropped})"
+
+
+def required_indexes(ontology: Ontology) -> Set[IndexSpec]:
+    """
+    Derive the indexes which are declared through the `indexes` and `unique` properties
+     of every type in an ontology. Nodes carry the labels of their meta types as well,
+     so an index on a type's own label also serves matches on its meta types' labels.
+    :param ontology: The ontology.
+    :return: One IndexSpec per label and property. Unique properties need no separate index.
+    """
+    result: Set[IndexSpec] = set()
+    for otype in ontology.types:
+        result.update(IndexSpec(otype.entity, key, True) for key in otype.unique)
+        result.update(IndexSpec(otype.entity, key, False) for key in otype.indexes - otype.unique)
+    return result
+
+
+def compare_indexes(ontology: Ontology, existing: Iterable[IndexSpec]) -> SchemaReport:
+    """
+    Compare the indexes required by an ontology with existing ones.
+    Existing indexes on labels which are not part of the ontology are not reported,
+     since they may belong to another application.
+    :param ontology: The ontology.
+    :param existing: The indexes which exist in the graph memory.
+    :return: Report of the missing and unused indexes, sorted by label and property.
+    """
+    required = required_indexes(ontology)
+    existing = set(existing)
+    return SchemaReport(
+        missing=sorted(required - existing),
+        unused=sorted(x for x in existing - required if x.label in ontology.entities))
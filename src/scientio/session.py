@@ -1,9 +1,38 @@
-from typing import Type, List
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Type, List, Optional, Iterable, Iterator, Set, Tuple
 
-from scientio.drivers.neo4j_driver import Neo4jDriver
+from scientio.drivers import drivers
 from scientio.interfaces.operations import Operations
 from scientio.ontology.node import Node
 from scientio.ontology.ontology import Ontology
+from scientio.ontology.schema import SchemaReport
+from scientio.unit_of_work import UnitOfWork
+from scientio.util.instrumentation import Metrics
+from scientio.util.node_cache import NodeCache
+from scientio.util.profiling import Profiler
+
+
+def _instrumented(operation: str):
+    """
+    Measure calls of a Session method as the given operation, if the Session has metrics,
+     and attribute their statements to it for the Session's profiler.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self: 'Session', *args, **kwargs):
+            if self._metrics is None and self._profiler is None:
+                return method(self, *args, **kwargs)
+            with self._instrument(operation):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def _no_instrumentation():
+    yield
 
 
 class Session(Operations):
@@ -17,18 +46,54 @@ class Session(Operations):
     """
     Neo4jDriver = "neo4j"
 
+    """
+    Use InMemoryDriver as a possible value for `driver_name` in the Session constructor,
+     to keep the graph in-process instead of a database.
+    """
+    InMemoryDriver = "memory"
+
     """
     The operations driver which is used by this session.
     """
     _driver: Operations
 
-    def __init__(self, *, driver_name: str=Neo4jDriver, ontology: Ontology, **kwargs):
+    """
+    The read cache of this session, or None if caching is disabled.
+    """
+    _cache: Optional[NodeCache]
+
+    """
+    The metrics of this session, or None if instrumentation is disabled.
+    """
+    _metrics: Optional[Metrics]
+
+    """
+    The profiler of this session, or None if plans are not captured.
+    """
+    _profiler: Optional[Profiler]
+
+    def __init__(self, *, driver_name: str=Neo4jDriver, ontology: Ontology,
+                 cache_size: int=0, cache_ttl: float=None, apply_schema: bool=False,
+                 metrics: Metrics=None, profiler: Profiler=None, **kwargs):
         """
         Instantiate a session with a certain ontology, a certain driver, and certain additional
          key-word arguments which may be necessary to instantiate the driver.
-        :param driver_name: Name of the driver. Currently, only the value `Session.Neo4jDriver` is allowed.
+        :param driver_name: Name of the driver. Either `Session.Neo4jDriver`, `Session.InMemoryDriver`,
+         or the name of a driver which is registered in `scientio.drivers.drivers`.
         :param ontology: The Scientio Ontology by which Nodes in this Session are allowed to be created,
          retrieved and updated.
+        :param cache_size: Maximum number of nodes which are kept in this Session's read cache.
+         Retrieved nodes are cached by ID, and served from the cache by `retrieve(node_id=...)`.
+         The cache is kept consistent with this Session's own writes. Set to 0 to disable caching.
+        :param cache_ttl: Number of seconds after which a cached node expires, or None to keep
+         cached nodes until they are evicted.
+        :param apply_schema: Create the indexes and constraints which the ontology requires
+         on startup, see `sync_schema()`.
+        :param metrics: Instrumentation which records latencies, statements and cache lookups
+         per operation, e.g. `Metrics(slow_query_threshold=0.1)`. None to disable instrumentation.
+        :param profiler: Captures the execution plans of the statements which are generated
+         by selected operations, e.g. `Profiler(Profiler.PROFILE, operations=["retrieve"])`.
+         Only supported by the Neo4jDriver. None to disable plan capture.
         :param kwargs: Driver-specific key-word arguments which are necessary to instantiate
          the selected Operations driver. The following key-word arguments are required per driver:
 
@@ -38,10 +103,50 @@ class Session(Operations):
          | Neo4jDriver      | neo4j_address:  URI for the Neo4j database.              |
          |                  | neo4j_username: Username for the Neo4j database.         |
          |                  | neo4j_password: Password for the Neo4j database.         |
+         |                  | batch_size:     (Optional) Nodes per bulk statement.     |
+         |                  | max_connection_pool_size: (Optional) Connection limit.   |
+         |                  | connection_acquisition_timeout: (Optional) Seconds to    |
+         |                  |                 wait for a pooled connection.            |
+         |                  | max_connection_lifetime: (Optional) Seconds until a      |
+         |                  |                 pooled connection is replaced.           |
+         |                  | fetch_size:     (Optional) Records per fetch (neo4j 4+). |
          +------------------+----------------------------------------------------------+
+         | InMemoryDriver   | None                                                     |
+         +------------------+----------------------------------------------------------+
+        """
+        self._metrics = metrics
+        self._profiler = profiler
+        self._driver = Session._driver_for_name(driver_name)(ontology=ontology, metrics=metrics,
+                                                             profiler=profiler, **kwargs)
+        self._local = threading.local()
+        self._cache = NodeCache(cache_size, cache_ttl) if cache_size > 0 else None
+        if apply_schema:
+            self.sync_schema()
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """
+        The metrics of this session, or None if instrumentation is disabled.
+        """
+        return self._metrics
+
+    @property
+    def profiler(self) -> Optional[Profiler]:
         """
-        self._driver = Session._driver_for_name(driver_name)(ontology=ontology, **kwargs)
+        The profiler of this session, whose `plans` hold the captured execution plans,
+         or None if plan capture is disabled.
+        """
+        return self._profiler
+
+    @property
+    def cache(self) -> Optional[NodeCache]:
+        """
+        The read cache of this session, which exposes `hits` and `misses` counters,
+         or None if caching is disabled.
+        """
+        return self._cache
 
+    @_instrumented("create")
     def create(self, request: Node) -> Node:
         """
         Create a new Node by a certain Node specification.
@@ -51,9 +156,14 @@ class Session(Operations):
          `request` Node must have a set type from this Session's ontology,
          and no ID assigned (yet).
         :return: The created Node if successful, None otherwise.
+         Within `transaction()`, the request is returned as-is, and it's ID is assigned on flush.
         """
+        if self._queue(UnitOfWork.CREATE, [request]):
+            return request
+        # Not cached, since the request may hold relationships which are not created along with it
         return self._driver.create(request)
 
+    @_instrumented("retrieve")
     def retrieve(self, request: Node = None, node_id: int = None) -> List[Node]:
         """
         Retrieve a node, by match or by id.
@@ -64,29 +174,244 @@ class Session(Operations):
          to retrieve the Node with the specified integer id.
         :return: A list of nodes which match the criteria, None if no such Node exists.
         """
-        return self._driver.retrieve(request, node_id)
+        if self._cache is not None and node_id is not None and node_id >= 0:
+            cached = self._cache.get(node_id)
+            if self._metrics is not None:
+                self._metrics.cache_lookup(cached is not None)
+            if cached is not None:
+                return [cached]
+        result = self._driver.retrieve(request, node_id)
+        self._cache_put(result)
+        return result
+
+    @_instrumented("expand")
+    def expand(self, node_id: int, depth: int = 1, relationships: List[str] = None,
+               limit: int = None) -> Optional[List[Node]]:
+        """
+        Retrieve the neighbourhood of a node: All nodes which are reachable from it
+         within a certain number of hops, in one round-trip to the database.
+        :param node_id: ID of the node to start from.
+        :param depth: Maximum number of hops from the start node.
+        :param relationships: Relationship types which may be traversed, e.g. ['FRIEND_OF', 'LIVE_IN'].
+         All relationships are traversed if None, and none if empty.
+        :param limit: Maximum number of nodes to return, or None to return all reachable nodes.
+        :return: The reachable nodes, nearest first and by ID within the same distance, starting
+         with the node itself. An empty list if the node does not exist, None if the operation failed.
+        """
+        result = self._driver.expand(node_id, depth, relationships, limit)
+        self._cache_put(result)
+        return result
+
+    def iter_retrieve(self, request: Node, page_size: int = None) -> Iterator[Node]:
+        """
+        Retrieve nodes by match, as for `retrieve(request=...)`, but one at a time.
+        Nodes are streamed from the driver page by page as the iterator is consumed,
+         so that the first node is available early and memory use does not grow with
+         the number of matches. Close the iterator (or exhaust it) to release the
+         underlying database cursor.
+        :param request: A certain Node specification, which retrieved nodes are required to match.
+        :param page_size: Number of nodes fetched per round-trip.
+         Defaults to the driver's configured batch size.
+        :return: An iterator over the matching nodes.
+        The operation is measured from the first to the last node, so it's latency
+         includes the time which the caller spends between nodes.
+        """
+        with self._instrument("iter_retrieve"):
+            for node in self._driver.iter_retrieve(request, page_size):
+                self._cache_put([node])
+                yield node
 
+    @_instrumented("update")
     def update(self, request: Node) -> Node:
         """
         Persist changes to node properties/type/relationships made on a Node
          which was previosuly obtained through `retrieve()` or `create()`.
         Note: The node will only be persisted, if it is legal wrt/ it's properties/relationships,
          given it's type from this Session's ontology.
+        Only the properties which were set and the relationships which were added since
+         the node was retrieved or created are written (see `Node.is_dirty()`).
         :param request: The node whose changed properties/type/relationships should be persisted.
-        :return: The persisted node, or None if the Operation failed.
+        :return: The request, which is marked clean once it is persisted, or None if the Operation failed.
+         Within `transaction()`, the request is returned as-is.
         """
+        if self._queue(UnitOfWork.UPDATE, [request]):
+            return request
+        # The request may lack properties and relationships which it never loaded, so it is not cached
+        self._cache_invalidate([request])
         return self._driver.update(request)
 
+    @_instrumented("delete")
     def delete(self, request: Node) -> bool:
         """
         Delete a node which was previously obtained through `retrieve()` or `create()`.
         :param request: The node to delete.
         :return: True if the node was deleted successfully, False otherwise.
+         Within `transaction()`, True is returned once the deletion is queued.
         """
+        if self._queue(UnitOfWork.DELETE, [request]):
+            return True
+        self._cache_invalidate([request])
         return self._driver.delete(request)
 
+    @_instrumented("create_many")
+    def create_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        """
+        Create several new Nodes with as few statements as the driver allows.
+        :param requests: The nodes to persist, as for `create()`.
+        :param batch_size: Maximum number of nodes written per statement.
+         Defaults to the driver's configured batch size.
+        :return: The created Nodes with their IDs assigned, in the order of `requests`.
+         None is returned in place of every node which could not be created.
+        """
+        if self._queue(UnitOfWork.CREATE, requests):
+            return list(requests)
+        # Not cached, as for `create()`
+        return self._driver.create_many(requests, batch_size)
+
+    @_instrumented("update_many")
+    def update_many(self, requests: List[Node], batch_size: int = None) -> List[Optional[Node]]:
+        """
+        Persist changes to several Nodes with as few statements as the driver allows.
+        :param requests: The nodes whose changes should be persisted, as for `update()`.
+        :param batch_size: Maximum number of nodes written per statement.
+        :return: The persisted Nodes in the order of `requests`, None for every failed update.
+        """
+        if self._queue(UnitOfWork.UPDATE, requests):
+            return list(requests)
+        self._cache_invalidate(requests)
+        return self._driver.update_many(requests, batch_size)
+
+    @_instrumented("delete_many")
+    def delete_many(self, requests: List[Node], batch_size: int = None) -> List[bool]:
+        """
+        Delete several Nodes with as few statements as the driver allows.
+        :param requests: The nodes to delete, as for `delete()`.
+        :param batch_size: Maximum number of nodes written per statement.
+        :return: For every node in `requests`, True if it was deleted successfully.
+        """
+        if self._queue(UnitOfWork.DELETE, requests):
+            return [True] * len(requests)
+        self._cache_invalidate(requests)
+        return self._driver.delete_many(requests, batch_size)
+
+    @_instrumented("delete_nodes")
+    def delete_nodes(self, node_ids: List[int], batch_size: int = None) -> List[bool]:
+        """
+        Delete whole nodes together with all of their relationships.
+        Note: Unlike `delete()`, this is executed right away, even within `transaction()`.
+        :param node_ids: IDs of the nodes to delete.
+        :param batch_size: Maximum number of nodes deleted per statement.
+        :return: For every ID in `node_ids`, True if the node existed and was deleted.
+        """
+        result = self._driver.delete_nodes(node_ids, batch_size)
+        if self._cache is not None:
+            self._cache.purge(node_ids)
+        return result
+
+    @_instrumented("create_edges")
+    def create_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        """
+        Create single relationships between existing nodes, e.g. `[(kirk_id, "captain_of", spock_id)]`,
+         with as few statements as the driver allows. Relationships which exist already are kept.
+        Note: Unlike `update()`, this is executed right away, even within `transaction()`.
+        :param edges: Triples of source node ID, relationship name and target node ID.
+        :param batch_size: Maximum number of edges created per statement.
+        :return: For every triple in `edges`, True if both nodes exist and are now related.
+        """
+        result = self._driver.create_edges(edges, batch_size)
+        if self._cache is not None:
+            self._cache.invalidate([node_id for source, _, target in edges for node_id in (source, target)])
+        return result
+
+    @_instrumented("delete_edges")
+    def delete_edges(self, edges: List[Tuple[int, str, int]], batch_size: int = None) -> List[bool]:
+        """
+        Delete single relationships between nodes, e.g. `[(kirk_id, "captain_of", spock_id)]`.
+        Note: Unlike `delete()`, this is executed right away, even within `transaction()`.
+        :param edges: Triples of source node ID, relationship name and target node ID.
+         Relationships are undirected, so source and target may be swapped.
+        :param batch_size: Maximum number of edges deleted per statement.
+        :return: For every triple in `edges`, True if the relationship existed and was deleted.
+        """
+        result = self._driver.delete_edges(edges, batch_size)
+        if self._cache is not None:
+            self._cache.invalidate([node_id for source, _, target in edges for node_id in (source, target)])
+        return result
+
+    @_instrumented("sync_schema")
+    def sync_schema(self, apply: bool = True, drop_unused: bool = False) -> SchemaReport:
+        """
+        Synchronise the indexes and uniqueness constraints of the graph memory with the ontology:
+         Every type requires an index for each of it's `indexes` properties, and a uniqueness
+         constraint for each of it's `unique` properties, so that matches by these properties
+         are index seeks rather than label scans.
+        :param apply: Create the missing indexes and constraints.
+        :param drop_unused: Drop indexes and constraints on the ontology's labels which
+         the ontology does not require. Indexes on other labels are never touched.
+        :return: A report of the missing and unused indexes, and of those created or dropped.
+        """
+        return self._driver.sync_schema(apply, drop_unused)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Open a unit of work: Within the context, `create()`, `update()` and `delete()`
+         requests of this thread are queued instead of executed. On exit, consecutive
+         writes to the same node are merged, and all requests are flushed in one
+         explicit transaction of the driver. If an exception is raised within the
+         context, the queued requests are discarded.
+        Note: Retrievals within the context are not affected by the queued writes.
+         `delete_nodes()`, `create_edges()` and `delete_edges()` are not queued either,
+         but executed right away, outside of the unit of work.
+        Nested calls join the enclosing unit of work.
+        """
+        if getattr(self._local, 'unit_of_work', None) is not None:
+            yield
+            return
+        unit_of_work = UnitOfWork()
+        self._local.unit_of_work = unit_of_work
+        try:
+            yield
+        finally:
+            self._local.unit_of_work = None
+        try:
+            with self._driver.transaction(), self._instrument("transaction"):
+                unit_of_work.flush(self._driver)
+        finally:
+            self._cache_invalidate(unit_of_work.nodes())
+
+    @contextmanager
+    def _instrument(self, operation: str):
+        with self._metrics.operation(operation) if self._metrics is not None else _no_instrumentation():
+            with self._profiler.operation(operation) if self._profiler is not None else _no_instrumentation():
+                yield
+
+    def _queue(self, kind: str, requests: List[Node]) -> bool:
+        unit_of_work: UnitOfWork = getattr(self._local, 'unit_of_work', None)
+        if unit_of_work is None:
+            return False
+        for request in requests:
+            unit_of_work.add(kind, request)
+        return True
+
+    def _cache_put(self, nodes: Optional[List[Optional[Node]]]):
+        if self._cache is not None and nodes is not None:
+            for node in nodes:
+                self._cache.put(node)
+
+    def _cache_invalidate(self, requests: Iterable[Node]):
+        """
+        Remove the requested nodes from the cache, as well as their
+         neighbours, whose relationships may change along with them.
+        """
+        if self._cache is None:
+            return
+        node_ids: Set[int] = set()
+        for request in requests:
+            node_ids.add(request.get_id())
+            node_ids.update(*(value for _, value in request.iter_relationships()))
+        self._cache.invalidate(node_ids)
+
     @staticmethod
     def _driver_for_name(driver_name: str) -> Type:
-        return {
-            Session.Neo4jDriver: Neo4jDriver
-        }[driver_name]
+        return drivers.get(driver_name)
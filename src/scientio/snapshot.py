@@ -0,0 +1,261 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Optional, Dict, List, Tuple, Iterable, Set, TextIO
+
+from scientio.interfaces.operations import Operations
+from scientio.ontology.json_node import NodeEncoder, NodeDecoder, COMPACT_SEPARATORS
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.ontology.otype import OType
+
+"""
+Version of the snapshot file format, which is written to the header line.
+"""
+SNAPSHOT_FORMAT_VERSION = 1
+
+"""
+Line which separates the nodes of a snapshot from it's edges.
+"""
+EDGES_SECTION = json.dumps({"section": "edges"}, separators=COMPACT_SEPARATORS)
+
+
+class SnapshotReport(object):
+    """
+    Result of exporting or importing a snapshot.
+    """
+
+    nodes: int  # Nodes written
+    edges: int  # Edges written
+    skipped_nodes: int  # Nodes which could not be imported
+    skipped_edges: int  # Edges which could not be imported, e.g. since a node was not part of the snapshot
+
+    def __init__(self):
+        self.nodes = 0
+        self.edges = 0
+        self.skipped_nodes = 0
+        self.skipped_edges = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(" \
+               f"nodes={self.nodes}, " \
+               f"edges={self.edges}, " \
+               f"skipped_nodes={self.skipped_nodes}, " \
+               f"skipped_edges={self.skipped_edges})"
+
+
+def export_snapshot(session: Operations, ontology: Ontology, path: str, entities: Iterable[str] = None,
+                    page_size: int = None) -> Optional[SnapshotReport]:
+    """
+    Export nodes and the edges between them to a snapshot file. The file holds a header line,
+     the nodes as written by a NodeEncoder, and then one `[source ID, relationship, target ID]`
+     line per edge. It is gzip-compressed if `path` ends with ".gz".
+    Nodes are streamed per type, and edges are spooled to a temporary file until all nodes
+     are written, so that memory use does not grow with the size of the graph. Every edge is
+     listed by both of it's nodes, and it is written once: From the node with the lower ID if
+     both nodes are exported, from the exported node otherwise. The exported IDs are kept in
+     a temporary SQLite database to decide this. Nodes are read outside of a transaction, so
+     concurrent writes may or may not be part of the snapshot.
+    :param session: The Session (or driver) to export from.
+    :param ontology: The ontology of the session.
+    :param path: The snapshot file, which is overwritten.
+    :param entities: The entities of the types whose nodes are exported, or None for all types.
+     Edges to nodes which are not exported are exported as well, but skipped on import.
+    :param page_size: Number of nodes fetched per round-trip.
+    :return: The numbers of exported nodes and edges, or None if an entity is not part of the ontology.
+    """
+    if entities is None:
+        types: List[OType] = sorted(ontology.types, key=lambda x: x.entity)
+    else:
+        types = [ontology.get_type(entity) for entity in entities]
+        if None in types:
+            print(f"No such types in ontology: {set(entities) - ontology.entities}")  # Error
+            return None
+
+    report = SnapshotReport()
+    encoder = NodeEncoder()
+    with _open(path, 'w') as snapshot, tempfile.TemporaryFile('w+', encoding='utf-8') as spool, \
+            _IdSet() as exported:
+        snapshot.write(json.dumps({"snapshot": SNAPSHOT_FORMAT_VERSION, "entities": [x.entity for x in types]},
+                                  separators=COMPACT_SEPARATORS) + "\n")
+        for otype in types:
+            for node in session.iter_retrieve(Node(metatype=otype), page_size):
+                if node.get_entity() != otype.entity:
+                    continue  # Carries the label of this type as meta, and is exported with it's own type
+                node_id = node.get_id()
+                for key, value in node.iter_relationships():
+                    for other in value:
+                        spool.write(json.dumps([node_id, key, other], separators=COMPACT_SEPARATORS) + "\n")
+                exported.add(node_id)
+                node = Node(node=node)
+                node.wipe_relationships()
+                for line in encoder.encode(node):
+                    snapshot.write(line + "\n")
+                report.nodes += 1
+
+        snapshot.write(EDGES_SECTION + "\n")
+        spool.seek(0)
+        edges: List[Tuple[int, str, int]] = []
+        for line in spool:
+            edges.append(tuple(json.loads(line)))
+            if len(edges) >= _IdSet.LOOKUP_BATCH:
+                _export_edges(snapshot, edges, exported, report)
+        _export_edges(snapshot, edges, exported, report)
+    return report
+
+
+def _export_edges(snapshot: TextIO, edges: List[Tuple[int, str, int]], exported: '_IdSet',
+                  report: SnapshotReport):
+    contained = exported.contains({target for _, _, target in edges})
+    for source, key, target in edges:
+        # An edge between two exported nodes is spooled by both of them, but written only once
+        if target not in contained or source <= target:
+            snapshot.write(json.dumps([source, key, target], separators=COMPACT_SEPARATORS) + "\n")
+            report.edges += 1
+    edges.clear()
+
+
+def import_snapshot(session: Operations, ontology: Ontology, path: str,
+                    batch_size: int = 1000) -> Optional[SnapshotReport]:
+    """
+    Import a snapshot file, as written by `export_snapshot()`. All nodes are created first,
+     in batches, and then all edges, in batches as well. The nodes receive new IDs: The
+     mapping from the IDs in the snapshot to the new ones is kept in a temporary SQLite
+     database, so that memory use does not grow with the size of the snapshot.
+    The import is not atomic. If it fails, the nodes and edges created so far are kept.
+    :param session: The Session (or driver) to import into.
+    :param ontology: The ontology of the session, by which the nodes' types are resolved.
+    :param path: The snapshot file, which is gzip-compressed if it ends with ".gz".
+    :param batch_size: Maximum number of nodes or edges written per statement.
+    :return: The numbers of imported and skipped nodes and edges, or None if the file is not a snapshot.
+    """
+    report = SnapshotReport()
+    decoder = NodeDecoder(ontology)
+    with _open(path, 'r') as snapshot, _IdMap() as ids:
+        header = json.loads(snapshot.readline() or "null")
+        if not isinstance(header, dict) or header.get("snapshot") != SNAPSHOT_FORMAT_VERSION:
+            print(f"Not a snapshot of version {SNAPSHOT_FORMAT_VERSION}: {path}")  # Error
+            return None
+
+        nodes: List[Tuple[int, Node]] = []
+        for line in snapshot:
+            if line.rstrip("\n") == EDGES_SECTION:
+                break
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            node = decoder.decode_value(value)
+            if node is not None:
+                nodes.append((node.get_id(), node))
+            elif isinstance(value, list):
+                report.skipped_nodes += 1
+            if len(nodes) >= batch_size:
+                _import_nodes(session, nodes, ids, report)
+        _import_nodes(session, nodes, ids, report)
+
+        edges: List[Tuple[int, str, int]] = []
+        for line in snapshot:
+            if not line.strip():
+                continue
+            source, key, target = json.loads(line)
+            edges.append((source, key, target))
+            if len(edges) >= batch_size:
+                _import_edges(session, edges, ids, batch_size, report)
+        _import_edges(session, edges, ids, batch_size, report)
+    return report
+
+
+def _import_nodes(session: Operations, nodes: List[Tuple[int, Node]], ids: '_IdMap', report: SnapshotReport):
+    if len(nodes) == 0:
+        return
+    created = session.create_many([node for _, node in nodes], len(nodes))
+    mapping = [(old_id, node.get_id()) for (old_id, _), node in zip(nodes, created) if node is not None]
+    ids.put(mapping)
+    report.nodes += len(mapping)
+    report.skipped_nodes += len(nodes) - len(mapping)
+    nodes.clear()
+
+
+def _import_edges(session: Operations, edges: List[Tuple[int, str, int]], ids: '_IdMap', batch_size: int,
+                  report: SnapshotReport):
+    if len(edges) == 0:
+        return
+    mapping = ids.get({node_id for source, _, target in edges for node_id in (source, target)})
+    mapped = [(mapping[source], key, mapping[target]) for source, key, target in edges
+              if source in mapping and target in mapping]
+    created = sum(1 for x in session.create_edges(mapped, batch_size) if x) if len(mapped) > 0 else 0
+    report.edges += created
+    report.skipped_edges += len(edges) - created
+    edges.clear()
+
+
+class _IdDatabase(object):
+    """
+    Table of node IDs in a temporary SQLite database.
+    """
+
+    # Maximum number of parameters per SQLite statement, which is 999 for older versions
+    LOOKUP_BATCH = 900
+
+    # Definition of the `ids` table
+    TABLE = "old INTEGER PRIMARY KEY"
+
+    def __enter__(self):
+        self._directory = tempfile.mkdtemp()
+        self._connection = sqlite3.connect(os.path.join(self._directory, "ids.sqlite"))
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(f"CREATE TABLE ids ({self.TABLE})")
+        return self
+
+    def __exit__(self, *args):
+        self._connection.close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def _select(self, columns: str, old_ids: Iterable[int]) -> List[tuple]:
+        old_ids = list(old_ids)
+        result: List[tuple] = []
+        for start in range(0, len(old_ids), self.LOOKUP_BATCH):
+            batch = old_ids[start:start + self.LOOKUP_BATCH]
+            cursor = self._connection.execute(
+                f"SELECT {columns} FROM ids WHERE old IN ({', '.join('?' * len(batch))})", batch)
+            result.extend(cursor.fetchall())
+        return result
+
+
+class _IdSet(_IdDatabase):
+    """
+    Set of node IDs in a temporary SQLite database.
+    """
+
+    def add(self, node_id: int):
+        self._connection.execute("INSERT OR IGNORE INTO ids VALUES (?)", (node_id,))
+
+    def contains(self, node_ids: Iterable[int]) -> Set[int]:
+        """
+        :return: The given IDs which are part of the set.
+        """
+        return {row[0] for row in self._select("old", node_ids)}
+
+
+class _IdMap(_IdDatabase):
+    """
+    Mapping from old to new node IDs in a temporary SQLite database.
+    """
+
+    TABLE = "old INTEGER PRIMARY KEY, new INTEGER NOT NULL"
+
+    def put(self, mapping: List[Tuple[int, int]]):
+        self._connection.executemany("INSERT OR REPLACE INTO ids VALUES (?, ?)", mapping)
+
+    def get(self, old_ids: Iterable[int]) -> Dict[int, int]:
+        return dict(self._select("old, new", old_ids))
+
+
+def _open(path: str, mode: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
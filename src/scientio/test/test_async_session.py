@@ -0,0 +1,136 @@
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from unittest import mock
+from scientio.async_session import AsyncSession
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+
+
+class Test(unittest.TestCase):
+    def test_in_memory_crud(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+
+        async def crud():
+            async with AsyncSession(driver_name=AsyncSession.InMemoryDriver, ontology=o) as s:
+                people = [Node(metatype=o.get_type('Person')) for _ in range(100)]
+                for i, person in enumerate(people):
+                    person.set_name(f'Person {i}')
+                created = await asyncio.gather(*[s.create(person) for person in people])
+                assert len({person.get_id() for person in created}) == 100
+
+                found = await asyncio.gather(*[s.retrieve(node_id=person.get_id()) for person in created])
+                assert [result[0].get_name() for result in found] == [person.get_name() for person in people]
+
+                created[0].add_relationships({'FRIEND_OF': {created[1].get_id()}})
+                updated = await s.update(created[0])
+                assert updated.get_relationships('FRIEND_OF') == {created[1].get_id()}
+                assert await s.delete(updated)
+
+        asyncio.run(crud())
+
+    def test_neo4j_driver(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        database = FakeAsyncDatabase()
+        client = types.ModuleType("neo4j")
+        client.__version__ = "5.14.0"
+        client.AsyncGraphDatabase = database
+        with mock.patch.dict(sys.modules, {"neo4j": client}):
+            sys.modules.pop("scientio.drivers.async_neo4j_driver", None)
+            module = importlib.import_module("scientio.drivers.async_neo4j_driver")
+            client.__version__ = "4.4.0"
+            sys.modules.pop("scientio.drivers.async_neo4j_driver")
+            with self.assertRaises(ImportError):
+                importlib.import_module("scientio.drivers.async_neo4j_driver")
+        driver = module.AsyncNeo4jDriver(o, neo4j_address="bolt://localhost:7687",
+                                         neo4j_username="neo4j", neo4j_password="neo4j")
+
+        async def operations():
+            roboy = Node(metatype=o.get_type('Person'))
+            roboy.set_properties({'name': 'Roboy', 'sex': 'male'})
+            roboy.add_relationships({'FRIEND_OF': {2}})
+            database.records = [[FakeNode(1, ['Person'], {})]]
+            assert (await driver.create(roboy)).get_id() == 1
+
+            database.records = [{'n': FakeNode(1, ['Person'], {'name': 'Roboy'}), 'edges': [['FRIEND_OF', 2]]}]
+            found = await driver.retrieve(node_id=1)
+            assert found[0].get_name() == 'Roboy' and found[0].get_relationships('FRIEND_OF') == {2}
+
+            database.records = [[1]]
+            assert await driver.delete(roboy)
+
+        asyncio.run(operations())
+        # The statements of an operation share one transaction, and retrievals are reads
+        assert [(read, len(statements)) for read, statements in database.transactions] == \
+            [(False, 1), (True, 1), (False, 2)]
+        assert "$n_id" in database.transactions[1][1][0][0]
+
+
+class FakeNode(dict):
+    def __init__(self, node_id, labels, properties):
+        super().__init__(properties)
+        self.id = node_id
+        self.labels = frozenset(labels)
+
+
+class FakeAsyncResult(object):
+    def __init__(self, records):
+        self._records = records
+
+    async def __aiter__(self):
+        for record in self._records:
+            yield record
+
+
+class FakeAsyncTransaction(object):
+    def __init__(self, database: 'FakeAsyncDatabase', statements: list):
+        self._database = database
+        self._statements = statements
+
+    async def run(self, query, parameters=None):
+        self._statements.append((query, parameters))
+        return FakeAsyncResult(self._database.records)
+
+
+class FakeAsyncSession(object):
+    def __init__(self, database: 'FakeAsyncDatabase'):
+        self._database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def execute_read(self, work, *args):
+        return await self._execute(True, work, *args)
+
+    async def execute_write(self, work, *args):
+        return await self._execute(False, work, *args)
+
+    async def _execute(self, read, work, *args):
+        statements = []
+        self._database.transactions.append((read, statements))
+        return await work(FakeAsyncTransaction(self._database, statements), *args)
+
+
+class FakeAsyncDatabase(object):
+    """
+    Stands in for the AsyncGraphDatabase and the driver of the neo4j client,
+     recording the statements of every transaction.
+    """
+
+    def __init__(self):
+        self.records = []  # Returned by every statement
+        self.transactions = []  # Pairs of whether the transaction reads, and it's statements
+
+    def driver(self, uri, **config):
+        return self
+
+    def session(self, **config):
+        return FakeAsyncSession(self)
+
+    async def close(self):
+        pass
@@ -0,0 +1,132 @@
+import functools
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from scientio.bulk_loader import bulk_load
+from scientio.drivers import drivers
+from scientio.interfaces.operations import Operations
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+
+
+class Test(unittest.TestCase):
+    def test_inline(self):
+        path = "scientio/examples/example_ontology.yaml"
+        o = Ontology(path_to_yaml=path)
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+        records = [{"key": f"user:{i}", "entity": "TelegramPerson", "properties": {"name": f"User {i}"},
+                    "relationships": {"FRIEND_OF": [f"user:{(i + 1) % 10}"]}} for i in range(10)]
+        records[1]["relationships"]["FRIEND_OF"].append("user:0")  # Listed by both nodes
+        records.append({"key": "robot", "entity": "Robot", "properties": {"unknown": 1}})
+        records.append({"key": "city", "entity": "City", "relationships": {"LIVE_IN": ["user:0", "nobody"]}})
+        records.append({"key": "town", "entity": "City", "relationships": {"LIVE_IN": "user:0"}})
+
+        report = bulk_load(records, path_to_yaml=path, workers=1, chunk_size=4, batch_size=3, session=s)
+        assert (report.nodes, report.edges, report.unresolved, report.errors) == (11, 11, 1, 3)
+        worker = next(iter(report.workers.values()))
+        assert worker.records == 13 and worker.failures == [
+            "Record 'robot': Not allowed for Robot: ['unknown']",
+            "Record 'town': Relationship LIVE_IN is not a list of keys: 'user:0'"]
+
+        people = s.retrieve(Node(metatype=o.get_type('TelegramPerson')))
+        first = [x for x in people if x.get_name() == 'User 0'][0]
+        assert len(first.get_relationships('FRIEND_OF')) == 2 and len(first.get_relationships('LIVE_IN')) == 1
+
+        records = [{"key": "city", "entity": "City", "properties": {"name": "Munich"}},
+                   {"key": "city", "entity": "City", "properties": {"name": "Garching"}},
+                   {"key": "roboy", "entity": "Robot", "relationships": {"LIVE_IN": ["city"]}}]
+        report = bulk_load(records, path_to_yaml=path, workers=1, chunk_size=1, session=s)
+        assert (report.nodes, report.edges, report.duplicates, report.errors) == (3, 1, 1, 1)
+        assert report.duplicate_keys == ["city"]
+        cities = {x.get_name(): x for x in s.retrieve(Node(metatype=o.get_type('City')))}
+        assert len(cities['Munich'].get_relationships('LIVE_IN')) == 1
+        assert len(cities['Garching'].get_relationships('LIVE_IN')) == 0
+        with self.assertRaises(ValueError):
+            bulk_load([], path_to_yaml=path, workers=2, session=s)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Workers inherit the test driver")
+    def test_workers(self):
+        path = "scientio/examples/example_ontology.yaml"
+        o = Ontology(path_to_yaml=path)
+        drivers.register("sqlite", _SqliteDriver)
+        self.addCleanup(drivers._targets.pop, "sqlite", None)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        database = os.path.join(directory.name, "graph.db")
+        records = [{"key": f"user:{i}", "entity": "TelegramPerson", "properties": {"name": f"User {i}"},
+                    "relationships": {"FRIEND_OF": [f"user:{(i + 1) % 20}"]}} for i in range(20)]
+        records.append({"key": "robot", "entity": "Robot", "properties": {"unknown": 1}})
+
+        executor = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("fork"))
+        with mock.patch("scientio.bulk_loader.ProcessPoolExecutor", executor):
+            report = bulk_load(records, path_to_yaml=path, workers=2, chunk_size=3, batch_size=2,
+                               driver_name="sqlite", database=database)
+        assert (report.nodes, report.edges, report.unresolved, report.errors) == (20, 20, 0, 1)
+        assert os.getpid() not in report.workers
+        assert sum(x.records for x in report.workers.values()) == 21
+        assert [x for worker in report.workers.values() for x in worker.failures] == [
+            "Record 'robot': Not allowed for Robot: ['unknown']"]
+
+        s = Session(driver_name="sqlite", ontology=o, database=database)
+        people = s.retrieve(Node(metatype=o.get_type('TelegramPerson')))
+        assert len(people) == 20 and all(len(x.get_relationships('FRIEND_OF')) == 2 for x in people)
+
+
+class _SqliteDriver(Operations):
+    """
+    Driver which keeps nodes and edges in a SQLite file, so that they are shared between processes.
+    """
+
+    def __init__(self, ontology, database, **kwargs):
+        self._ontology = ontology
+        self._connection = sqlite3.connect(database, timeout=60, isolation_level=None)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY, entity, properties)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS edges (source, key, target)")
+
+    def create(self, request):
+        cursor = self._connection.execute("INSERT INTO nodes (entity, properties) VALUES (?, ?)",
+                                          (request.get_type().entity, self._properties(request)))
+        request.set_id(cursor.lastrowid)
+        request.mark_clean()
+        return request
+
+    def retrieve(self, request=None, node_id=None):
+        if node_id is not None:
+            rows = self._connection.execute("SELECT * FROM nodes WHERE id = ?", (node_id,)).fetchall()
+        else:
+            rows = self._connection.execute("SELECT * FROM nodes WHERE entity = ?",
+                                            (request.get_type().entity,)).fetchall()
+        return [self._node(*row) for row in rows]
+
+    def update(self, request):
+        self._connection.execute("UPDATE nodes SET properties = ? WHERE id = ?",
+                                 (self._properties(request), request.get_id()))
+        self._connection.executemany("INSERT INTO edges VALUES (?, ?, ?)", [
+            (request.get_id(), key, other) for key, others in request.get_dirty_relationships().items()
+            for other in others])
+        request.mark_clean()
+        return request
+
+    def delete(self, request):
+        return False
+
+    @staticmethod
+    def _properties(node):
+        return json.dumps({key: value for key, value in node.get_properties().items() if value != ""})
+
+    def _node(self, node_id, entity, properties):
+        node = Node(metatype=self._ontology.get_type(entity))
+        node.set_id(node_id)
+        node.set_properties(json.loads(properties))
+        for key, other in self._connection.execute(
+                "SELECT key, target FROM edges WHERE source = ? UNION ALL SELECT key, source FROM edges WHERE target = ?",
+                (node_id, node_id)):
+            node.add_relationships({key: {other}})
+        node.mark_clean()
+        return node
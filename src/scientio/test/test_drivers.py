@@ -0,0 +1,97 @@
+import subprocess
+import sys
+import unittest
+from scientio.drivers import DriverRegistry, drivers
+from scientio.drivers.cypher_driver import CypherDriver
+from scientio.drivers.in_memory_driver import InMemoryDriver
+from scientio.interfaces.operations import Operations
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+
+
+class Test(unittest.TestCase):
+    def test_lazy_import(self):
+        code = "import sys, scientio.ontology.ontology, scientio.ontology.node, scientio.session; " \
+               "assert 'neo4j' not in sys.modules and 'scientio.drivers.neo4j_driver' not in sys.modules"
+        subprocess.check_call([sys.executable, "-c", code])
+
+    def test_registry(self):
+        registry = DriverRegistry("scientio.test_drivers", {"memory": "scientio.drivers.in_memory_driver:InMemoryDriver"})
+        assert registry.get("memory") is InMemoryDriver
+
+        registry.register("other", InMemoryDriver)
+        assert "other" in registry
+        assert registry.get("other") is InMemoryDriver
+        with self.assertRaises(KeyError):
+            registry.get("unknown")
+
+    def test_match_statement(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        driver = CypherDriver(o)
+
+        person = Node(metatype=o.get_type('Person'))
+        person.set_properties({'name': 'Roboy', 'sex': 'male'})
+        assert driver._match_node(person).get() == "MATCH (n:Person {name: $p0}) WHERE n.sex = $p1"
+
+        person.set_relationships({'FRIEND_OF': {1, 2}, 'LIVE_IN': {3}})
+        builder = driver._match_node(person)
+        assert builder.get() == "MATCH (a)-[:LIVE_IN]-(n:Person) WHERE ID(a) IN $p0 AND n.name = $p1 " \
+                                "AND n.sex = $p2 AND size([(n)-[:FRIEND_OF]-(x) WHERE ID(x) IN $p3 | 1]) > 0 " \
+                                "AND NONE(b IN [(n)-[:LIVE_IN]-(x) WHERE ID(x) IN $p0 | ID(x)] WHERE b < ID(a))"
+        assert builder.get_parameters()['p0'] == [3]
+        assert "DISTINCT" not in driver._retrieve_statement(person).get()
+
+        telegram = Node(metatype=o.get_type('TelegramPerson'))
+        telegram.set_properties({'name': 'Roboy', 'telegram_id': 42})
+        telegram.set_relationships({'FRIEND_OF': {1}})
+        assert driver._match_node(telegram).get().startswith("MATCH (n:TelegramPerson {telegram_id: $p0})")
+
+    def test_expand_statement(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        driver = CypherDriver(o)
+
+        builder = driver._expand_statement(5, 3, ['FRIEND_OF'], 10)
+        assert "*" not in builder.get()
+        assert builder.get().count("OPTIONAL MATCH (l)-[:FRIEND_OF]-(m) WHERE NOT m IN reached") == 3
+        assert builder.get_parameters() == {'s_id': 5, 'limit': 10}
+        assert "OPTIONAL MATCH" not in driver._expand_statement(5, 3, []).get()
+        assert "OPTIONAL MATCH (l)-[]-(m)" in driver._expand_statement(5, 1).get()
+
+    def test_operations_defaults(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        drivers.register("minimal", _MinimalDriver)
+        self.addCleanup(drivers._targets.pop, "minimal", None)
+        session = Session(driver_name="minimal", ontology=o, apply_schema=True)
+        report = session.sync_schema()
+        assert report.missing == [] and report.created == []
+
+        kirk = Node(metatype=o.get_type('Person'))
+        kirk.set_properties({'name': 'Kirk', 'sex': 'male'})
+        kirk = session.create(kirk)
+        spock = session.create(Node(metatype=o.get_type('Person')))
+        assert session.create_edges([(kirk.get_id(), 'FRIEND_OF', spock.get_id())]) == [True]
+        assert session.delete_nodes([kirk.get_id(), 10000]) == [False, False]
+        kirk = session.retrieve(node_id=kirk.get_id())[0]
+        assert kirk.get_properties('sex') == "male" and kirk.get_relationships('FRIEND_OF') == {spock.get_id()}
+
+
+class _MinimalDriver(Operations):
+    """
+    Driver which implements the abstract operations only, by delegating to an InMemoryDriver.
+    """
+
+    def __init__(self, ontology, **kwargs):
+        self._memory = InMemoryDriver(ontology)
+
+    def create(self, request):
+        return self._memory.create(request)
+
+    def retrieve(self, request=None, node_id=None):
+        return self._memory.retrieve(request, node_id)
+
+    def update(self, request):
+        return self._memory.update(request)
+
+    def delete(self, request):
+        return self._memory.delete(request)
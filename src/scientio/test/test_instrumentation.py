@@ -0,0 +1,53 @@
+import unittest
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+from scientio.util.instrumentation import Metrics, Hook
+
+
+class Test(unittest.TestCase):
+    def test_session_metrics(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        metrics = Metrics()
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o, cache_size=10, metrics=metrics)
+
+        roboy = Node(metatype=o.get_type('Roboy'))
+        roboy.set_name('Roboy')
+        s.create(roboy)
+        s.retrieve(node_id=roboy.get_id())
+        s.retrieve(node_id=roboy.get_id())
+
+        assert metrics.counters('create').latency.count == 1
+        assert metrics.counters('retrieve').latency.count == 2
+        assert (metrics.counters('retrieve').cache_hits, metrics.counters('retrieve').cache_misses) == (1, 1)
+        exposition = metrics.to_prometheus()
+        assert 'scientio_operation_seconds_count{operation="retrieve"} 2' in exposition
+        assert 'scientio_cache_hits_total{operation="retrieve"} 1' in exposition
+
+        nodes = s.iter_retrieve(Node(metatype=o.get_type('Roboy')))
+        assert next(nodes).get_id() == roboy.get_id()
+        assert metrics.counters('iter_retrieve').latency.count == 0  # Active while iterating
+        s.retrieve(node_id=roboy.get_id())
+        assert list(nodes) == []
+        assert metrics.counters('iter_retrieve').latency.count == 1
+        assert metrics.counters('retrieve').latency.count == 3
+
+    def test_statements(self):
+        operations = []
+
+        class Recorder(Hook):
+            def on_operation(self, operation, seconds, statements, rows, error):
+                operations.append((operation, statements, rows))
+
+        metrics = Metrics(slow_query_threshold=0.5)
+        metrics.add_hook(Recorder())
+        with metrics.operation('retrieve'):
+            metrics.statement("MATCH (n) RETURN n", None, 0.01, 3)
+            with self.assertLogs('scientio.slow_query'):
+                metrics.statement("MATCH (n)-[*]-(m) RETURN m", None, 0.75, 100)
+        metrics.statement("RETURN 1", None, 0.01, 1)
+
+        assert operations == [('retrieve', 2, 103)]
+        assert metrics.counters('retrieve').rows == 103
+        assert metrics.counters('none').statements == 1
+        assert [query.query for query in metrics.slow_queries] == ["MATCH (n)-[*]-(m) RETURN m"]
@@ -0,0 +1,146 @@
+import unittest
+from unittest import mock
+from scientio.drivers import neo4j_driver
+from scientio.drivers.neo4j_driver import Neo4jDriver
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+
+
+class FakeNode(dict):
+    """
+    Node of the neo4j client: Properties, with an ID and labels.
+    """
+
+    def __init__(self, node_id, labels, properties):
+        super().__init__(properties)
+        self.id = node_id
+        self.labels = frozenset(labels)
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if len(self) > 0 else None
+
+
+class FakeTransaction(object):
+    def __init__(self, database: 'FakeDatabase', read: bool):
+        self._database = database
+        self._read = read
+
+    def run(self, query, parameters=None):
+        self._database.statements.append((query, parameters, self._read))
+        return FakeResult(self._database.respond(query, parameters or dict()))
+
+
+class FakeSession(object):
+    def __init__(self, database: 'FakeDatabase'):
+        self._database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def read_transaction(self, work, *args, **kwargs):
+        return work(FakeTransaction(self._database, True), *args, **kwargs)
+
+    def write_transaction(self, work, *args, **kwargs):
+        return work(FakeTransaction(self._database, False), *args, **kwargs)
+
+
+class FakeDatabase(object):
+    """
+    Stands in for the driver of the neo4j client, recording the sessions
+     which are opened and the statements which are run in them.
+    """
+
+    def __init__(self):
+        self.sessions = []
+        self.statements = []
+        self.responses = []  # Callables from query and parameters to records, or None to try the next
+
+    def session(self, **config):
+        self.sessions.append(config)
+        return FakeSession(self)
+
+    def close(self):
+        pass
+
+    def respond(self, query, parameters):
+        for response in self.responses:
+            records = response(query, parameters)
+            if records is not None:
+                return records
+        return []
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.ontology = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        self.database = FakeDatabase()
+        with mock.patch.object(neo4j_driver.GraphDatabase, 'driver', return_value=self.database):
+            self.driver = Neo4jDriver(self.ontology, neo4j_address="bolt://localhost:7687",
+                                      neo4j_username="neo4j", neo4j_password="neo4j")
+
+    def test_read_routing(self):
+        self.database.responses.append(lambda query, parameters: [
+            {'n': FakeNode(parameters.get('n_id', 1), ['Person'], {'name': 'Roboy'}), 'edges': []}])
+        self.driver.retrieve(node_id=1)
+        self.driver.retrieve(Node(metatype=self.ontology.get_type('Person')))
+        assert [read for _, _, read in self.database.statements] == [True, True]
+
+        self.database.statements.clear()
+        self.database.responses.insert(0, lambda query, parameters: [
+            {'index': row['index'], 'id': 10 + row['index']} for row in parameters.get('rows', [])] or None)
+        people = [Node(metatype=self.ontology.get_type('Person')) for _ in range(5)]
+        self.database.sessions.clear()
+        assert [x.get_id() for x in self.driver.create_many(people, batch_size=2)] == [10, 11, 12, 13, 14]
+        assert len(self.database.sessions) == 1
+        assert [read for _, _, read in self.database.statements] == [False, False, False]
+
+    def test_compose_nodes(self):
+        records = [{'n': FakeNode(node_id, ['Person'], {'name': f'Person {node_id}', 'sex': 'male'}),
+                    'edges': [['FRIEND_OF', (node_id + 1) % 50], ['FRIEND_OF', (node_id - 1) % 50], ['LIVE_IN', 100]]}
+                   for node_id in range(50)]
+        records.append({'n': FakeNode(100, ['City', 'Location'], {'name': 'Munich'}), 'edges': [['LIVE_IN', 0]]})
+        records.append({'n': FakeNode(101, ['Unknown'], {}), 'edges': []})
+        self.database.responses.append(lambda query, parameters: records)
+
+        nodes = self.driver.retrieve(Node(metatype=self.ontology.get_type('Person')))
+        assert len(self.database.statements) == 1  # Independent of the number of nodes and edges
+        assert len(nodes) == 51
+        first = nodes[0]
+        assert not first.is_dirty()
+        assert first.get_id() == 0 and first.get_name() == 'Person 0' and first.get_properties('sex') == 'male'
+        assert first.get_relationships('FRIEND_OF') == {1, 49} and first.get_relationships('LIVE_IN') == {100}
+        assert nodes[-1].get_type() is self.ontology.get_type('City') and nodes[-1].get_relationships('LIVE_IN') == {0}
+
+    def test_create_many(self):
+        self.database.responses.append(lambda query, parameters: [
+            {'index': row['index'], 'id': 10 + row['index']} for row in parameters.get('rows', [])])
+        requests = [Node(metatype=self.ontology.get_type(entity)) for entity in ['Person', 'City', 'Person', 'Person']]
+        requests[0].set_properties({'name': 'Roboy', 'sex': ''})
+        assert [x.get_id() for x in self.driver.create_many(requests, batch_size=2)] == [10, 11, 12, 13]
+
+        # One statement per labels and batch, in which unset properties are not stored
+        batches = [(query.split("CREATE ")[1].split(")")[0], [row['index'] for row in parameters['rows']])
+                   for query, parameters, _ in self.database.statements]
+        assert sorted(batches) == [("(n:City:Location", [1]), ("(n:Person", [0, 2]), ("(n:Person", [3])]
+        assert self.database.statements[0][1]['rows'][0]['properties'] == {'name': 'Roboy'}
+
+        self.database.statements.clear()
+        self.database.responses.insert(0, lambda query, parameters: [[FakeNode(20, ['Person'], {})]])
+        self.driver.create(requests[0])
+        assert self.database.statements[0][1] == {'p0': 'Roboy'}
+
+    def test_fetch_size(self):
+        with mock.patch.object(neo4j_driver.GraphDatabase, 'driver', return_value=self.database), \
+                mock.patch('builtins.print') as warning:
+            driver = Neo4jDriver(self.ontology, neo4j_address="bolt://localhost:7687",
+                                 neo4j_username="neo4j", neo4j_password="neo4j", fetch_size=100)
+        driver.retrieve(node_id=1)
+        if neo4j_driver.FETCH_SIZE_SUPPORTED:
+            assert self.database.sessions[-1] == {'fetch_size': 100}
+        else:
+            assert warning.called and self.database.sessions[-1] == dict()
@@ -0,0 +1,138 @@
+import io
+import unittest
+from scientio.ontology.json_node import JsonNode, NodeEncoder, NodeDecoder, dumps_nodes, loads_nodes
+from scientio.ontology.node import Node
+from scientio.ontology.ontology import Ontology
+from scientio.session import Session
+
+
+class Test(unittest.TestCase):
+    def test_properties(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+
+        n.set_properties({'name': 'Test', 'telegram_id': 42})
+        assert n.get_name() == 'Test'
+        assert n.get_properties() == {'name': 'Test', 'sex': '', 'full_name': '', 'birthdate': '', 'timestamp': ''}
+
+        n.get_properties()['sex'] = 'female'
+        assert n.get_properties('sex') == 'female'
+        with self.assertRaises(KeyError):
+            n.get_properties()['telegram_id'] = 42
+        assert not hasattr(n, '__dict__')
+
+    def test_relationships(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+
+        assert n._relationships is None
+        assert 'FRIEND_OF' in n.get_relationships() and repr(n.get_relationships()).count('set()') > 0
+        assert n._relationships is None
+
+        n.get_relationships('FRIEND_OF').add(1)
+        for key, value in n.get_relationships().items():
+            if key == 'SIBLING_OF':
+                value.add(4)
+        assert n.get_relationships('SIBLING_OF') == {4} and 'SIBLING_OF' in n.get_dirty_relationships()
+        n.add_relationships({'LIVE_IN': 2, 'KNOW': {3}})
+        assert n.has_relationship('FRIEND_OF')
+        assert n.get_relationships('LIVE_IN') == {2}
+        assert 'KNOW' not in n.get_relationships()
+        assert len(n.get_relationships()) == len(o.get_type('Person').relationships)
+
+    def test_copy(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+        n.set_name('Original')
+        n.add_relationships({'FRIEND_OF': {1}})
+
+        copy = Node(node=n)
+        assert copy == n
+        copy.set_name('Copy')
+        copy.add_relationships({'FRIEND_OF': {2}})
+        assert n.get_name() == 'Original'
+        assert n.get_relationships('FRIEND_OF') == {1}
+        assert copy != n
+
+    def test_copy_on_write(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+        n.set_properties({'name': 'Original', 'sex': 'female'})
+        n.add_relationships({'FRIEND_OF': {1}})
+
+        copy = Node(node=n)
+        assert copy._values is n._values
+        copy.get_relationships('FRIEND_OF').add(2)
+        n.get_properties()['sex'] = 'male'
+        assert n.get_relationships('FRIEND_OF') == {1}
+        assert copy.get_relationships('FRIEND_OF') == {1, 2}
+        assert copy.get_properties('sex') == 'female'
+        assert dict(n.iter_relationships()) == {'FRIEND_OF': {1}}
+
+    def test_copy_isolation(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+        n.set_properties({'name': 'Original', 'full_name': ['First', 'Last']})
+        friends = n.get_relationships('FRIEND_OF')
+        names = n.get_properties('full_name')
+
+        copy = Node(node=n)
+        friends.add(12345)
+        names.append('Other')
+        assert copy.get_relationships('FRIEND_OF') == set()
+        assert copy.get_properties('full_name') == ['First', 'Last']
+        assert n.get_relationships('FRIEND_OF') == {12345}
+
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o, cache_size=10)
+        a = Node(metatype=o.get_type('Person'))
+        friends = a.get_relationships('FRIEND_OF')
+        s.create(a)
+        friends.add(12345)
+        assert s.retrieve(node_id=a.get_id())[0].get_relationships('FRIEND_OF') == set()
+
+    def test_dirty_tracking(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        n = Node(metatype=o.get_type('Person'))
+        n.set_properties({'name': 'Test', 'sex': 'female'})
+        n.add_relationships({'FRIEND_OF': {1}})
+        n.mark_clean()
+        assert not n.is_dirty()
+
+        n.set_properties({'sex': 'male'})
+        n.add_relationships({'FRIEND_OF': {2}})
+        n.get_relationships('LIVE_IN').add(3)
+        assert n.get_dirty_properties() == {'sex': 'male'}
+        assert n.get_dirty_relationships() == {'FRIEND_OF': {2}, 'LIVE_IN': {3}}
+
+        copy = Node(node=n)
+        n.mark_clean()
+        assert not n.is_dirty()
+        assert copy.get_dirty_properties() == {'sex': 'male'}
+
+    def test_json(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        person = Node(metatype=o.get_type('Person'))
+        person.set_id(1)
+        person.set_properties({'name': 'Test', 'sex': 'female'})
+        person.add_relationships({'FRIEND_OF': {3, 2}})
+        city = Node(metatype=o.get_type('City'))
+        city.set_id(2)
+        city.set_meta(frozenset())
+
+        assert JsonNode.loads(person.to_json().dumps()).to_node(o) == person
+        text = dumps_nodes([person, city, person])
+        assert text.splitlines()[1] == '[1,"Person",["","","Test","female",""],{"FRIEND_OF":[2,3]}]'
+        assert len(text.splitlines()) == 5
+        nodes = loads_nodes(text, o)
+        assert nodes == [person, city, person]
+        assert nodes[0].get_type() is o.get_type('Person') and not nodes[0].is_dirty()
+        assert nodes[1].get_meta() == frozenset()
+
+        stream = io.StringIO()
+        assert NodeEncoder().dump(iter([city, person]), stream) == 2
+        stream.seek(0)
+        assert [node.get_id() for node in NodeDecoder(o).load(stream)] == [2, 1]
+
+        # Malformed lines are skipped
+        lines = text.splitlines()
+        assert loads_nodes("\n".join([lines[0], '[1,"Person",', '{"entity":"City"}', '[3]', lines[1]]), o) == [person]
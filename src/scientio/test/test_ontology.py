@@ -0,0 +1,77 @@
+import os
+import pickle
+import tempfile
+import unittest
+from scientio.ontology.ontology import Ontology
+from scientio.ontology.ontology_cache import OntologyCache, CACHE_FORMAT_VERSION
+from scientio.ontology.otype import OType
+from scientio.ontology.schema import IndexSpec, required_indexes, compare_indexes
+
+
+class Test(unittest.TestCase):
+    def test_lookup(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+
+        assert o.get_type('Company').entity == 'Company'
+        assert o.get_type('Spaceship') is None
+        assert o.get_type('Company') in o
+        assert OType(entity='Company', properties=['name']) not in o
+        assert 'Company' not in o
+
+    def test_resolve_type(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+
+        assert o.resolve_type(['Organisation', 'Company']) is o.get_type('Company')
+        assert o.resolve_type(['Company', 'Organisation']) is o.get_type('Company')
+        assert o.resolve_type(['Organisation', 'Unknown']) is o.get_type('Organisation')
+        assert o.resolve_type(['Unknown']) is None
+
+    def test_types_set(self):
+        types = {OType(entity='Alien'), OType(entity='Vulcan', meta=['Alien'])}
+        o = Ontology(types_set=types)
+
+        assert o.entities == frozenset(['Alien', 'Vulcan'])
+        assert OType(entity='Vulcan', meta=['Alien']) in o
+
+    def test_copy(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        copy = Ontology(ontology=o)
+
+        assert copy.types is o.types
+        assert copy.get_type('Company') is o.get_type('Company')
+        assert copy.resolve_type(['Organisation', 'Company']) is o.get_type('Company')
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parsed = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+            compiled = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml", cache_dir=directory)
+            assert len(os.listdir(directory)) == 1
+            cached = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml", cache_dir=directory)
+
+            assert compiled.types == parsed.types == cached.types
+            for otype in parsed.types:
+                assert cached.get_type(otype.entity).meta == otype.meta
+
+            cache = OntologyCache(directory)
+            path = os.path.join(directory, os.listdir(directory)[0])
+            digest = os.path.basename(path)[len("ontology-"):-len(".pickle")]
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            os.chmod(path, 0o666)
+            assert cache.load(digest) is None
+            with open(path, 'wb') as f:
+                pickle.dump((CACHE_FORMAT_VERSION, [("Person",)]), f)
+            os.chmod(path, 0o600)
+            assert cache.load(digest) is None
+
+    def test_schema(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        required = required_indexes(o)
+
+        assert IndexSpec('TelegramPerson', 'telegram_id', True) in required
+        assert IndexSpec('TelegramPerson', 'name') in required
+        assert IndexSpec('Person', 'sex') not in required
+
+        existing = [IndexSpec('Person', 'name'), IndexSpec('Person', 'sex'), IndexSpec('Spaceship', 'name')]
+        report = compare_indexes(o, existing)
+        assert report.unused == [IndexSpec('Person', 'sex')]
+        assert len(report.missing) == len(required) - 1
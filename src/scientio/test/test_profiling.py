@@ -0,0 +1,36 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from scientio.util.profiling import Profiler
+
+
+def summary(operator: str):
+    return SimpleNamespace(plan=None, notifications=[], profile={
+        'operatorType': 'ProduceResults', 'identifiers': ['n'], 'args': {}, 'dbHits': 0, 'rows': 2,
+        'children': [{'operatorType': operator, 'identifiers': ['n', 'm'], 'args': {}, 'dbHits': 12, 'rows': 2}]})
+
+
+class Test(unittest.TestCase):
+    def test_capture(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler(Profiler.PROFILE, operations=['retrieve'], buffer_size=2, dump_dir=directory)
+            assert not profiler.selected()
+            with profiler.operation('retrieve'):
+                assert profiler.selected()
+                with self.assertLogs('scientio.profiling'):
+                    scan = profiler.capture("MATCH (n), (m) RETURN n", summary('CartesianProduct'))
+                profiler.capture("MATCH (n:Person {name: $p0}) RETURN n", summary('NodeIndexSeek'))
+                profiler.capture("MATCH (n:Person) RETURN n", summary('NodeByLabelScan'))
+
+            assert scan.operation == 'retrieve' and scan.db_hits == 12
+            assert scan.warnings == ["CartesianProduct of n, m: independent matches are joined"]
+            assert [plan.query for plan in profiler.plans] == \
+                ["MATCH (n:Person {name: $p0}) RETURN n", "MATCH (n:Person) RETURN n"]
+            assert profiler.get("MATCH (n:Person {name: $p0}) RETURN n").warnings == []
+            with open(os.path.join(directory, f"{scan.shape}.json")) as f:
+                assert json.load(f)['plan']['children'][0]['operator'] == 'CartesianProduct'
+        with self.assertRaises(ValueError):
+            Profiler("ANALYZE")
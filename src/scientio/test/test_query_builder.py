@@ -0,0 +1,32 @@
+import unittest
+from scientio.util.query_builder import QueryBuilder
+
+
+class Test(unittest.TestCase):
+    def test_parameters_are_not_inlined(self):
+        builder = QueryBuilder()
+        builder.add("MATCH (n:Person").add_parameters({"name": "O'Brien", "telegram_id": 42}).add(")")
+        builder.add("RETURN n")
+
+        assert builder.get() == "MATCH (n:Person {name: $p0, telegram_id: $p1}) RETURN n"
+        assert builder.get_parameters() == {"p0": "O'Brien", "p1": 42}
+
+        assert QueryBuilder("MATCH (n:Person").add(")").add("RETURN n").get() == "MATCH (n:Person) RETURN n"
+        assert QueryBuilder("CREATE (a:Person").add_meta(["Robot"]).add(") RETURN a").get() == \
+            "CREATE (a:Person:Robot) RETURN a"
+
+    def test_same_shape_same_statement(self):
+        first = QueryBuilder().match_by_id(1, "n").set_values({"name": "a"}, "n").add("RETURN n")
+        second = QueryBuilder().match_by_id(2, "n").set_values({"name": "b"}, "n").add("RETURN n")
+
+        assert first.get() == second.get() == "MATCH (n) WHERE ID(n)=$n_id SET n.name=$p1 RETURN n"
+        assert second.get_parameters() == {"n_id": 2, "p1": "b"}
+
+    def test_copy_constructor(self):
+        original = QueryBuilder("MATCH (n)   RETURN n")
+        original.param(1)
+        copy = QueryBuilder(builder=original).add("LIMIT 1")
+
+        assert original.get() == "MATCH (n) RETURN n"
+        assert copy.get() == "MATCH (n) RETURN n LIMIT 1"
+        assert copy.get_parameters() == {"p0": 1}
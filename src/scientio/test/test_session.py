@@ -1,8 +1,11 @@
 import os
+import tempfile
 import unittest
 from scientio.session import Session
+from scientio.drivers.in_memory_driver import InMemoryDriver
 from scientio.ontology.node import Node
 from scientio.ontology.ontology import Ontology
+from scientio.snapshot import export_snapshot, import_snapshot
 
 class Test(unittest.TestCase):
     def test_init(self):
@@ -27,3 +30,215 @@ class Test(unittest.TestCase):
 
         # TODO make smarter
         assert (n_response is not None)
+
+    def test_in_memory_crud(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        roboy = Node(metatype=o.get_type('Roboy'))
+        roboy.set_name('Roboy')
+        roboy = s.create(roboy)
+        munich = Node(metatype=o.get_type('City'))
+        munich.set_name('Munich')
+        munich = s.create(munich)
+        assert roboy.get_id() != munich.get_id()
+
+        roboy.add_relationships({'LIVE_IN': {munich.get_id()}})
+        updated = s.update(roboy)
+        assert updated.get_relationships('LIVE_IN') == {munich.get_id()}
+
+        query = Node(metatype=o.get_type('City'))
+        query.set_relationships({'LIVE_IN': {roboy.get_id()}})
+        assert [n.get_name() for n in s.retrieve(query)] == ['Munich']
+
+        location = Node(metatype=o.get_type('Location'))
+        location.set_meta(frozenset())
+        assert [n.get_id() for n in s.retrieve(location)] == [munich.get_id()]
+
+        assert s.delete(updated)
+        assert s.retrieve(node_id=munich.get_id())[0].get_relationships('LIVE_IN') == set()
+        assert s.retrieve(node_id=roboy.get_id())[0].get_name() == 'Roboy'
+
+    def test_in_memory_transaction(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        with s.transaction():
+            roboy = Node(metatype=o.get_type('Roboy'))
+            roboy.set_name('Roboy')
+            s.create(roboy)
+            roboy.set_properties({'sex': 'male'})
+            s.update(roboy)
+            assert roboy.get_id() < 0
+            assert s.retrieve(Node(metatype=o.get_type('Roboy'))) == []
+        assert s.retrieve(node_id=roboy.get_id())[0].get_properties('sex') == 'male'
+
+        driver = InMemoryDriver(ontology=o)
+        rollback = Node(node=roboy)
+        rollback.set_id(-1)
+        driver.create(rollback)
+        try:
+            with driver.transaction():
+                rollback.set_properties({'name': 'Other'})
+                driver.update(rollback)
+                driver.create(Node(metatype=o.get_type('City')))
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        assert [n.get_name() for n in driver.retrieve(Node(metatype=o.get_type('Roboy')))] == ['Roboy']
+        assert driver.retrieve(Node(metatype=o.get_type('City'))) == []
+
+    def test_in_memory_cache(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o, cache_size=1)
+
+        roboy = Node(metatype=o.get_type('Roboy'))
+        roboy.set_name('Roboy')
+        s.create(roboy)
+        cached = s.retrieve(node_id=roboy.get_id())[0]
+        cached.set_name('Mutated')
+        assert s.retrieve(node_id=roboy.get_id())[0].get_name() == 'Roboy'
+        assert (s.cache.hits, s.cache.misses) == (1, 1)
+
+        roboy.set_properties({'sex': 'male'})
+        s.update(roboy)
+        assert s.retrieve(node_id=roboy.get_id())[0].get_properties('sex') == 'male'
+        assert s.cache.misses == 2
+
+        city = Node(metatype=o.get_type('City'))
+        city.set_name('Munich')
+        s.create(city)
+        s.retrieve(node_id=city.get_id())
+        assert len(s.cache) == 1
+        s.retrieve(node_id=roboy.get_id())
+        assert s.cache.misses == 4
+
+        # Relationships are not created along with a node, so they are not served from the cache either
+        person = Node(metatype=o.get_type('Person'))
+        person.set_relationships({'FRIEND_OF': {roboy.get_id()}})
+        s.create(person)
+        cached = s.retrieve(node_id=person.get_id())[0]
+        hit = s.retrieve(node_id=person.get_id())[0]
+        stored = s._driver.retrieve(node_id=person.get_id())[0]
+        assert hit.get_relationships() == cached.get_relationships() == stored.get_relationships()
+        assert hit.get_relationships('FRIEND_OF') == set()
+
+    def test_in_memory_iter_retrieve(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        people = [Node(metatype=o.get_type('Person')) for _ in range(10)]
+        for i, person in enumerate(people):
+            person.set_name(f'Person {i}')
+        s.create_many(people)
+
+        found = s.iter_retrieve(Node(metatype=o.get_type('Person')), page_size=3)
+        assert next(found).get_name() == 'Person 0'
+        people[2].set_name('Renamed')
+        s.update(people[2])
+        assert [person.get_name() for person in found][:2] == ['Person 1', 'Renamed']
+        found.close()
+
+    def test_in_memory_expand(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        people = [Node(metatype=o.get_type('Person')) for _ in range(5)]
+        s.create_many(people)
+        for person, friend in zip(people, people[1:]):
+            person.add_relationships({'FRIEND_OF': {friend.get_id()}})
+        people[0].add_relationships({'SIBLING_OF': {people[4].get_id()}})
+        s.update_many(people)
+
+        ids = [person.get_id() for person in people]
+        assert [x.get_id() for x in s.expand(ids[0], depth=2)] == [ids[0], ids[1], ids[4], ids[2], ids[3]]
+        assert [x.get_id() for x in s.expand(ids[0], depth=2, relationships=['FRIEND_OF'])] == ids[:3]
+        assert [x.get_id() for x in s.expand(ids[0], depth=2, limit=2)] == ids[:2]
+        assert [x.get_id() for x in s.expand(ids[0], depth=2, relationships=[])] == ids[:1]
+        assert s.expand(ids[0], relationships=['UNKNOWN']) is None
+
+    def test_in_memory_update_delta(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        roboy = Node(metatype=o.get_type('Roboy'))
+        roboy.set_properties({'name': 'Roboy', 'sex': 'male'})
+        s.create(roboy)
+        stale = s.retrieve(node_id=roboy.get_id())[0]
+
+        roboy.set_properties({'sex': 'female'})
+        stale.set_properties({'name': 'Roboy 2.0'})
+        with s.transaction():
+            s.update(roboy)
+            s.update(stale)
+        assert not roboy.is_dirty() and not stale.is_dirty()
+        assert s.retrieve(node_id=roboy.get_id())[0].get_properties() == \
+            dict(roboy.get_properties(), name='Roboy 2.0')
+
+    def test_in_memory_delete_nodes(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o, cache_size=10)
+
+        people = [Node(metatype=o.get_type('Person')) for _ in range(3)]
+        s.create_many(people)
+        people[0].add_relationships({'FRIEND_OF': {people[1].get_id(), people[2].get_id()}})
+        s.update(people[0])
+        ids = [person.get_id() for person in people]
+        s.retrieve(node_id=ids[0])
+
+        assert s.delete_edges([(ids[2], 'FRIEND_OF', ids[0]), (ids[1], 'SIBLING_OF', ids[0])]) == [True, False]
+        assert s.retrieve(node_id=ids[0])[0].get_relationships('FRIEND_OF') == {ids[1]}
+        assert s.delete_nodes([ids[1], 42]) == [True, False]
+        assert ids[0] not in s.cache
+        assert s.retrieve(node_id=ids[1]) is None
+        assert not s.retrieve(node_id=ids[0])[0].has_relationship('FRIEND_OF')
+
+        with self.assertRaises(RuntimeError):
+            with s._driver.transaction():
+                s.delete_nodes([ids[0]])
+                raise RuntimeError()
+        assert s.retrieve(node_id=ids[0])[0].get_id() == ids[0]
+
+    def test_in_memory_snapshot(self):
+        o = Ontology(path_to_yaml="scientio/examples/example_ontology.yaml")
+        s = Session(driver_name=Session.InMemoryDriver, ontology=o)
+
+        people = [Node(metatype=o.get_type('Person')) for _ in range(3)]
+        for i, person in enumerate(people):
+            person.set_name(f'Person {i}')
+        city = Node(metatype=o.get_type('City'))
+        city.set_name('Munich')
+        s.create_many(people + [city])
+        ids = [node.get_id() for node in people + [city]]
+        assert s.create_edges([(ids[0], 'FRIEND_OF', ids[1]), (ids[2], 'FRIEND_OF', ids[0]),
+                               (ids[0], 'LIVE_IN', ids[3]), (ids[0], 'LIVE_IN', 42)]) == [True, True, True, False]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.jsonl.gz")
+            exported = export_snapshot(s, o, path)
+            assert (exported.nodes, exported.edges) == (4, 3)
+
+            target = Session(driver_name=Session.InMemoryDriver, ontology=o)
+            target.create(Node(metatype=o.get_type('Country')))
+            imported = import_snapshot(target, o, path, batch_size=2)
+            assert (imported.nodes, imported.edges, imported.skipped_edges) == (4, 3, 0)
+            munich = target.retrieve(Node(metatype=o.get_type('City')))[0]
+            assert munich.get_id() != ids[3] and munich.get_meta() == city.get_meta()
+            first = target.retrieve(Node(metatype=o.get_type('Person')))[0]
+            assert first.get_name() == 'Person 0' and first.get_relationships('LIVE_IN') == {munich.get_id()}
+            assert len(first.get_relationships('FRIEND_OF')) == 2
+
+            export_snapshot(s, o, path, entities=['Person'])
+            imported = import_snapshot(Session(driver_name=Session.InMemoryDriver, ontology=o), o, path)
+            assert (imported.nodes, imported.edges, imported.skipped_edges) == (3, 2, 1)
+
+            # The people have lower IDs than the city, but the city's edges to them are exported as well
+            exported = export_snapshot(s, o, path, entities=['City'])
+            assert (exported.nodes, exported.edges) == (1, 1)
+            exported = export_snapshot(s, o, path, entities=['City', 'Person'])
+            assert (exported.nodes, exported.edges) == (4, 3)
+            target = Session(driver_name=Session.InMemoryDriver, ontology=o)
+            imported = import_snapshot(target, o, path)
+            assert (imported.nodes, imported.edges, imported.skipped_edges) == (4, 3, 0)
+            munich = target.retrieve(Node(metatype=o.get_type('City')))[0]
+            assert len(munich.get_relationships('LIVE_IN')) == 1
@@ -0,0 +1,99 @@
+from typing import List, Tuple, Optional
+
+from scientio.interfaces.operations import Operations
+from scientio.ontology.node import Node
+
+
+class UnitOfWork(object):
+    """
+    Queue of create/update/delete requests, which are written to
+     an operations driver together when the unit of work is flushed.
+    Consecutive writes to the same node are merged into one.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+    """
+    The queued requests in the order in which they were requested, as pairs of
+     request kind and the nodes which were merged into the request.
+    """
+    _operations: List[Tuple[str, List[Node]]]
+
+    def __init__(self):
+        self._operations = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def add(self, kind: str, node: Node) -> None:
+        """
+        Queue a write request.
+        :param kind: One of `UnitOfWork.CREATE`, `UnitOfWork.UPDATE` or `UnitOfWork.DELETE`.
+        :param node: The node to be written. It is not copied, so changes which are
+         made to the node before the flush are written as well.
+        """
+        if self._operations and self._merge(self._operations[-1], kind, node):
+            return
+        self._operations.append((kind, [node]))
+
+    def nodes(self) -> List[Node]:
+        """
+        Get all nodes for which a write request is queued.
+        """
+        return [node for _, merged in self._operations for node in merged]
+
+    def flush(self, driver: Operations) -> None:
+        """
+        Write all queued requests through the given driver, grouping
+         runs of the same kind of request into one bulk operation.
+        :param driver: The driver to write to.
+        """
+        start = 0
+        while start < len(self._operations):
+            kind = self._operations[start][0]
+            end = start
+            while end < len(self._operations) and self._operations[end][0] == kind:
+                end += 1
+            nodes = [self._resolve(merged) for _, merged in self._operations[start:end]]
+            results = {
+                UnitOfWork.CREATE: driver.create_many,
+                UnitOfWork.UPDATE: driver.update_many,
+                UnitOfWork.DELETE: driver.delete_many
+            }[kind](nodes)
+            if kind == UnitOfWork.UPDATE:
+                # The merged requests were persisted through their resolved copies
+                for (_, merged), result in zip(self._operations[start:end], results):
+                    for node in merged:
+                        if result is not None:
+                            node.mark_clean()
+            start = end
+
+    @staticmethod
+    def _merge(previous: Tuple[str, List[Node]], kind: str, node: Node) -> bool:
+        previous_kind, merged = previous
+        if merged[-1] is node:
+            if previous_kind == kind:
+                return True
+            # The queued create persists the final properties of the node already
+            return previous_kind == UnitOfWork.CREATE and kind == UnitOfWork.UPDATE \
+                and len(node.get_dirty_relationships()) == 0
+        if previous_kind == kind == UnitOfWork.UPDATE and node.get_id() >= 0 \
+                and merged[-1].get_id() == node.get_id():
+            merged.append(node)
+            return True
+        return False
+
+    @staticmethod
+    def _resolve(merged: List[Node]) -> Node:
+        if len(merged) == 1:
+            return merged[0]
+        # Changes of earlier requests are persisted along with the last one, unless it overrides them
+        node = Node(node=merged[-1])
+        properties = dict()
+        for previous in merged:
+            properties.update(previous.get_dirty_properties())
+            node.add_relationships(previous.get_dirty_relationships())
+        node.set_properties(properties)
+        return node
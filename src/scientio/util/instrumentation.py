@@ -0,0 +1,260 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any, Optional, NamedTuple, Deque
+
+"""
+Logger to which statements are reported, which take longer than the slow query threshold.
+"""
+slow_query_logger = logging.getLogger("scientio.slow_query")
+
+"""
+Upper bounds of the latency histogram buckets in seconds.
+"""
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+"""
+Operation name for statements which are executed outside of any Session operation.
+"""
+NO_OPERATION = "none"
+
+
+class SlowQuery(NamedTuple):
+    """
+    A statement which took longer than the slow query threshold.
+    """
+    operation: str
+    query: str
+    parameters: Optional[Dict[str, Any]]
+    seconds: float
+    rows: int
+    timestamp: float
+
+
+class Histogram(object):
+    """
+    Cumulative latency histogram with fixed buckets, as exported to Prometheus.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Hook(object):
+    """
+    Callbacks which are invoked by Metrics. Override the methods of interest,
+     e.g. to forward timings to a tracing system. Hooks are called synchronously
+     on the thread which executed the operation, so they should return quickly.
+    """
+
+    def on_operation(self, operation: str, seconds: float, statements: int, rows: int,
+                     error: Optional[BaseException]) -> None:
+        """
+        Called after every Session operation.
+        :param operation: Name of the operation, e.g. "retrieve".
+        :param seconds: Duration of the operation.
+        :param statements: Number of statements which were executed by the operation.
+        :param rows: Number of records which were returned by those statements.
+        :param error: The exception raised by the operation, or None if it succeeded.
+        """
+        pass
+
+    def on_statement(self, operation: str, query: str, parameters: Optional[Dict[str, Any]],
+                     seconds: float, rows: int) -> None:
+        """
+        Called after every statement which was sent to the graph memory.
+        :param operation: Name of the enclosing operation, or `NO_OPERATION`.
+        :param query: The statement, e.g. Cypher.
+        :param parameters: The parameters of the statement.
+        :param seconds: Duration of the statement, including the transfer of it's results.
+        :param rows: Number of records which were returned.
+        """
+        pass
+
+
+class _Counters(object):
+    __slots__ = ('latency', 'statements', 'round_trips', 'rows', 'cache_hits', 'cache_misses', 'errors')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.latency = Histogram(buckets)
+        self.statements = 0
+        self.round_trips = 0
+        self.rows = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors = 0
+
+
+class _Frame(object):
+    __slots__ = ('operation', 'statements', 'rows')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.statements = 0
+        self.rows = 0
+
+
+class Metrics(object):
+    """
+    Instrumentation of Session operations: Latency histograms, counts of statements,
+     round-trips, returned rows and cache lookups per operation, hooks, and a log of
+     slow statements. Pass an instance to a Session as `metrics` to enable it.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, slow_query_threshold: float = None,
+                 slow_query_log_size: int = 100):
+        """
+        Create empty metrics.
+        :param buckets: Upper bounds of the latency histogram buckets in seconds.
+        :param slow_query_threshold: Statements which take longer than this number of seconds
+         are logged to the `scientio.slow_query` logger and kept in `slow_queries`.
+         Set to None to disable the slow query log.
+        :param slow_query_log_size: Maximum number of slow statements which are kept.
+        """
+        self.buckets = buckets
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=slow_query_log_size)
+        self.hooks: List[Hook] = []
+        self._counters: Dict[str, _Counters] = dict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_hook(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    def counters(self, operation: str) -> _Counters:
+        """
+        Get the counters of an operation. They are created on first use.
+        """
+        counters = self._counters.get(operation)
+        if counters is None:
+            with self._lock:
+                counters = self._counters.setdefault(operation, _Counters(self.buckets))
+        return counters
+
+    @contextmanager
+    def operation(self, operation: str):
+        """
+        Measure an operation. Statements and cache lookups within the context
+         are attributed to the innermost operation of the current thread.
+        :param operation: Name of the operation, e.g. "retrieve".
+        """
+        frames: List[_Frame] = getattr(self._local, 'frames', None)
+        if frames is None:
+            frames = self._local.frames = []
+        frame = _Frame(operation)
+        frames.append(frame)
+        error: Optional[BaseException] = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            frames.remove(frame)
+            counters = self.counters(operation)
+            with self._lock:
+                counters.latency.observe(seconds)
+                if error is not None:
+                    counters.errors += 1
+            for hook in self.hooks:
+                hook.on_operation(operation, seconds, frame.statements, frame.rows, error)
+
+    def statement(self, query: str, parameters: Optional[Dict[str, Any]], seconds: float, rows: int,
+                  round_trips: int = 1) -> None:
+        """
+        Record a statement which was sent to the graph memory. Called by drivers.
+        :param query: The statement.
+        :param parameters: The parameters of the statement.
+        :param seconds: Duration of the statement, including the transfer of it's results.
+        :param rows: Number of records which were returned.
+        :param round_trips: Number of requests to the server which the statement took.
+        """
+        frame = self._frame()
+        operation = frame.operation if frame is not None else NO_OPERATION
+        if frame is not None:
+            frame.statements += 1
+            frame.rows += rows
+        counters = self.counters(operation)
+        with self._lock:
+            counters.statements += 1
+            counters.round_trips += round_trips
+            counters.rows += rows
+        if self.slow_query_threshold is not None and seconds > self.slow_query_threshold:
+            self.slow_queries.append(SlowQuery(operation, query, parameters, seconds, rows, time.time()))
+            slow_query_logger.warning("Slow %s statement (%.1f ms, %d rows): %s", operation, seconds * 1000, rows, query)
+        for hook in self.hooks:
+            hook.on_statement(operation, query, parameters, seconds, rows)
+
+    def cache_lookup(self, hit: bool) -> None:
+        """
+        Record a lookup in a Session's node cache. Called by the Session.
+        """
+        frame = self._frame()
+        counters = self.counters(frame.operation if frame is not None else NO_OPERATION)
+        with self._lock:
+            if hit:
+                counters.cache_hits += 1
+            else:
+                counters.cache_misses += 1
+
+    def reset(self) -> None:
+        """
+        Reset all counters and the slow query log.
+        """
+        with self._lock:
+            self._counters.clear()
+            self.slow_queries.clear()
+
+    def to_prometheus(self, prefix: str = "scientio") -> str:
+        """
+        Export all counters in the Prometheus text exposition format.
+        :param prefix: Prefix of all metric names.
+        :return: The exposition, one sample per line.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            lines = [f"# HELP {prefix}_operation_seconds Latency of session operations.",
+                     f"# TYPE {prefix}_operation_seconds histogram"]
+            for operation, values in counters:
+                latency = values.latency
+                for bound, count in zip(latency.buckets, latency.counts):
+                    lines.append(f'{prefix}_operation_seconds_bucket{{operation="{operation}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_operation_seconds_bucket{{operation="{operation}",le="+Inf"}} {latency.count}')
+                lines.append(f'{prefix}_operation_seconds_sum{{operation="{operation}"}} {latency.sum}')
+                lines.append(f'{prefix}_operation_seconds_count{{operation="{operation}"}} {latency.count}')
+            for name, help_text in (('errors', "Session operations which raised an exception."),
+                                    ('statements', "Statements sent to the graph memory."),
+                                    ('round_trips', "Requests to the graph memory server."),
+                                    ('rows', "Records returned by statements."),
+                                    ('cache_hits', "Node cache lookups which were hits."),
+                                    ('cache_misses', "Node cache lookups which were misses.")):
+                lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for operation, values in counters:
+                    lines.append(f'{prefix}_{name}_total{{operation="{operation}"}} {getattr(values, name)}')
+            lines.append(f"# HELP {prefix}_slow_queries Statements in the slow query log.")
+            lines.append(f"# TYPE {prefix}_slow_queries gauge")
+            lines.append(f"{prefix}_slow_queries {len(self.slow_queries)}")
+        return "\n".join(lines) + "\n"
+
+    def _frame(self) -> Optional[_Frame]:
+        frames = getattr(self._local, 'frames', None)
+        return frames[-1] if frames else None
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Iterable, Callable
+
+from scientio.ontology.node import Node
+
+
+class NodeCache(object):
+    """
+    Identity map from node IDs to Nodes, with a size limit, least-recently-used
+     eviction and an optional time-to-live for every entry.
+    Nodes are copied on the way in and on the way out, so that
+     cached Nodes cannot be mutated by accident.
+    """
+
+    hits: int  # Number of lookups which were answered from the cache
+    misses: int  # Number of lookups which were not answered from the cache
+
+    def __init__(self, max_size: int, ttl: float = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Create an empty cache.
+        :param max_size: Maximum number of cached nodes. The least recently
+         used node is evicted when the limit is exceeded.
+        :param ttl: Number of seconds for which a node stays valid, or None
+         to keep nodes until they are evicted or invalidated.
+        :param clock: Source of the current time in seconds.
+        """
+        if max_size <= 0:
+            raise ValueError("The size limit of a NodeCache must be positive!")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: 'OrderedDict[int, Tuple[Node, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, node_id: int):
+        return node_id in self._entries
+
+    def get(self, node_id: int) -> Optional[Node]:
+        """
+        Look up a node by it's ID and count the lookup as hit or miss.
+        :param node_id: ID of the requested node.
+        :return: A copy of the cached node, or None if it is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(node_id)
+            if entry is not None and self.ttl is not None and self._clock() - entry[1] > self.ttl:
+                del self._entries[node_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(node_id)
+            self.hits += 1
+        return Node(node=entry[0])
+
+    def put(self, node: Node) -> None:
+        """
+        Store a copy of a node, replacing any previous entry for it's ID.
+        :param node: The node to cache. Nodes without ID are ignored.
+        """
+        if node is None or node.get_id() < 0:
+            return
+        entry = (Node(node=node), self._clock())
+        with self._lock:
+            self._entries[node.get_id()] = entry
+            self._entries.move_to_end(node.get_id())
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, node_ids: Iterable[int]) -> None:
+        """
+        Remove nodes from the cache.
+        :param node_ids: IDs of the nodes to remove.
+        """
+        with self._lock:
+            for node_id in node_ids:
+                self._entries.pop(node_id, None)
+
+    def purge(self, node_ids: Iterable[int]) -> None:
+        """
+        Remove deleted nodes from the cache, together with all cached nodes
+         which still refer to any of them through a relationship.
+        :param node_ids: IDs of the deleted nodes.
+        """
+        node_ids = set(node_ids)
+        with self._lock:
+            stale = [cached_id for cached_id, (node, _) in self._entries.items()
+                     if cached_id in node_ids
+                     or any(not node_ids.isdisjoint(value) for _, value in node.iter_relationships())]
+            for cached_id in stale:
+                del self._entries[cached_id]
+
+    def clear(self) -> None:
+        """
+        Remove all nodes from the cache. The hit and miss counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
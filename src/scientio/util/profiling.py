@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterable, Set
+
+"""
+Logger to which plans with problematic operators are reported.
+"""
+profiling_logger = logging.getLogger("scientio.profiling")
+
+"""
+Operators which read every node of a label, or of the whole graph, instead of seeking an index.
+"""
+SCAN_OPERATORS = frozenset(["NodeByLabelScan", "AllNodesScan"])
+
+"""
+Operators which join independent matches into the product of their rows.
+"""
+CARTESIAN_OPERATORS = frozenset(["CartesianProduct"])
+
+
+class PlanOperator(object):
+    """
+    One operator of an execution plan, with the rows and database hits
+     it produced if the plan was profiled.
+    """
+
+    def __init__(self, operator: str, identifiers: List[str] = None, arguments: Dict[str, Any] = None,
+                 children: List['PlanOperator'] = None, db_hits: int = None, rows: int = None):
+        self.operator = operator
+        self.identifiers = identifiers or []
+        self.arguments = arguments or dict()
+        self.children = children or []
+        self.db_hits = db_hits
+        self.rows = rows
+
+    @staticmethod
+    def from_plan(plan) -> 'PlanOperator':
+        """
+        Convert a plan of the neo4j client: Either a (Profiled)Plan tuple,
+         as returned by client 1.7, or a dictionary, as returned by newer clients.
+        """
+        if isinstance(plan, dict):
+            return PlanOperator(plan.get('operatorType'), plan.get('identifiers'), plan.get('args'),
+                                [PlanOperator.from_plan(x) for x in plan.get('children', [])],
+                                plan.get('dbHits'), plan.get('rows'))
+        return PlanOperator(plan.operator_type, list(plan.identifiers), dict(plan.arguments),
+                            [PlanOperator.from_plan(x) for x in plan.children],
+                            getattr(plan, 'db_hits', None), getattr(plan, 'rows', None))
+
+    def walk(self) -> Iterable['PlanOperator']:
+        """
+        Iterate over this operator and all operators below it.
+        """
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operator": self.operator,
+            "identifiers": self.identifiers,
+            "arguments": {key: str(value) for key, value in self.arguments.items()},
+            "db_hits": self.db_hits,
+            "rows": self.rows,
+            "children": [child.to_dict() for child in self.children]}
+
+
+class CapturedPlan(object):
+    """
+    The plan of a statement, as captured by a Profiler.
+    """
+
+    def __init__(self, shape: str, operation: str, mode: str, query: str, plan: Optional[PlanOperator],
+                 notifications: List[str], timestamp: float):
+        self.shape = shape
+        self.operation = operation
+        self.mode = mode
+        self.query = query
+        self.plan = plan
+        self.notifications = notifications
+        self.timestamp = timestamp
+        self.warnings = self._warnings()
+
+    @property
+    def db_hits(self) -> Optional[int]:
+        """
+        Database hits of all operators, or None if the plan was not profiled.
+        """
+        if self.plan is None or self.plan.db_hits is None:
+            return None
+        return sum(x.db_hits or 0 for x in self.plan.walk())
+
+    def _warnings(self) -> List[str]:
+        warnings = list(self.notifications)
+        if self.plan is not None:
+            for operator in self.plan.walk():
+                name = (operator.operator or "").split("@")[0]
+                if name in SCAN_OPERATORS:
+                    warnings.append(f"{name} over {', '.join(operator.identifiers)}: no index is used")
+                elif name in CARTESIAN_OPERATORS:
+                    warnings.append(f"{name} of {', '.join(operator.identifiers)}: independent matches are joined")
+        return warnings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "shape": self.shape,
+            "operation": self.operation,
+            "mode": self.mode,
+            "query": self.query,
+            "timestamp": self.timestamp,
+            "db_hits": self.db_hits,
+            "warnings": self.warnings,
+            "plan": self.plan.to_dict() if self.plan is not None else None}
+
+
+class Profiler(object):
+    """
+    Capture mode for the execution plans of generated statements. Pass an instance
+     to a Session as `profiler` to enable it for the Neo4j driver.
+    In `EXPLAIN` mode, every selected statement is planned without execution before
+     it runs normally. In `PROFILE` mode, selected statements run under PROFILE, which
+     executes them and reports the rows and database hits of every operator, at the
+     expense of a slower execution.
+    Plans are kept per query shape, i.e. per statement with it's parameters left as
+     placeholders, in a buffer of the most recently captured shapes.
+    """
+
+    EXPLAIN = "EXPLAIN"
+    PROFILE = "PROFILE"
+
+    def __init__(self, mode: str = EXPLAIN, operations: Iterable[str] = None, buffer_size: int = 100,
+                 dump_dir: str = None):
+        """
+        Create a profiler.
+        :param mode: Either `Profiler.EXPLAIN` or `Profiler.PROFILE`.
+        :param operations: Names of the Session operations whose statements are captured,
+         e.g. ["retrieve"]. All statements are captured if None.
+        :param buffer_size: Maximum number of query shapes whose latest plan is kept.
+        :param dump_dir: Directory to which every captured plan is written as JSON,
+         to a file named after it's query shape. Plans are not written if None.
+        """
+        if mode not in (Profiler.EXPLAIN, Profiler.PROFILE):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.operations: Optional[Set[str]] = set(operations) if operations is not None else None
+        self.buffer_size = buffer_size
+        self.dump_dir = dump_dir
+        self._plans: 'OrderedDict[str, CapturedPlan]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def plans(self) -> List[CapturedPlan]:
+        """
+        The latest captured plan of every buffered query shape, least recent first.
+        """
+        with self._lock:
+            return list(self._plans.values())
+
+    def get(self, query: str) -> Optional[CapturedPlan]:
+        """
+        Get the latest captured plan for a statement.
+        """
+        with self._lock:
+            return self._plans.get(self.shape(query))
+
+    @staticmethod
+    def shape(query: str) -> str:
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]
+
+    @contextmanager
+    def operation(self, operation: str):
+        """
+        Attribute the statements within the context to a Session operation of the current thread.
+        """
+        operations = getattr(self._local, 'operations', None)
+        if operations is None:
+            operations = self._local.operations = []
+        operations.append(operation)
+        try:
+            yield
+        finally:
+            # A generator may leave the context after operations which started while it was suspended
+            del operations[len(operations) - 1 - operations[::-1].index(operation)]
+
+    def current_operation(self) -> Optional[str]:
+        operations = getattr(self._local, 'operations', None)
+        return operations[-1] if operations else None
+
+    def selected(self) -> bool:
+        """
+        Check whether statements of the current operation should be captured.
+        """
+        return self.operations is None or self.current_operation() in self.operations
+
+    def capture(self, query: str, summary) -> CapturedPlan:
+        """
+        Capture the plan from the result summary of an explained or profiled statement. Called by drivers.
+        :param query: The statement, without EXPLAIN or PROFILE prefix.
+        :param summary: The result summary of the neo4j client.
+        :return: The captured plan.
+        """
+        plan = getattr(summary, 'profile', None) or getattr(summary, 'plan', None)
+        notifications = [self._notification_text(x) for x in getattr(summary, 'notifications', None) or []]
+        captured = CapturedPlan(self.shape(query), self.current_operation(), self.mode, query,
+                                PlanOperator.from_plan(plan) if plan is not None else None,
+                                notifications, time.time())
+        with self._lock:
+            self._plans[captured.shape] = captured
+            self._plans.move_to_end(captured.shape)
+            while len(self._plans) > self.buffer_size:
+                self._plans.popitem(last=False)
+        if captured.warnings:
+            profiling_logger.warning("Plan of %s statement %s: %s\n%s", captured.operation, captured.shape,
+                                     "; ".join(captured.warnings), query)
+        if self.dump_dir is not None:
+            self._dump(captured)
+        return captured
+
+    def _dump(self, captured: CapturedPlan) -> None:
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            with open(os.path.join(self.dump_dir, f"{captured.shape}.json"), 'w') as f:
+                json.dump(captured.to_dict(), f, indent=2)
+        except OSError as e:
+            print("Error writing query plan: ", e)  # Error
+
+    @staticmethod
+    def _notification_text(notification) -> str:
+        if isinstance(notification, dict):
+            return f"{notification.get('title')}: {notification.get('description')}"
+        return f"{notification.title}: {notification.description}"
@@ -1,62 +1,83 @@
-import re
-import string
 from typing import Dict, List, Any
 
 
 class QueryBuilder(object):
     """
-    Creates a valid OpenCypher query based on arguments, properties and parameters
+    Creates a valid OpenCypher statement based on arguments, properties and parameters.
+    Values are never inlined into the statement text: they are collected into a
+     parameter map, so that requests of the same shape yield the same statement
+     and can reuse the database's cached query plan.
     Sample usages:
-    * builder.matchById(id, "n").add("RETURN PROPERTIES(n)").get() ->
-        "MATCH (n) WHERE ID(n)=id RETURN PROPERTIES(n)"
-    * builder.add("MATCH (n:%s", get.getLabel()).add_parameters(get.getProperties()).add(")")
-      builder.add("RETURN COLLECT(ID(n)) AS ids").get() ->
-        "MATCH (n:Roboy) {name:'roboy'} RETURN COLLECT(ID(n)) AS ids"
-
-    TODO: Break down builder.add("MATCH (n)-[r]-(m) WHERE ID(n)=%d RETURN TYPE(r) as name, COLLECT(ID(m)) as ids", id)
-
+    * builder.match_by_id(id, "n").add("RETURN PROPERTIES(n)")
+      builder.get() -> "MATCH (n) WHERE ID(n)=$n_id RETURN PROPERTIES(n)"
+      builder.get_parameters() -> {"n_id": id}
+    * builder.add("MATCH (n:Roboy").add_parameters({"name": "roboy"}).add(")")
+      builder.add("RETURN COLLECT(ID(n)) AS ids")
+      builder.get() -> "MATCH (n:Roboy {name: $p0}) RETURN COLLECT(ID(n)) AS ids"
+      builder.get_parameters() -> {"p0": "roboy"}
     """
-    query: string = ''  # String storing a Cypher query
+    chunks: List[str]  # Whitespace-free parts of the Cypher statement
+    parameters: Dict[str, Any]  # Values referenced from the statement by name
 
-    def __init__(self, query: string = None, builder: 'QueryBuilder' = None):
+    def __init__(self, query: str = None, builder: 'QueryBuilder' = None):
         """
         Initialise a QueryBuilder object
         If query is None and builder is None, initialises an empty QueryBuilder.
         If builder is not None, acts as a copy constructor.
-        If builder is None and query is not None, initialises self.query string with the input.
+        If builder is None and query is not None, initialises the statement with the input.
         :param query: string containing a Cypher query
         :param builder: a QueryBuilder object
         """
         if builder is not None:
-            self.query = builder.query
-        elif query is not None:
-            self.query = query
+            self.chunks = list(builder.chunks)
+            self.parameters = dict(builder.parameters)
         else:
-            self.query = ''
+            self.chunks = []
+            self.parameters = dict()
+            if query is not None:
+                self.add(query)
 
     def get(self) -> str:
         """
         Access the query string representation
         :return: string representing a query
         """
-        return re.sub("\s\s+", " ", self.query.strip())
+        return " ".join(self.chunks)
+
+    def get_parameters(self) -> Dict[str, Any]:
+        """
+        Access the parameter map which belongs to the query string
+        :return: dictionary from parameter names to values
+        """
+        return self.parameters
 
     def append(self, chunks: List[str]) -> 'QueryBuilder':
         """
-        Attach several parts of the query together
-        :param parts: list of strings
+        Attach several parts of the query together, without separating whitespace
+        :param chunks: list of strings
         :return: this QueryBuilder
         """
-        self.query += "".join(chunks)
+        chunk = "".join(chunks)
+        if self.chunks:
+            self.chunks[-1] += chunk
+        else:
+            self.chunks.append(chunk)
         return self
 
     def add(self, chunk: str) -> 'QueryBuilder':
         """
         Add a single token/call into the Cypher query
+        A chunk which starts with a closing bracket is attached to the previous one,
+         e.g. add("MATCH (n:Roboy").add(")") -> "MATCH (n:Roboy)"
         :param chunk: string containing a single part of the query
         :return: this QueryBuilder
         """
-        return self.append([" ", chunk, " "])
+        chunk = " ".join(chunk.split())
+        if chunk[:1] in (")", "}", "]") and self.chunks:
+            self.chunks[-1] += chunk
+        elif chunk:
+            self.chunks.append(chunk)
+        return self
 
     def add_meta(self, meta: List[str]) -> 'QueryBuilder':
         """
@@ -64,7 +85,7 @@ class QueryBuilder(object):
         :param meta: frozenset containing meta of the node
         :return: this QueryBuilder
         """
-        return self.add(":"+":".join(meta))
+        return self.append([":", ":".join(sorted(meta))])
 
     def format(self, chunk: str, *args: List[Any]) -> 'QueryBuilder':
         """
@@ -75,15 +96,28 @@ class QueryBuilder(object):
         """
         return self.add(chunk.format(*args))
 
-    def add_parameters(self, properties: Dict[str, str]) -> 'QueryBuilder':
+    def param(self, value: Any, name: str = None) -> str:
+        """
+        Register a value in the parameter map
+        :param value: the value to be passed to the database
+        :param name: name of the parameter. If omitted, a name is
+         derived from the number of parameters registered so far.
+        :return: the placeholder which refers to the value from the query, e.g. "$p0"
+        """
+        if name is None:
+            name = f"p{len(self.parameters)}"
+        self.parameters[name] = value
+        return f"${name}"
+
+    def add_parameters(self, properties: Dict[str, Any]) -> 'QueryBuilder':
         """
         Add the node properties to the Cypher query
         :param properties: properties of the node
         :return: this QueryBuilder
         """
-        param_list: [str] = []
+        param_list: List[str] = []
         for key, value in properties.items():
-            param_list.append(f"{key}: '{value}'")
+            param_list.append(f"{key}: {self.param(value)}")
         return self.add(f"{{{', '.join(param_list)}}}")
 
     def match_by_id(self, id: int, letter: str) -> 'QueryBuilder':
@@ -93,9 +127,9 @@ class QueryBuilder(object):
         :param letter: a variable identifying the node in the Cypher query
         :return: this QueryBuilder
         """
-        return self.add(f"MATCH ({letter}) WHERE ID({letter})={id}")
+        return self.add(f"MATCH ({letter}) WHERE ID({letter})={self.param(id, f'{letter}_id')}")
 
-    def set_values(self, properties: Dict[str, str], letter: str) -> 'QueryBuilder':
+    def set_values(self, properties: Dict[str, Any], letter: str) -> 'QueryBuilder':
         """
         Create Cypher SET query to set the value to the node in the query
         :param properties: properties that have to be initialised
@@ -103,5 +137,5 @@ class QueryBuilder(object):
         :return: this QueryBuilder
         """
         for key, value in properties.items():
-            self.add(f"SET {letter}.{key}='{value}'")
+            self.add(f"SET {letter}.{key}={self.param(value)}")
         return self